@@ -1,18 +1,49 @@
+"""Admin sessions: HS256 tokens issued after OAuth sign-in.
+
+The admin portal makes many API calls per page, so verified tokens are kept in
+`admin_token_cache` (by token hash, bounded by `admin_token_cache_size`) until
+their `exp`, and the signature check and claim normalisation run once per token.
+
+Logout revokes a token until it would have expired: it goes into the process's
+own denylist, which every request checks. With the default `redis`
+`admin_token_revocation_backend` it is also written to the shared Redis as
+`adminrevoked:<token hash>` and published as a cache event, which puts it in every
+other API worker's denylist too. A token served from the cache therefore costs no
+Redis round trip while the worker is receiving cache events; a token the worker
+has not verified yet, or any token while the subscription is down, is checked
+against the Redis key. If Redis is unreachable, tokens are checked against the
+local denylist only. The `memory` backend keeps revocations in the local denylist
+alone (single-process setups).
+"""
+
 from __future__ import annotations
 
+import logging
+import math
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import timedelta
+from typing import Any
 
 import jwt
 from litestar.connection import ASGIConnection
 from litestar.exceptions import HTTPException, NotAuthorizedException
 from litestar.handlers.base import BaseRouteHandler
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
-from app.auth import utcnow
+from app.auth import hash_token, utcnow
 from app.config import settings
+from app.services.cache_events import CacheEvents, cache_events
+from app.services.redis import get_redis
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 ADMIN_SESSION_COOKIE = "admin_session"
 ADMIN_SESSION_ALGORITHM = "HS256"
+ADMIN_TOKEN_REVOKED_EVENT = "admin-token-revoked"
 
 
 @dataclass(frozen=True)
@@ -48,7 +79,108 @@ def create_admin_session(*, email: str, provider: str, provider_user_id: str) ->
     return jwt.encode(payload, _admin_auth_secret(), algorithm=ADMIN_SESSION_ALGORITHM)
 
 
-def decode_admin_session(token: str) -> AdminIdentity:
+class AdminTokenCache:
+    """Verified admin tokens and revoked ones, by token hash, each until the token's `exp`.
+
+    Revocations are shared through Redis and `events` when `use_redis` is set.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        use_redis: bool,
+        client: Callable[[], Redis] = get_redis,
+        events: CacheEvents = cache_events,
+        prefix: str = "adminrevoked",
+    ) -> None:
+        self.use_redis = use_redis
+        self.client = client
+        self.events = events
+        self.prefix = prefix
+        self._verified: TTLCache[str, AdminIdentity] = TTLCache(maxsize=maxsize, ttl_seconds=0)
+        # Not an LRU: dropping a revocation early would make the token valid again
+        self._revoked: dict[str, float] = {}
+        # Revocations missed while unsubscribed may cover cached tokens, so re-verify those
+        events.subscribe(ADMIN_TOKEN_REVOKED_EVENT, self._on_revoked, on_connect=self._verified.clear)
+
+    def _key(self, token_hash: str) -> str:
+        return f"{self.prefix}:{token_hash}"
+
+    def get(self, token_hash: str) -> AdminIdentity | None:
+        return self._verified.get(token_hash)
+
+    def set(self, token_hash: str, identity: AdminIdentity, exp: float) -> None:
+        ttl = exp - time.time()
+        if ttl > 0:
+            self._verified.set(token_hash, identity, ttl_seconds=ttl)
+
+    async def is_revoked(self, token_hash: str, *, cached: bool = False) -> bool:
+        """Whether the token was revoked, by this process or (with Redis) any other.
+
+        A `cached` token, verified earlier by this process, is only looked up in Redis
+        while other processes' revocations are not being received.
+        """
+        exp = self._revoked.get(token_hash)
+        if exp is not None:
+            if exp > time.time():
+                return True
+            del self._revoked[token_hash]
+        if not self.use_redis or (cached and self.events.connected):
+            return False
+
+        key = self._key(token_hash)
+        try:
+            raw = await self.client().get(key)
+        except RedisError as e:
+            logger.warning(f"Admin token revocations unavailable: {e}")
+            return False
+        if raw is None:
+            return False
+        try:
+            exp = float(raw)
+        except ValueError:
+            logger.warning(f"Malformed admin token revocation {key}={raw!r}, treating the token as revoked")
+            exp = time.time() + settings.admin_session_ttl_hours * 3600
+        self._revoke_local(token_hash, exp)
+        return True
+
+    async def revoke(self, token_hash: str, exp: float) -> None:
+        self._revoke_local(token_hash, exp)
+        ttl = math.ceil(exp - time.time())
+        if not self.use_redis or ttl <= 0:
+            return
+        try:
+            await self.client().set(self._key(token_hash), str(exp), ex=ttl)
+        except RedisError as e:
+            logger.warning(f"Admin token revocations unavailable, revoked in this process only: {e}")
+            return
+        await self.events.publish(ADMIN_TOKEN_REVOKED_EVENT, token_hash=token_hash, exp=exp)
+
+    def _on_revoked(self, event: dict[str, Any]) -> None:
+        self._revoke_local(str(event["token_hash"]), float(event["exp"]))
+
+    def _revoke_local(self, token_hash: str, exp: float) -> None:
+        self._verified.pop(token_hash)
+        now = time.time()
+        if exp > now:
+            self._revoked[token_hash] = exp
+        # Revocations are rare; prune expired ones here rather than on every check
+        for expired in [h for h, e in self._revoked.items() if e <= now]:
+            del self._revoked[expired]
+
+    def clear(self) -> None:
+        self._verified.clear()
+        self._revoked.clear()
+
+
+admin_token_cache = AdminTokenCache(
+    maxsize=settings.admin_token_cache_size,
+    use_redis=settings.admin_token_revocation_backend == "redis",
+)
+
+
+def _decode_admin_token(token: str) -> tuple[AdminIdentity, float]:
     try:
         payload = jwt.decode(
             token,
@@ -65,10 +197,38 @@ def decode_admin_session(token: str) -> AdminIdentity:
     if not email or not provider or not provider_user_id:
         raise NotAuthorizedException(detail="Invalid admin session")
 
-    return AdminIdentity(email=email, provider=provider, provider_user_id=provider_user_id)
+    identity = AdminIdentity(email=email, provider=provider, provider_user_id=provider_user_id)
+    return identity, float(payload["exp"])
 
 
-def get_admin_identity_from_connection(connection: ASGIConnection) -> AdminIdentity:
+async def decode_admin_session(token: str) -> AdminIdentity:
+    """Return the identity of a valid, unrevoked admin token; raises NotAuthorizedException otherwise."""
+    token_hash = hash_token(token)
+    identity = admin_token_cache.get(token_hash)
+    exp = None
+    if identity is None:
+        # Verify the signature first, so forged tokens cost no revocation lookup
+        identity, exp = _decode_admin_token(token)
+
+    if await admin_token_cache.is_revoked(token_hash, cached=exp is None):
+        raise NotAuthorizedException(detail="Invalid admin session")
+
+    if exp is not None:
+        admin_token_cache.set(token_hash, identity, exp)
+    return identity
+
+
+async def revoke_admin_session(token: str) -> None:
+    """Reject `token` from now until it expires. Invalid or expired tokens are ignored."""
+    try:
+        _, exp = _decode_admin_token(token)
+    except NotAuthorizedException:
+        return
+    await admin_token_cache.revoke(hash_token(token), exp)
+
+
+def get_admin_token(connection: ASGIConnection) -> str | None:
+    """The admin token from the `Authorization: Bearer` header, else the session cookie."""
     auth = connection.headers.get("authorization")
     token: str | None = None
 
@@ -80,10 +240,15 @@ def get_admin_identity_from_connection(connection: ASGIConnection) -> AdminIdent
     if not token:
         token = connection.cookies.get(ADMIN_SESSION_COOKIE)
 
+    return token or None
+
+
+async def get_admin_identity_from_connection(connection: ASGIConnection) -> AdminIdentity:
+    token = get_admin_token(connection)
     if not token:
         raise NotAuthorizedException(detail="Admin authentication required")
 
-    identity = decode_admin_session(token)
+    identity = await decode_admin_session(token)
 
     # Defense-in-depth: even if a token is valid, require allowlist membership.
     if not is_allowed_admin(identity.email):
@@ -92,6 +257,6 @@ def get_admin_identity_from_connection(connection: ASGIConnection) -> AdminIdent
     return identity
 
 
-def admin_session_guard(connection: ASGIConnection, _: BaseRouteHandler) -> None:
+async def admin_session_guard(connection: ASGIConnection, _: BaseRouteHandler) -> None:
     # Raises on failure.
-    get_admin_identity_from_connection(connection)
+    await get_admin_identity_from_connection(connection)
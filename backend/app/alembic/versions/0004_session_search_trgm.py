@@ -0,0 +1,43 @@
+"""Trigram indexes for public session search.
+
+Enables `pg_trgm` and adds GIN trigram indexes on the columns searched by the
+public `q` parameter, so `ILIKE '%term%'` and word-similarity matches use an
+index instead of a sequential scan. PostgreSQL only; other dialects search
+in-process.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_session_search_trgm"
+down_revision = "0003_improve_child_reporting"
+branch_labels = None
+depends_on = None
+
+TRGM_INDEXES = {
+    "ix_sessions_name_trgm": ("sessions", "name"),
+    "ix_session_locations_name_trgm": ("session_locations", "name"),
+    "ix_session_locations_region_trgm": ("session_locations", "region"),
+    "ix_session_locations_address_trgm": ("session_locations", "address"),
+}
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and create trigram indexes."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, (table, column) in TRGM_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin ({column} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Drop trigram indexes (the extension is left installed)."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for index_name in TRGM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
@@ -0,0 +1,50 @@
+"""Composite index for windowed occurrence reads.
+
+Replaces the single-column `session_occurrences.session_id` index with a
+`(session_id, starts_at)` index so calendar feeds read only the rows they emit,
+already in order. On PostgreSQL the remaining feed columns are INCLUDEd so the
+read is an index-only scan.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision = "0005_occurrence_session_start_index"
+down_revision = "0004_session_search_trgm"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_session_occurrences_session_starts"
+OLD_INDEX_NAME = "ix_session_occurrences_session_id"
+
+
+def _existing_indexes() -> set[str | None]:
+    return {index["name"] for index in inspect(op.get_bind()).get_indexes("session_occurrences")}
+
+
+def upgrade() -> None:
+    """Create the composite index and drop the one it supersedes."""
+    existing = _existing_indexes()
+
+    if INDEX_NAME not in existing:
+        op.create_index(
+            INDEX_NAME,
+            "session_occurrences",
+            ["session_id", "starts_at"],
+            postgresql_include=["id", "ends_at", "cancelled", "cancellation_reason"],
+        )
+    if OLD_INDEX_NAME in existing:
+        op.drop_index(OLD_INDEX_NAME, table_name="session_occurrences")
+
+
+def downgrade() -> None:
+    """Restore the single-column index."""
+    existing = _existing_indexes()
+
+    if OLD_INDEX_NAME not in existing:
+        op.create_index(OLD_INDEX_NAME, "session_occurrences", ["session_id"])
+    if INDEX_NAME in existing:
+        op.drop_index(INDEX_NAME, table_name="session_occurrences")
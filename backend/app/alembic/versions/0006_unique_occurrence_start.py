@@ -0,0 +1,130 @@
+"""Unique occurrence start per session.
+
+Makes `(session_id, starts_at)` unique so schedule materialisation can bulk insert
+with `ON CONFLICT DO NOTHING`. Existing duplicates are merged first. Per start time,
+the kept row is one that has attendance records, else a manual row, else an
+auto-generated one. Attendance records and audit logs on the other rows are moved
+to the kept row; where a child already has a record there, the extra records are
+dropped (their audit logs are kept). The unique index supersedes the non-unique one
+from 0005.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from alembic import op
+from sqlalchemy import inspect, text
+
+# revision identifiers, used by Alembic.
+revision = "0006_unique_occurrence_start"
+down_revision = "0005_occurrence_session_start_index"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+INDEX_NAME = "uq_session_occurrences_session_starts"
+OLD_INDEX_NAME = "ix_session_occurrences_session_starts"
+INCLUDE_COLUMNS = ["id", "ends_at", "cancelled", "cancellation_reason"]
+
+
+def _existing_indexes() -> set[str | None]:
+    return {index["name"] for index in inspect(op.get_bind()).get_indexes("session_occurrences")}
+
+
+def _merge_duplicate_occurrences() -> None:
+    bind = op.get_bind()
+
+    # Every duplicate occurrence (rank > 1) and the occurrence it is merged into
+    op.execute("""
+        CREATE TEMPORARY TABLE occurrence_duplicates AS
+        SELECT id, kept_id, occurrence_rank FROM (
+            SELECT
+                so.id,
+                FIRST_VALUE(so.id) OVER ranking AS kept_id,
+                ROW_NUMBER() OVER ranking AS occurrence_rank
+            FROM session_occurrences so
+            WINDOW ranking AS (
+                PARTITION BY so.session_id, so.starts_at
+                ORDER BY
+                    EXISTS (SELECT 1 FROM attendance_records ar WHERE ar.occurrence_id = so.id) DESC,
+                    so.auto_generated ASC,
+                    so.id ASC
+            )
+        ) ranked
+        WHERE ranked.occurrence_rank > 1
+    """)
+
+    # Attendance in merged groups, ranked per (kept occurrence, child): the kept row's record first
+    op.execute("""
+        CREATE TEMPORARY TABLE attendance_merge AS
+        SELECT
+            ar.id,
+            d.id IS NOT NULL AS on_duplicate,
+            COALESCE(d.kept_id, ar.occurrence_id) AS kept_id,
+            ROW_NUMBER() OVER (
+                PARTITION BY COALESCE(d.kept_id, ar.occurrence_id), ar.child_id
+                ORDER BY COALESCE(d.occurrence_rank, 1), ar.id
+            ) AS child_rank
+        FROM attendance_records ar
+        LEFT JOIN occurrence_duplicates d ON d.id = ar.occurrence_id
+        WHERE ar.occurrence_id IN (SELECT id FROM occurrence_duplicates)
+           OR ar.occurrence_id IN (SELECT kept_id FROM occurrence_duplicates)
+    """)
+
+    conflicts = bind.execute(
+        text("DELETE FROM attendance_records WHERE id IN (SELECT id FROM attendance_merge WHERE child_rank > 1)")
+    ).rowcount
+    if conflicts:
+        logger.warning(
+            f"Dropped {conflicts} attendance records that duplicated a child's record on the kept occurrence"
+        )
+
+    op.execute("""
+        UPDATE attendance_records
+        SET occurrence_id = (SELECT m.kept_id FROM attendance_merge m WHERE m.id = attendance_records.id)
+        WHERE id IN (SELECT id FROM attendance_merge WHERE on_duplicate AND child_rank = 1)
+    """)
+    op.execute("""
+        UPDATE attendance_audit_logs
+        SET occurrence_id = (
+            SELECT d.kept_id FROM occurrence_duplicates d WHERE d.id = attendance_audit_logs.occurrence_id
+        )
+        WHERE occurrence_id IN (SELECT id FROM occurrence_duplicates)
+    """)
+    op.execute("DELETE FROM session_occurrences WHERE id IN (SELECT id FROM occurrence_duplicates)")
+
+    op.execute("DROP TABLE attendance_merge")
+    op.execute("DROP TABLE occurrence_duplicates")
+
+
+def upgrade() -> None:
+    """Merge duplicate occurrences and add the unique index."""
+    _merge_duplicate_occurrences()
+
+    existing = _existing_indexes()
+    if INDEX_NAME not in existing:
+        op.create_index(
+            INDEX_NAME,
+            "session_occurrences",
+            ["session_id", "starts_at"],
+            unique=True,
+            postgresql_include=INCLUDE_COLUMNS,
+        )
+    if OLD_INDEX_NAME in existing:
+        op.drop_index(OLD_INDEX_NAME, table_name="session_occurrences")
+
+
+def downgrade() -> None:
+    """Restore the non-unique index."""
+    existing = _existing_indexes()
+    if OLD_INDEX_NAME not in existing:
+        op.create_index(
+            OLD_INDEX_NAME,
+            "session_occurrences",
+            ["session_id", "starts_at"],
+            postgresql_include=INCLUDE_COLUMNS,
+        )
+    if INDEX_NAME in existing:
+        op.drop_index(INDEX_NAME, table_name="session_occurrences")
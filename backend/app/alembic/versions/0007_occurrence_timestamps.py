@@ -0,0 +1,42 @@
+"""Timestamps on session occurrences.
+
+Adds `created_at`/`updated_at` to `session_occurrences` so calendar feeds can
+derive `Last-Modified` and DTSTAMP from when an occurrence last changed (e.g. was
+cancelled). Existing rows are stamped with the migration time.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+from sqlalchemy import Column, DateTime, func, inspect
+
+# revision identifiers, used by Alembic.
+revision = "0007_occurrence_timestamps"
+down_revision = "0006_unique_occurrence_start"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("created_at", "updated_at")
+
+
+def _existing_columns() -> set[str]:
+    return {column["name"] for column in inspect(op.get_bind()).get_columns("session_occurrences")}
+
+
+def upgrade() -> None:
+    """Add the timestamp columns."""
+    existing = _existing_columns()
+    for name in COLUMNS:
+        if name not in existing:
+            op.add_column(
+                "session_occurrences",
+                Column(name, DateTime(timezone=True), server_default=func.now(), nullable=False),
+            )
+
+
+def downgrade() -> None:
+    """Drop the timestamp columns."""
+    existing = _existing_columns()
+    for name in COLUMNS:
+        if name in existing:
+            op.drop_column("session_occurrences", name)
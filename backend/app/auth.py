@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.models.caregiver import Caregiver
 from app.models.caregiver_auth import CaregiverSession
+from app.services.principal_cache import CaregiverPrincipal, principal_cache
 
 CARE_GIVER_SESSION_COOKIE = "caregiver_session"
 
@@ -41,7 +42,9 @@ def session_expires_at() -> datetime:
     return utcnow() + timedelta(days=settings.caregiver_session_ttl_days)
 
 
-async def get_current_caregiver(request: Request, db: AsyncSession, *, required: bool = True) -> Caregiver | None:
+async def get_current_caregiver(
+    request: Request, db: AsyncSession, *, required: bool = True
+) -> CaregiverPrincipal | None:
     raw = request.cookies.get(CARE_GIVER_SESSION_COOKIE)
     if not raw:
         if required:
@@ -49,27 +52,39 @@ async def get_current_caregiver(request: Request, db: AsyncSession, *, required:
         return None
 
     token_hash = _hash_token(raw)
-    now = utcnow()
+    principal = await principal_cache.get(token_hash)
+    if principal is not None:
+        return principal
 
     result = await db.execute(
-        select(CaregiverSession)
+        select(
+            Caregiver.id,
+            Caregiver.email,
+            Caregiver.name,
+            Caregiver.phone,
+            Caregiver.email_verified,
+            CaregiverSession.expires_at,
+        )
+        .join(CaregiverSession, CaregiverSession.caregiver_id == Caregiver.id)
         .where(CaregiverSession.token_hash == token_hash)
         .where(CaregiverSession.revoked_at.is_(None))
-        .where(CaregiverSession.expires_at > now)
+        .where(CaregiverSession.expires_at > utcnow())
     )
-    session = result.scalar_one_or_none()
-    if not session:
+    row = result.one_or_none()
+    if not row:
         if required:
             raise NotAuthorizedException(detail="Session expired")
         return None
 
-    caregiver = await db.get(Caregiver, session.caregiver_id)
-    if not caregiver:
-        if required:
-            raise NotAuthorizedException(detail="Invalid session")
-        return None
-
-    return caregiver
+    principal = CaregiverPrincipal(
+        id=row.id,
+        email=row.email,
+        name=row.name,
+        phone=row.phone,
+        email_verified=row.email_verified,
+    )
+    await principal_cache.set(token_hash, principal, row.expires_at)
+    return principal
 
 
 def hash_token(token: str) -> str:
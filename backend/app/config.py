@@ -11,6 +11,7 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379"
+    cache_events_backend: str = "redis"  # "redis" (invalidations via pub/sub to every process) or "memory" (this one)
 
     # Application
     debug: bool = False
@@ -35,9 +36,15 @@ class Settings(BaseSettings):
     auth_secret: str = "dev-secret-change-me"
     magic_link_ttl_minutes: int = 15
     caregiver_session_ttl_days: int = 30
+    caregiver_principal_cache_size: int = 10_000  # Signed-in sessions kept in memory per process
+    caregiver_principal_cache_ttl_seconds: int = 30  # Re-read at least this often; invalidations come as cache events
+    caregiver_principal_cache_redis: bool = False  # Also share cached sessions between workers via Redis
+    caregiver_principal_cache_redis_ttl_seconds: int = 300
 
     # Admin auth (OAuth + server-issued session)
     admin_session_ttl_hours: int = 24
+    admin_token_cache_size: int = 1_000  # Verified admin tokens kept in memory per process
+    admin_token_revocation_backend: str = "redis"  # "redis" (shared by all API workers) or "memory" (per process)
     # Admin OAuth (Google)
     admin_google_oauth_client_id: str = ""
     admin_google_oauth_client_secret: str = ""
@@ -49,7 +56,21 @@ class Settings(BaseSettings):
     mailgun_api_key: str = ""
     mailgun_domain: str = ""
     mailgun_api_url: str = ""
+    mailgun_max_recipients: int = 1000  # Provider limit on To + BCC recipients per message
+    mailgun_requests_per_second: float = 10.0  # Client-side pacing of Mailgun API calls (per process)
+    mailgun_burst: int = 20
+    mailgun_max_concurrency: int = 4  # In-flight Mailgun API calls per process
+    email_max_throttle_wait_seconds: float = 5.0  # Longer waits defer the job instead of sleeping
+    email_retry_max_attempts: int = 6  # Attempts for a deferred email job before it fails
+    email_retry_base_delay_seconds: float = 30.0  # Doubles per attempt, plus jitter
     email_dry_run: bool = False  # Don't actually send emails in dev/test
+    email_template_bytecode_cache_dir: str = ""  # Optional dir for compiled Jinja bytecode (shared across restarts)
+
+    # Outbound HTTP (shared pooled client for Mailgun and the newsletter webhook)
+    http_client_timeout_seconds: float = 10.0
+    http_client_connect_timeout_seconds: float = 5.0
+    http_client_max_connections: int = 20
+    http_client_keepalive_seconds: float = 30.0  # Close idle pooled connections after this long
 
     # Newsletter
     newsletter_webhook_url: str = ""
@@ -64,8 +85,23 @@ class Settings(BaseSettings):
     otel_batch_max_queue_size: int = 2048
     otel_slow_query_threshold_ms: float = 100.0  # Log queries slower than this
 
+    # Public session catalogue snapshot
+    public_catalogue_ttl_seconds: int = 300  # Rebuild at least this often (covers writes made by other workers)
+    public_catalogue_max_age_seconds: int = 60  # Cache-Control max-age for browsers/CDN (ETag revalidates after)
+    public_availability_ttl_seconds: int = 15  # Live spots-left counts may lag signups by at most this long
+
+    # Calendar (.ics) feeds
+    calendar_feed_cache_ttl_seconds: int = 3600  # Re-render at least this often (covers writes made by other workers)
+    calendar_feed_cache_size: int = 2048  # Sessions whose rendered feeds are kept in memory
+
     # Rate limiting
+    rate_limit_backend: str = "redis"  # "redis" (shared by all API workers) or "memory" (per process)
     rate_limit_requests_per_minute: int = 60  # General rate limit
+    rate_limit_memory_max_keys: int = 100_000  # Clients tracked by the memory backend (least recent dropped)
+    # Comma-separated IPs/CIDRs of the reverse proxy in front of the API; only these may set X-Forwarded-For.
+    # Left empty, every request is limited by its TCP peer, so clients behind a proxy share one limit.
+    # Docker Compose deployments set it in .env (see .env.example).
+    rate_limit_trusted_proxies: str = ""
     magic_link_rate_limit_per_minute: int = 3  # Strict limit on magic link endpoint
     magic_link_rate_limit_per_hour: int = 10  # Max 10 magic link requests per hour per email
 
@@ -1,9 +1,10 @@
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session as SyncSession
 
 # Ensure all SQLAlchemy models are imported/registered before create_all runs.
 # This avoids missing tables due to import order (especially in worker/CLI contexts).
@@ -51,6 +52,34 @@ async_session_factory = async_sessionmaker(
 )
 
 
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def on_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run `callback` once the current transaction commits.
+
+    Used to invalidate in-process caches only after the write is visible to other
+    sessions. Callbacks are dropped if the transaction rolls back.
+    """
+    callbacks: list[Callable[[], None]] = db.sync_session.info.setdefault(_AFTER_COMMIT_KEY, [])
+    if callback not in callbacks:
+        callbacks.append(callback)
+
+
+@event.listens_for(SyncSession, "after_commit")
+def _run_after_commit_callbacks(session: SyncSession) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("after-commit callback failed")
+
+
+@event.listens_for(SyncSession, "after_rollback")
+def _discard_after_commit_callbacks(session: SyncSession) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get a database session."""
     async with async_session_factory() as session:
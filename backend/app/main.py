@@ -23,6 +23,9 @@ from app.routes.caregiver import CaregiverController
 from app.routes.health import HealthController
 from app.routes.public import PublicController
 from app.routes.staff_admin import SessionStaffController, StaffAdminController
+from app.services.cache_events import lifespan_cache_events
+from app.services.http import lifespan_http
+from app.services.redis import lifespan_redis
 
 # Reduce SQLAlchemy log noise (query + schema inspection logs).
 # If SQL echo is explicitly enabled, don't interfere.
@@ -53,7 +56,7 @@ def auth_exception_handler(request: Request, exc: NotAuthorizedException) -> Res
 @asynccontextmanager
 async def lifespan(app: Litestar) -> AsyncGenerator[None, None]:
     """Application lifespan context manager."""
-    async with lifespan_db():
+    async with lifespan_db(), lifespan_http(), lifespan_redis(), lifespan_cache_events():
         yield
 
 
@@ -108,6 +111,7 @@ openapi_config = OpenAPIConfig(
             name="Admin: Occurrences",
             description="Manage and generate session occurrences.",
         ),
+        Tag(name="Admin: Jobs", description="Status and progress of background jobs."),
         Tag(name="Admin: Signups", description="View and update caregiver signups."),
         Tag(
             name="Admin: Attendance",
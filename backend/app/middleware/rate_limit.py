@@ -2,29 +2,176 @@
 
 Implements rate limiting for general API endpoints and strict limits for
 sensitive operations like magic link generation.
+
+Counts are sliding windows kept in Redis by default (`rate_limit_backend`), so
+every API worker enforces the same limits and they survive deploys. Each check is
+a single Lua script call that trims, counts and records the request atomically.
+The `memory` backend is a bounded in-process GCRA limiter for development and
+single-node setups. If Redis is unreachable requests are allowed through.
 """
 
+import ipaddress
 import logging
-from collections import defaultdict
-from datetime import datetime, timedelta
+import math
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
 
 from litestar.exceptions import TooManyRequestsException
 from litestar.types import Receive, Scope, Send
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
 
 from app.config import settings
+from app.services.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
-# Store rate limit counts in memory (in production, use Redis)
-# Structure: {ip_address: {endpoint: [(timestamp, count), ...]}}
-_rate_limit_store: dict[str, dict[str, list[tuple[datetime, int]]]] = defaultdict(lambda: defaultdict(list))
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+
+@dataclass(frozen=True)
+class Limit:
+    """At most `requests` within any `window_seconds`-long window."""
+
+    requests: int
+    window_seconds: int
+
+    def describe(self) -> str:
+        unit = "minute" if self.window_seconds == MINUTE else "hour" if self.window_seconds == HOUR else None
+        return f"{self.requests} requests per {unit or f'{self.window_seconds}s'}"
+
+
+# KEYS[1]: sorted set of request timestamps (ms) for one client and endpoint
+# ARGV[1]: unique member for this request; ARGV[2..]: (max requests, window ms) pairs
+# Returns nil if the request is allowed (and records it), else {limit index, retry after ms}
+_SLIDING_WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local longest = 0
+for i = 2, #ARGV, 2 do
+    longest = math.max(longest, tonumber(ARGV[i + 1]))
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - longest)
+for i = 2, #ARGV, 2 do
+    local limit = tonumber(ARGV[i])
+    local window = tonumber(ARGV[i + 1])
+    local count = redis.call('ZCOUNT', KEYS[1], '(' .. (now - window), '+inf')
+    if count >= limit then
+        local oldest = redis.call('ZRANGEBYSCORE', KEYS[1], '(' .. (now - window), '+inf', 'WITHSCORES', 'LIMIT', count - limit, 1)
+        return {i / 2, tonumber(oldest[2]) + window - now}
+    end
+end
+redis.call('ZADD', KEYS[1], now, ARGV[1])
+redis.call('PEXPIRE', KEYS[1], longest)
+return nil
+"""
+
+
+class RedisRateLimitStore:
+    """Sliding-window counts shared by every process through Redis."""
+
+    def __init__(self, client: Callable[[], Redis] = get_redis, prefix: str = "ratelimit") -> None:
+        self.client = client
+        self.prefix = prefix
+        self._script: AsyncScript | None = None
+
+    async def hit(self, key: str, limits: list[Limit]) -> tuple[Limit, float] | None:
+        """Record a request under `key` unless a limit is reached; return (limit, retry after seconds) if it is."""
+        client = self.client()
+        if self._script is None:
+            self._script = client.register_script(_SLIDING_WINDOW_SCRIPT)
+        args: list[int | str] = [f"{time.time_ns()}-{secrets.token_hex(4)}"]
+        for limit in limits:
+            args += [limit.requests, limit.window_seconds * 1000]
+        result = await self._script(keys=[f"{self.prefix}:{key}"], args=args, client=client)
+        if not result:
+            return None
+        index, retry_after_ms = result
+        return limits[int(index) - 1], int(retry_after_ms) / 1000
+
+
+class MemoryRateLimitStore:
+    """GCRA counts in this process only, for at most `max_keys` clients.
+
+    Each key stores one theoretical arrival time per limit, so a check is O(1) in the
+    number of past requests. Keys are kept least-recently-used first and the oldest
+    is dropped once `max_keys` is reached; a dropped client simply starts afresh.
+    GCRA spreads a limit evenly over its window (a full burst of `requests`, then one
+    request every `window / requests`), rather than a strict sliding count.
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+
+    async def hit(self, key: str, limits: list[Limit]) -> tuple[Limit, float] | None:
+        now = time.monotonic()
+        tats = self._tats.get(key)
+        if tats is None or len(tats) != len(limits):
+            tats = (now,) * len(limits)
+
+        new_tats = []
+        for limit, tat in zip(limits, tats, strict=True):
+            interval = limit.window_seconds / limit.requests
+            new_tat = max(tat, now) + interval
+            if new_tat - now > limit.window_seconds:
+                return limit, new_tat - now - limit.window_seconds
+            new_tats.append(new_tat)
+
+        self._tats[key] = tuple(new_tats)
+        self._tats.move_to_end(key)
+        if len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+        return None
+
+
+RateLimitStore = RedisRateLimitStore | MemoryRateLimitStore
+
+
+def build_rate_limit_store() -> RateLimitStore:
+    if settings.rate_limit_backend == "memory":
+        return MemoryRateLimitStore(max_keys=settings.rate_limit_memory_max_keys)
+    return RedisRateLimitStore()
+
+
+rate_limit_store = build_rate_limit_store()
+
+
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
 
 
-def get_client_ip(scope: Scope) -> str:
+def parse_trusted_proxies(value: str) -> list[IPNetwork]:
+    """Parse a comma-separated list of proxy addresses or CIDR ranges."""
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in value.split(",") if item.strip()]
+
+
+_trusted_proxies = parse_trusted_proxies(settings.rate_limit_trusted_proxies)
+
+
+def _is_trusted(address: str, trusted: list[IPNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+
+def get_client_ip(scope: Scope, trusted_proxies: list[IPNetwork] | None = None) -> str:
     """Extract client IP from ASGI scope.
 
+    `X-Forwarded-For` is only used when the connecting peer is a trusted proxy
+    (`rate_limit_trusted_proxies`); then the client is the right-most address in the
+    chain that is not itself a trusted proxy. Anyone else could set the header to
+    any value.
+
     Args:
         scope: The ASGI scope
+        trusted_proxies: Proxies allowed to set `X-Forwarded-For` (default from settings)
 
     Returns:
         The client's IP address
@@ -32,76 +179,56 @@ def get_client_ip(scope: Scope) -> str:
     if scope["type"] != "http":
         return "unknown"
 
-    # Check X-Forwarded-For header first (for proxied requests)
-    headers = dict(scope.get("headers", []))
-    if b"x-forwarded-for" in headers:
-        forwarded = headers[b"x-forwarded-for"].decode()
-        # Get first IP in the chain
-        return forwarded.split(",")[0].strip()
-
-    # Fall back to client info
+    trusted = _trusted_proxies if trusted_proxies is None else trusted_proxies
     client = scope.get("client")
-    if client:
-        return client[0]
+    peer = client[0] if client else "unknown"
+    if not trusted or not _is_trusted(peer, trusted):
+        return peer
 
-    return "unknown"
+    # Walk the chain from the nearest hop back, skipping our own proxies
+    for header, value in scope.get("headers", []):
+        if header == b"x-forwarded-for":
+            hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+            for hop in reversed(hops):
+                if not _is_trusted(hop, trusted):
+                    return hop
+            return hops[0] if hops else peer
+    return peer
 
 
-def check_rate_limit(
-    client_ip: str,
-    endpoint: str,
-    requests_per_minute: int,
-    requests_per_hour: int | None = None,
-) -> bool:
-    """Check if a client has exceeded rate limits.
+async def check_rate_limit(key: str, limits: list[Limit]) -> None:
+    """Count a request against `limits` for `key`.
 
     Args:
-        client_ip: The client IP address
-        endpoint: The endpoint identifier (e.g., "/api/v1/auth/magic-link")
-        requests_per_minute: Max requests allowed per minute
-        requests_per_hour: Max requests allowed per hour (optional)
-
-    Returns:
-        True if within limits, False if rate limit exceeded
+        key: What is being limited (e.g., "ip:1.2.3.4:/api/v1/auth/magic-link")
+        limits: The limits to enforce; the request is only counted if all pass
 
     Raises:
-        TooManyRequestsException: If rate limit exceeded
+        TooManyRequestsException: If a limit has been reached
     """
-    now = datetime.now()
-    minute_ago = now - timedelta(minutes=1)
-    hour_ago = now - timedelta(hours=1)
-
-    client_limits = _rate_limit_store[client_ip][endpoint]
-
-    # Clean old entries
-    client_limits[:] = [(ts, count) for ts, count in client_limits if ts > hour_ago]
-
-    # Count requests in last minute
-    minute_requests = sum(count for ts, count in client_limits if ts > minute_ago)
-
-    if minute_requests >= requests_per_minute:
-        raise TooManyRequestsException(detail=f"Rate limit exceeded: max {requests_per_minute} requests per minute")
-
-    # Count requests in last hour if specified
-    if requests_per_hour is not None:
-        hour_requests = sum(count for ts, count in client_limits)
-        if hour_requests >= requests_per_hour:
-            raise TooManyRequestsException(detail=f"Rate limit exceeded: max {requests_per_hour} requests per hour")
-
-    # Record this request
-    client_limits.append((now, 1))
+    try:
+        exceeded = await rate_limit_store.hit(key, limits)
+    except RedisError as e:
+        logger.warning(f"Rate limit store unavailable, allowing request: {e}")
+        return
 
-    return True
+    if exceeded is not None:
+        limit, retry_after = exceeded
+        raise TooManyRequestsException(
+            detail=f"Rate limit exceeded: max {limit.describe()}",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
 
 
 class RateLimitMiddleware:
     """Middleware for enforcing rate limits on API endpoints."""
 
-    # Endpoints with special rate limits
+    # Endpoints with special rate limits: (per minute, per hour) per client IP
     STRICT_LIMIT_ENDPOINTS = {
-        "/api/v1/auth/caregiver/login": (3, 10),  # 3 per minute, 10 per hour
-        "/api/v1/auth/caregiver/verify": (5, 20),  # 5 per minute, 20 per hour
+        "/api/v1/auth/magic-link": (settings.magic_link_rate_limit_per_minute, 10),
+        "/api/v1/auth/magic-link/consume": (5, 20),
         "/api/v1/admin/auth/google/start": (10, 50),  # Admin endpoints less strict
+        "/api/v1/admin/auth/google/callback": (10, 50),
     }
 
     def __init__(self, app) -> None:
@@ -138,13 +265,13 @@ class RateLimitMiddleware:
         # Determine rate limits for this endpoint
         if path in self.STRICT_LIMIT_ENDPOINTS:
             per_minute, per_hour = self.STRICT_LIMIT_ENDPOINTS[path]
+            limits = [Limit(per_minute, MINUTE), Limit(per_hour, HOUR)]
         else:
-            per_minute = settings.rate_limit_requests_per_minute
-            per_hour = None
+            limits = [Limit(settings.rate_limit_requests_per_minute, MINUTE)]
 
         # Check rate limit
         try:
-            check_rate_limit(client_ip, path, per_minute, per_hour)
+            await check_rate_limit(f"ip:{client_ip}:{path}", limits)
         except TooManyRequestsException as e:
             logger.warning(
                 "Rate limit exceeded",
@@ -26,5 +26,6 @@ class Caregiver(Base, UUIDPrimaryKey, TimestampMixin):
     referral_source: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     # Relationships
-    children: Mapped[list[Child]] = relationship("Child", back_populates="caregiver", lazy="selectin")
-    signups: Mapped[list[Signup]] = relationship("Signup", back_populates="caregiver", lazy="selectin")
+    # Not loaded by default; endpoints that need them opt in with selectinload()
+    children: Mapped[list[Child]] = relationship("Child", back_populates="caregiver", lazy="raise")
+    signups: Mapped[list[Signup]] = relationship("Signup", back_populates="caregiver", lazy="raise")
@@ -24,7 +24,7 @@ class CaregiverMagicLink(Base, UUIDPrimaryKey, TimestampMixin):
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    caregiver: Mapped[Caregiver] = relationship("Caregiver", lazy="selectin")
+    caregiver: Mapped[Caregiver] = relationship("Caregiver", lazy="raise")
 
 
 class CaregiverSession(Base, UUIDPrimaryKey, TimestampMixin):
@@ -39,4 +39,4 @@ class CaregiverSession(Base, UUIDPrimaryKey, TimestampMixin):
     user_agent: Mapped[str | None] = mapped_column(String(255), nullable=True)
     ip_address: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
-    caregiver: Mapped[Caregiver] = relationship("Caregiver", lazy="selectin")
+    caregiver: Mapped[Caregiver] = relationship("Caregiver", lazy="raise")
@@ -4,29 +4,39 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, CheckConstraint, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, CheckConstraint, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, UUIDPrimaryKey
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
 
 if TYPE_CHECKING:
     from app.models.session import Session
     from app.models.session_block import SessionBlock
 
 
-class SessionOccurrence(Base, UUIDPrimaryKey):
+class SessionOccurrence(Base, UUIDPrimaryKey, TimestampMixin):
     """A single scheduled occurrence of a session (e.g., weekly within a term)."""
 
     __tablename__ = "session_occurrences"
 
-    __table_args__ = (CheckConstraint("starts_at < ends_at", name="ck_session_occurrences_time_valid"),)
+    __table_args__ = (
+        CheckConstraint("starts_at < ends_at", name="ck_session_occurrences_time_valid"),
+        # One occurrence per session start time (the ON CONFLICT target for schedule materialisation).
+        # Also serves per-session, time-windowed reads (calendar feeds) as index-only scans on PostgreSQL.
+        Index(
+            "uq_session_occurrences_session_starts",
+            "session_id",
+            "starts_at",
+            unique=True,
+            postgresql_include=["id", "ends_at", "cancelled", "cancellation_reason"],
+        ),
+    )
 
     session_id: Mapped[uuid.UUID] = mapped_column(
         UUID(),
         ForeignKey("sessions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -4,16 +4,23 @@ import csv
 import io
 import logging
 import uuid
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from zoneinfo import ZoneInfo
 
 from litestar import Controller, get, patch, post
 from litestar import delete as http_delete
 from litestar.di import Provide
-from litestar.exceptions import NotFoundException, ValidationException
+from litestar.exceptions import HTTPException, NotFoundException, ValidationException
 from litestar.response import Response
-from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
-from sqlalchemy import delete, select
+from litestar.status_codes import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_202_ACCEPTED,
+    HTTP_204_NO_CONTENT,
+    HTTP_409_CONFLICT,
+)
+from saq import Job
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -23,7 +30,7 @@ logger = logging.getLogger(__name__)
 from typing import cast
 
 from app.admin_auth import admin_session_guard
-from app.db import get_db_session
+from app.db import get_db_session, on_commit
 from app.models.attendance import AttendanceRecord
 from app.models.attendance_audit import AttendanceAuditLog
 from app.models.child_note import ChildNote
@@ -49,9 +56,12 @@ from app.schemas.admin import (
     ExclusionDateCreate,
     ExclusionDateOut,
     ExclusionDateUpdate,
+    JobStatusOut,
+    OccurrenceBatchGenerate,
     OccurrenceCancel,
     OccurrenceCreate,
     OccurrenceOut,
+    OccurrencePreviewOut,
     SessionBlockCreate,
     SessionBlockOut,
     SessionBlockUpdate,
@@ -65,6 +75,15 @@ from app.schemas.admin import (
     SignupStatusUpdate,
 )
 from app.schemas.session import _format_time_range
+from app.services.availability import availability_cache
+from app.services.calendar_feeds import calendar_feed_cache
+from app.services.catalogue import catalogue_cache
+from app.services.schedule import (
+    ScheduleError,
+    existing_occurrence_starts,
+    expand_session_schedule,
+    materialise_session_occurrences,
+)
 from app.worker import get_queue
 
 TZ = ZoneInfo("Pacific/Auckland")
@@ -74,58 +93,48 @@ def _fmt_local_datetime(dt: datetime) -> str:
     return dt.astimezone(TZ).strftime("%a %d %b %Y, %-I:%M%p")
 
 
-async def _notify_confirmed_signups(
+async def _enqueue_session_notice(
     *,
     db: AsyncSession,
     queue,
-    session: Session,
+    session_id: uuid.UUID,
     update_title: str,
     update_message: str | None,
     affected_date: str | None,
-) -> int:
-    res = await db.execute(
-        select(Signup, CaregiverStaffView, ChildStaffView)
+    contact_email: str | None = None,
+) -> dict:
+    """Enqueue one `send_session_notice_task` for all confirmed signups of a session.
+
+    The worker resolves and emails the recipients; here they are only counted.
+    """
+    count = await db.scalar(
+        select(func.count(func.distinct(Signup.caregiver_id)))
         .join(CaregiverStaffView, Signup.caregiver_id == CaregiverStaffView.id)
-        .join(ChildStaffView, Signup.child_id == ChildStaffView.id)
-        .where(Signup.session_id == session.id, Signup.status == "confirmed")
-        .order_by(Signup.created_at.asc())
-    )
-    rows = res.all()
-
-    loc = getattr(session, "session_location", None)
-    session_time = _format_time_range(session.day_of_week, session.start_time, session.end_time)
-    session_venue = getattr(loc, "name", None)
-    session_address = getattr(loc, "address", None)
-
-    enqueued = 0
-    for su, caregiver, child in rows:
-        if not caregiver.email or not caregiver.name:
-            continue
-        await queue.enqueue(
-            "send_session_change_alert_task",
-            to_email=caregiver.email,
-            caregiver_name=caregiver.name,
-            child_name=child.name,
-            session_name=session.name,
-            session_venue=session_venue,
-            session_address=session_address,
-            session_time=session_time,
-            update_title=update_title,
-            update_message=update_message,
-            affected_date=affected_date,
+        .where(
+            Signup.session_id == session_id,
+            Signup.status == "confirmed",
+            CaregiverStaffView.email.is_not(None),
+            CaregiverStaffView.name.is_not(None),
         )
-        enqueued += 1
-    return enqueued
+    )
+    if not count:
+        return {"enqueued": 0}
+
+    job = await queue.enqueue(
+        "send_session_notice_task",
+        session_id=str(session_id),
+        update_title=update_title,
+        update_message=update_message,
+        affected_date=affected_date,
+        contact_email=contact_email,
+    )
+    return {"enqueued": count, "jobKey": job.key if job else None}
 
 
 def _dt_at_local(d: datetime) -> datetime:
     return d.astimezone(TZ)
 
 
-def _combine_local_date_time(d, t) -> datetime:
-    return datetime.combine(d, t, tzinfo=TZ)
-
-
 def _ensure_uuid(s: str, *, field: str) -> uuid.UUID:
     try:
         return uuid.UUID(s)
@@ -133,31 +142,14 @@ def _ensure_uuid(s: str, *, field: str) -> uuid.UUID:
         raise ValidationException(detail=f"Invalid {field}")
 
 
-async def _enqueue_custom_bulk_email(
-    *,
-    queue,
-    to_email: str,
-    caregiver_name: str,
-    child_name: str,
-    session: Session,
-    subject: str,
-    message: str,
-) -> None:
-    # Use the existing session_change_alert template for admin bulk comms.
-    loc = getattr(session, "session_location", None)
-    await queue.enqueue(
-        "send_session_change_alert_task",
-        to_email=to_email,
-        caregiver_name=caregiver_name,
-        child_name=child_name,
-        session_name=session.name,
-        session_venue=getattr(loc, "name", None),
-        session_address=getattr(loc, "address", None),
-        session_time=_format_time_range(session.day_of_week, session.start_time, session.end_time),
-        update_title=subject,
-        update_message=message,
-        affected_date=None,
-        contact_email=getattr(loc, "contact_email", None),
+def _job_status_out(job: Job) -> JobStatusOut:
+    return JobStatusOut(
+        key=job.key,
+        status=str(job.status.value),
+        progress=job.progress,
+        meta=job.meta,
+        result=job.result if isinstance(job.result, dict) else None,
+        error=job.error,
     )
 
 
@@ -221,6 +213,7 @@ class AdminController(Controller):
         )
         db.add(block)
         await db.flush()
+        on_commit(db, catalogue_cache.invalidate)
         block_type_val = block.block_type if isinstance(block.block_type, str) else block.block_type.value
         return SessionBlockOut(
             id=str(block.id),
@@ -254,6 +247,8 @@ class AdminController(Controller):
             block.timezone = data.timezone
 
         await db.flush()
+        on_commit(db, catalogue_cache.invalidate)
+        on_commit(db, calendar_feed_cache.clear)
         block_type_val = block.block_type if isinstance(block.block_type, str) else block.block_type.value
         return SessionBlockOut(
             id=str(block.id),
@@ -294,6 +289,7 @@ class AdminController(Controller):
         x = ExclusionDate(year=data.date.year, exclusion_date=data.date, reason=data.reason)
         db.add(x)
         await db.flush()
+        on_commit(db, calendar_feed_cache.clear)
         return ExclusionDateOut(id=str(x.id), year=x.year, date=x.exclusion_date, reason=x.reason)
 
     @patch(
@@ -325,6 +321,7 @@ class AdminController(Controller):
         if not x:
             raise NotFoundException(detail="Exclusion not found")
         await db.delete(x)
+        on_commit(db, calendar_feed_cache.clear)
         await db.commit()
 
     # ---------- Locations ----------
@@ -407,6 +404,7 @@ class AdminController(Controller):
         )
         db.add(loc)
         await db.flush()
+        on_commit(db, catalogue_cache.invalidate)
         return SessionLocationOut(
             id=str(loc.id),
             name=loc.name,
@@ -450,6 +448,8 @@ class AdminController(Controller):
             loc.internal_notes = data.internal_notes
 
         await db.flush()
+        on_commit(db, catalogue_cache.invalidate)
+        on_commit(db, calendar_feed_cache.clear)
         return SessionLocationOut(
             id=str(loc.id),
             name=loc.name,
@@ -627,6 +627,8 @@ class AdminController(Controller):
             block_id = _ensure_uuid(block_id_str, field="blockIds")
             db.add(SessionBlockLink(session_id=s.id, block_id=block_id))
         await db.flush()
+        on_commit(db, catalogue_cache.invalidate)
+        on_commit(db, availability_cache.invalidate)
 
         return SessionOut(
             session_type=s.session_type,
@@ -707,9 +709,14 @@ class AdminController(Controller):
             for block_id_str in data.block_ids:
                 block_id = _ensure_uuid(block_id_str, field="blockIds")
                 db.add(SessionBlockLink(session_id=s.id, block_id=block_id))
+            # Removed links leave no updated_at behind; mark the session changed so feeds' Last-Modified moves
+            s.updated_at = func.now()
 
         await db.flush()
         await db.refresh(s, ["block_links"])
+        on_commit(db, catalogue_cache.invalidate)
+        on_commit(db, availability_cache.invalidate)
+        on_commit(db, calendar_feed_cache.invalidator(session_id))
 
         return SessionOut(
             id=str(s.id),
@@ -744,6 +751,9 @@ class AdminController(Controller):
         if not s:
             raise NotFoundException(detail="Session not found")
 
+        on_commit(db, catalogue_cache.invalidate)
+        on_commit(db, availability_cache.invalidate)
+        on_commit(db, calendar_feed_cache.invalidator(session_id))
         await db.delete(s)
         await db.commit()
 
@@ -787,6 +797,8 @@ class AdminController(Controller):
             new_link = SessionBlockLink(session_id=new_session.id, block_id=bl.block_id)
             db.add(new_link)
 
+        on_commit(db, catalogue_cache.invalidate)
+        on_commit(db, availability_cache.invalidate)
         await db.commit()
         await db.refresh(new_session, ["block_links"])
 
@@ -828,66 +840,52 @@ class AdminController(Controller):
         s = await db.get(Session, session_id)
         if not s:
             raise NotFoundException(detail="Session not found")
-        if s.session_type != "term":
-            raise ValidationException(detail="Occurrence generation is for term sessions")
-        if s.day_of_week is None or s.start_time is None or s.end_time is None:
-            raise ValidationException(detail="Session schedule is incomplete")
-
-        blocks_res = await db.execute(
-            select(SessionBlock)
-            .join(SessionBlockLink, SessionBlockLink.block_id == SessionBlock.id)
-            .where(SessionBlockLink.session_id == s.id)
-            .order_by(SessionBlock.start_date)
-        )
-        blocks = blocks_res.scalars().all()
-
-        if not blocks:
-            raise ValidationException(detail="No blocks selected for this session. Please add blocks first.")
 
-        ex_res = await db.execute(select(ExclusionDate).where(ExclusionDate.year.in_({b.year for b in blocks})))
-        excluded_by_year = {}
-        for x in ex_res.scalars().all():
-            excluded_by_year.setdefault(x.year, set()).add(x.exclusion_date)
+        try:
+            result = await materialise_session_occurrences(db, s)
+        except ScheduleError as exc:
+            raise ValidationException(detail=str(exc)) from exc
 
-        created = 0
-        skipped_existing = 0
+        on_commit(db, calendar_feed_cache.invalidator(session_id))
+        return {"created": result.created, "skippedExisting": result.skipped_existing}
 
-        for block in blocks:
-            day = block.start_date
-            days_ahead = (int(s.day_of_week) - day.weekday() + 7) % 7
-            day = day + timedelta(days=days_ahead)
-
-            excluded = excluded_by_year.get(block.year, set())
+    @get(
+        "/sessions/{session_id:uuid}/occurrences/preview",
+        status_code=HTTP_200_OK,
+        summary="Preview generated occurrences",
+        tags=["Admin: Occurrences"],
+    )
+    async def preview_occurrences(self, db: AsyncSession, session_id: uuid.UUID) -> list[OccurrencePreviewOut]:
+        """Dry run of occurrence generation: the occurrences the schedule implies. Writes nothing.
 
-            while day <= block.end_date:
-                if day not in excluded:
-                    starts_at = _combine_local_date_time(day, s.start_time)
-                    ends_at = _combine_local_date_time(day, s.end_time)
+        `exists` marks those that generation would skip because an occurrence
+        already starts at that time.
+        """
+        s = await db.get(Session, session_id)
+        if not s:
+            raise NotFoundException(detail="Session not found")
 
-                    exists_res = await db.execute(
-                        select(SessionOccurrence.id).where(
-                            SessionOccurrence.session_id == s.id,
-                            SessionOccurrence.starts_at == starts_at,
-                        )
-                    )
-                    if exists_res.scalar_one_or_none():
-                        skipped_existing += 1
-                    else:
-                        db.add(
-                            SessionOccurrence(
-                                session_id=s.id,
-                                block_id=block.id,
-                                starts_at=starts_at,
-                                ends_at=ends_at,
-                                auto_generated=True,
-                            )
-                        )
-                        created += 1
+        try:
+            occurrences = await expand_session_schedule(db, s)
+        except ScheduleError as exc:
+            raise ValidationException(detail=str(exc)) from exc
 
-                day = day + timedelta(days=7)
+        existing = await existing_occurrence_starts(db, session_id)
+        names_res = await db.execute(
+            select(SessionBlock.id, SessionBlock.name).where(SessionBlock.id.in_({o.block_id for o in occurrences}))
+        )
+        block_names = dict(names_res.tuples().all())
 
-        await db.flush()
-        return {"created": created, "skippedExisting": skipped_existing}
+        return [
+            OccurrencePreviewOut(
+                startsAt=occ.starts_at,
+                endsAt=occ.ends_at,
+                blockId=str(occ.block_id),
+                blockName=block_names.get(occ.block_id),
+                exists=occ.starts_at.astimezone(UTC) in existing,
+            )
+            for occ in occurrences
+        ]
 
     @post(
         "/sessions/{session_id:uuid}/occurrences/regenerate",
@@ -912,85 +910,67 @@ class AdminController(Controller):
         s = await db.get(Session, session_id)
         if not s:
             raise NotFoundException(detail="Session not found")
-        if s.session_type != "term":
-            raise ValidationException(detail="Regeneration is for term sessions")
-
-        deleted = 0
-        if delete_auto_generated:
-            # Delete only auto-generated occurrences
-            result = await db.execute(
-                delete(SessionOccurrence).where(
-                    SessionOccurrence.session_id == session_id,
-                    SessionOccurrence.auto_generated == True,  # noqa: E712
-                )
-            )
-            deleted = getattr(result, "rowcount", 0) or 0
-            await db.flush()
-
-        # Manually generate occurrences (duplicating logic from generate_occurrences)
-        stmt = (
-            select(SessionBlock)
-            .join(SessionBlockLink, SessionBlockLink.block_id == SessionBlock.id)
-            .where(SessionBlockLink.session_id == session_id)
-            .order_by(SessionBlock.start_date.asc())
-        )
-        blocks_res = await db.execute(stmt)
-        blocks = list(blocks_res.scalars().all())
-
-        if not blocks:
-            raise ValidationException(detail="No blocks selected for this session. Please add blocks first.")
-
-        exclusions_stmt = select(ExclusionDate).where(ExclusionDate.year.in_({b.year for b in blocks}))
-        exclusions_res = await db.execute(exclusions_stmt)
-        exclusion_dates_by_year = {}
-        for ed in exclusions_res.scalars():
-            exclusion_dates_by_year.setdefault(ed.year, set()).add(ed.exclusion_date)
-
-        created = 0
-        skipped_existing = 0
-
-        for block in blocks:
-            tz = ZoneInfo("Pacific/Auckland")
-            day = block.start_date
-            while day <= block.end_date:
-                if (
-                    s.day_of_week
-                    and day.weekday() == s.day_of_week.value
-                    and day not in exclusion_dates_by_year.get(block.year, set())
-                ):
-                    starts_at = datetime.combine(day, s.start_time, tzinfo=tz)
-                    ends_at = datetime.combine(day, s.end_time, tzinfo=tz)
-
-                    exists_res = await db.execute(
-                        select(SessionOccurrence.id).where(
-                            SessionOccurrence.session_id == s.id,
-                            SessionOccurrence.starts_at == starts_at,
-                        )
-                    )
-                    if exists_res.scalar_one_or_none():
-                        skipped_existing += 1
-                    else:
-                        db.add(
-                            SessionOccurrence(
-                                session_id=s.id,
-                                block_id=block.id,
-                                starts_at=starts_at,
-                                ends_at=ends_at,
-                                auto_generated=True,
-                            )
-                        )
-                        created += 1
 
-                day = day + timedelta(days=7)
+        try:
+            result = await materialise_session_occurrences(db, s, replace_auto_generated=delete_auto_generated)
+        except ScheduleError as exc:
+            raise ValidationException(detail=str(exc)) from exc
 
-        await db.flush()
+        on_commit(db, calendar_feed_cache.invalidator(session_id))
 
         return {
-            "deleted": deleted,
-            "created": created,
-            "skippedExisting": skipped_existing,
+            "deleted": result.deleted,
+            "created": result.created,
+            "skippedExisting": result.skipped_existing,
         }
 
+    @post(
+        "/occurrences/generate",
+        status_code=HTTP_202_ACCEPTED,
+        summary="Generate occurrences for a year or block (background job)",
+        tags=["Admin: Occurrences"],
+    )
+    async def generate_occurrences_batch(self, db: AsyncSession, data: OccurrenceBatchGenerate) -> JobStatusOut:
+        """Enqueue occurrence generation for every non-archived term session in a year or block.
+
+        Exactly one of `year` or `blockId` must be given. While a job for the same
+        year/block is still queued or running, the existing job is returned instead of
+        starting another. Poll `GET /jobs/{key}` for progress and result counts.
+        """
+        if (data.year is None) == (data.block_id is None):
+            raise ValidationException(detail="Specify exactly one of year or blockId")
+
+        if data.block_id is not None:
+            block_id = _ensure_uuid(data.block_id, field="blockId")
+            if not await db.get(SessionBlock, block_id):
+                raise NotFoundException(detail="Block not found")
+            key = f"materialise-occurrences-block-{block_id}"
+            kwargs = {"block_id": str(block_id)}
+        else:
+            key = f"materialise-occurrences-year-{data.year}"
+            kwargs = {"year": data.year}
+
+        queue = get_queue()
+        job = await queue.enqueue("materialise_occurrences_task", key=key, timeout=600, **kwargs)
+        if job is None:
+            job = await queue.job(key)
+        if job is None:
+            raise NotFoundException(detail="Job not found")
+        return _job_status_out(job)
+
+    @get(
+        "/jobs/{job_key:str}",
+        status_code=HTTP_200_OK,
+        summary="Get background job status",
+        tags=["Admin: Jobs"],
+    )
+    async def get_job_status(self, job_key: str) -> JobStatusOut:
+        """Return status, progress and result of a background job."""
+        job = await get_queue().job(job_key)
+        if job is None:
+            raise NotFoundException(detail="Job not found")
+        return _job_status_out(job)
+
     @get(
         "/sessions/{session_id:uuid}/occurrences",
         status_code=HTTP_200_OK,
@@ -1045,6 +1025,16 @@ class AdminController(Controller):
                     block_id = block.id
                     break
 
+        # One occurrence per start time (uq_session_occurrences_session_starts)
+        duplicate = await db.scalar(
+            select(SessionOccurrence.id).where(
+                SessionOccurrence.session_id == s.id,
+                SessionOccurrence.starts_at == data.starts_at,
+            )
+        )
+        if duplicate is not None:
+            raise HTTPException(status_code=HTTP_409_CONFLICT, detail="An occurrence already starts at this time")
+
         # Manually created occurrences are marked auto_generated=False
         o = SessionOccurrence(
             session_id=s.id,
@@ -1055,6 +1045,7 @@ class AdminController(Controller):
         )
         db.add(o)
         await db.flush()
+        on_commit(db, calendar_feed_cache.invalidator(o.session_id))
         return OccurrenceOut(
             id=str(o.id),
             sessionId=str(o.session_id),
@@ -1090,30 +1081,25 @@ class AdminController(Controller):
         o.cancelled = bool(data.cancelled)
         o.cancellation_reason = data.cancellation_reason
         await db.flush()
+        on_commit(db, calendar_feed_cache.invalidator(o.session_id))
 
         # Automatic caregiver notification on cancellation/reinstatement.
         if was_cancelled != o.cancelled or prev_reason != o.cancellation_reason:
-            session_res = await db.execute(
-                select(Session).options(selectinload(Session.session_location)).where(Session.id == o.session_id)
+            if o.cancelled:
+                title = "Session cancelled"
+                message = o.cancellation_reason or "This session has been cancelled."
+            else:
+                title = "Session update"
+                message = "This session is scheduled to run as normal."
+
+            await _enqueue_session_notice(
+                db=db,
+                queue=get_queue(),
+                session_id=o.session_id,
+                update_title=title,
+                update_message=message,
+                affected_date=_fmt_local_datetime(o.starts_at) if o.starts_at else None,
             )
-            session = session_res.scalar_one_or_none()
-            if session:
-                queue = get_queue()
-                if o.cancelled:
-                    title = "Session cancelled"
-                    message = o.cancellation_reason or "This session has been cancelled."
-                else:
-                    title = "Session update"
-                    message = "This session is scheduled to run as normal."
-
-                await _notify_confirmed_signups(
-                    db=db,
-                    queue=queue,
-                    session=session,
-                    update_title=title,
-                    update_message=message,
-                    affected_date=_fmt_local_datetime(o.starts_at) if o.starts_at else None,
-                )
 
         return OccurrenceOut(
             id=str(o.id),
@@ -1195,6 +1181,8 @@ class AdminController(Controller):
         await db.flush()
 
         if old_status != su.status:
+            on_commit(db, availability_cache.invalidate)
+
             # Automatic caregiver notifications for status changes.
             session_res = await db.execute(
                 select(Session).options(selectinload(Session.session_location)).where(Session.id == su.session_id)
@@ -1533,40 +1521,29 @@ class AdminController(Controller):
         tags=["Admin: Communications"],
     )
     async def bulk_email_session(self, db: AsyncSession, session_id: uuid.UUID, data: BulkEmailRequest) -> dict:
-        """Send a custom email to all confirmed signups for a session."""
+        """Send a custom email to all confirmed signups for a session.
+
+        Enqueues a single job; the worker resolves the recipients and sends in batches.
+        """
         session_res = await db.execute(
-            select(Session).options(selectinload(Session.session_location)).where(Session.id == session_id)
+            select(Session.id, SessionLocation.contact_email)
+            .outerjoin(SessionLocation, SessionLocation.id == Session.session_location_id)
+            .where(Session.id == session_id)
         )
-        session = session_res.scalar_one_or_none()
+        session = session_res.one_or_none()
         if not session:
             raise NotFoundException(detail="Session not found")
 
-        res = await db.execute(
-            select(Signup, CaregiverStaffView, ChildStaffView)
-            .join(CaregiverStaffView, Signup.caregiver_id == CaregiverStaffView.id)
-            .join(ChildStaffView, Signup.child_id == ChildStaffView.id)
-            .where(Signup.session_id == session_id, Signup.status == "confirmed")
-            .order_by(Signup.created_at.asc())
+        # Use the existing session_change_alert template for admin bulk comms.
+        return await _enqueue_session_notice(
+            db=db,
+            queue=get_queue(),
+            session_id=session_id,
+            update_title=data.subject,
+            update_message=data.message,
+            affected_date=None,
+            contact_email=session.contact_email,
         )
-        rows = res.all()
-
-        queue = get_queue()
-        enqueued = 0
-        for su, caregiver, child in rows:
-            if not caregiver.email or not caregiver.name:
-                continue
-            await _enqueue_custom_bulk_email(
-                queue=queue,
-                to_email=caregiver.email,
-                caregiver_name=caregiver.name,
-                child_name=child.name,
-                session=session,
-                subject=data.subject,
-                message=data.message,
-            )
-            enqueued += 1
-
-        return {"enqueued": enqueued}
 
     @post(
         "/sessions/{session_id:uuid}/notify",
@@ -1577,25 +1554,21 @@ class AdminController(Controller):
     async def notify_session(self, db: AsyncSession, session_id: uuid.UUID, data: SessionChangeAlertRequest) -> dict:
         """Send a notification to all confirmed signups for a session.
 
-        This reuses the existing `session_change_alert` email template.
+        This reuses the existing `session_change_alert` email template. Enqueues a
+        single job; the worker resolves the recipients and sends in batches.
         """
-        session_res = await db.execute(
-            select(Session).options(selectinload(Session.session_location)).where(Session.id == session_id)
-        )
-        session = session_res.scalar_one_or_none()
-        if not session:
+        exists = await db.scalar(select(Session.id).where(Session.id == session_id))
+        if not exists:
             raise NotFoundException(detail="Session not found")
 
-        queue = get_queue()
-        enqueued = await _notify_confirmed_signups(
+        return await _enqueue_session_notice(
             db=db,
-            queue=queue,
-            session=session,
+            queue=get_queue(),
+            session_id=session_id,
             update_title=data.update_title,
             update_message=data.update_message,
             affected_date=data.affected_date,
         )
-        return {"enqueued": enqueued}
 
     # ---------- Exports ----------
 
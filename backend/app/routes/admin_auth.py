@@ -14,7 +14,13 @@ from litestar.status_codes import HTTP_200_OK
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.admin_auth import ADMIN_SESSION_COOKIE, create_admin_session, is_allowed_admin
+from app.admin_auth import (
+    ADMIN_SESSION_COOKIE,
+    create_admin_session,
+    get_admin_token,
+    is_allowed_admin,
+    revoke_admin_session,
+)
 from app.config import settings
 from app.db import get_db_session
 from app.models.staff import Staff
@@ -173,8 +179,15 @@ class AdminAuthController(Controller):
         return {"ok": True, "hasSession": bool(raw)}
 
     @post("/logout", status_code=HTTP_200_OK, summary="Admin logout")
-    async def logout(self) -> Response:
-        """Clear the admin_session cookie; tokens are stateless and expire naturally."""
+    async def logout(self, request: Request) -> Response:
+        """Revoke the caller's admin token and clear the admin_session cookie.
+
+        The revocation is shared with every API worker (see `app.admin_auth`) until
+        the token expires.
+        """
+        token = get_admin_token(request)
+        if token:
+            await revoke_admin_session(token)
         response = Response(content={"ok": True}, status_code=HTTP_200_OK)
         response.delete_cookie(ADMIN_SESSION_COOKIE, path="/")
         return response
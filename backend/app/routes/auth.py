@@ -20,10 +20,12 @@ from app.auth import (
 )
 from app.config import settings
 from app.db import get_db_session
+from app.middleware.rate_limit import HOUR, Limit, check_rate_limit
 from app.models.caregiver import Caregiver
 from app.models.caregiver_auth import CaregiverMagicLink, CaregiverSession
 from app.schemas.auth import LogoutResponse, MagicLinkRequest, MagicLinkRequestResponse
 from app.services.email import email_service
+from app.services.principal_cache import principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +51,12 @@ class AuthController(Controller):
         """Send a passwordless magic link to a caregiver email, creating an account if needed and reusing unexpired links to throttle."""
         print("Requesting magic link for email:", data.email)
         email = str(data.email).strip().lower()
+        if not settings.debug:
+            # Per address as well as per IP (see RateLimitMiddleware), so one inbox can't be flooded
+            await check_rate_limit(
+                f"magic-link-email:{hash_token(email)}",
+                [Limit(settings.magic_link_rate_limit_per_hour, HOUR)],
+            )
         return_to = _safe_return_to(data.return_to)
 
         # Find or create caregiver account.
@@ -133,6 +141,8 @@ class AuthController(Controller):
 
         # Mark link used.
         link.used_at = now
+        if not caregiver.email_verified:
+            await principal_cache.invalidate_caregiver(db, caregiver.id)
         caregiver.email_verified = True
         caregiver.last_login_at = now
 
@@ -178,6 +188,7 @@ class AuthController(Controller):
             sess = result.scalar_one_or_none()
             if sess and sess.revoked_at is None:
                 sess.revoked_at = now
+            await principal_cache.invalidate(db, token_hash)
 
         response = Response(content=LogoutResponse(ok=True).model_dump(), status_code=HTTP_200_OK)
         response.delete_cookie(CARE_GIVER_SESSION_COOKIE, path="/")
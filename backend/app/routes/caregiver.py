@@ -7,18 +7,19 @@ from typing import Literal, cast
 
 from litestar import Controller, Request, get, patch, post
 from litestar.di import Provide
-from litestar.exceptions import NotFoundException, ValidationException
+from litestar.exceptions import NotAuthorizedException, NotFoundException, ValidationException
 from litestar.response import Response
-from litestar.status_codes import HTTP_200_OK
+from litestar.status_codes import HTTP_200_OK, HTTP_304_NOT_MODIFIED
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.auth import get_current_caregiver
 from app.config import settings
-from app.db import get_db_session
+from app.db import get_db_session, on_commit
+from app.models.caregiver import Caregiver
 from app.models.child import Child
 from app.models.session import Session
+from app.models.session_location import SessionLocation
 from app.models.signup import Signup
 from app.schemas.caregiver import (
     AuthenticatedSignupCreate,
@@ -31,7 +32,9 @@ from app.schemas.caregiver import (
 )
 from app.schemas.session import _format_time_range
 from app.schemas.signup import SignupCreateResponse
-from app.services.calendar import build_session_calendar_feed
+from app.services.availability import availability_cache, spots_left
+from app.services.calendar_feeds import get_session_feed
+from app.services.principal_cache import principal_cache
 from app.worker import get_queue
 
 logger = logging.getLogger(__name__)
@@ -55,19 +58,23 @@ class CaregiverController(Controller):
             name=caregiver.name,
             phone=caregiver.phone,
             email_verified=caregiver.email_verified,
-            profile_complete=bool(caregiver.name and caregiver.phone),
+            profile_complete=caregiver.profile_complete,
         )
 
     @patch("/me", status_code=HTTP_200_OK, summary="Update caregiver profile")
     async def update_me(self, request: Request, db: AsyncSession, data: CaregiverUpdate) -> CaregiverMe:
         """Update caregiver name and phone number."""
-        caregiver = await get_current_caregiver(request, db)
-        assert caregiver is not None  # Required by dependency
+        principal = await get_current_caregiver(request, db)
+        assert principal is not None  # Required by dependency
+        caregiver = await db.get(Caregiver, principal.id)
+        if caregiver is None:
+            raise NotAuthorizedException(detail="Invalid session")
         caregiver.name = data.name
         caregiver.phone = data.phone
         if data.referral_source:
             caregiver.referral_source = data.referral_source
         await db.flush()
+        await principal_cache.invalidate_caregiver(db, caregiver.id)
 
         if data.subscribe_newsletter:
             queue = get_queue()
@@ -204,10 +211,27 @@ class CaregiverController(Controller):
         if not caregiver.name or not caregiver.phone:
             raise ValidationException(detail="Complete caregiver profile before signing up")
 
+        # Only the columns the signup and its email need: no Session entity, so no relationship loads.
         session_result = await db.execute(
-            select(Session).options(selectinload(Session.session_location)).where(Session.id == session_id)
+            select(
+                Session.id,
+                Session.name,
+                Session.age_lower,
+                Session.age_upper,
+                Session.waitlist,
+                Session.day_of_week,
+                Session.start_time,
+                Session.end_time,
+                Session.year,
+                Session.session_type,
+                Session.what_to_bring,
+                SessionLocation.name.label("location_name"),
+                SessionLocation.address.label("location_address"),
+            )
+            .join(SessionLocation, SessionLocation.id == Session.session_location_id)
+            .where(Session.id == session_id)
         )
-        session = session_result.scalar_one_or_none()
+        session = session_result.one_or_none()
         if not session:
             raise NotFoundException(detail="Session not found")
 
@@ -236,6 +260,10 @@ class CaregiverController(Controller):
         if session.age_upper is not None and age > session.age_upper:
             is_age_eligible = False
 
+        # Count confirmed signups in SQL rather than over the loaded signups list.
+        at_capacity = await spots_left(db, session.id) == 0
+        on_commit(db, availability_cache.invalidate)
+
         # Prevent duplicate signup for same child+session.
         existing_result = await db.execute(
             select(Signup).where(Signup.session_id == session_id, Signup.child_id == child.id)
@@ -244,7 +272,7 @@ class CaregiverController(Controller):
         if existing and existing.status == "withdrawn":
             # Re-activate a withdrawn signup (uniqueness constraint prevents creating a new row).
             # If child is not age-eligible or session is in waitlist mode or at capacity, set to waitlisted
-            if not is_age_eligible or session.waitlist or session.is_at_capacity():
+            if not is_age_eligible or session.waitlist or at_capacity:
                 existing.status = "waitlisted"
             else:
                 existing.status = "confirmed"
@@ -260,12 +288,10 @@ class CaregiverController(Controller):
                 caregiver_name=caregiver.name,
                 child_name=child.name,
                 session_name=session.name,
-                session_venue=getattr(getattr(session, "session_location", None), "name", None),
-                session_address=getattr(getattr(session, "session_location", None), "address", None),
+                session_venue=session.location_name,
+                session_address=session.location_address,
                 session_time=_format_time_range(session.day_of_week, session.start_time, session.end_time),
-                term_summary=f"{getattr(session, 'year', '')}"
-                if getattr(session, "session_type", "term") == "term"
-                else None,
+                term_summary=f"{session.year}" if session.session_type == "term" else None,
                 what_to_bring=session.what_to_bring,
                 signup_status=existing.status,
                 signup_id=str(existing.id),
@@ -278,7 +304,7 @@ class CaregiverController(Controller):
             )
 
         # Determine status - if not age-eligible, always waitlist regardless of capacity
-        if not is_age_eligible or session.waitlist or session.is_at_capacity():
+        if not is_age_eligible or session.waitlist or at_capacity:
             status = "waitlisted"
         else:
             status = "confirmed"
@@ -302,12 +328,10 @@ class CaregiverController(Controller):
             caregiver_name=caregiver.name,
             child_name=child.name,
             session_name=session.name,
-            session_venue=getattr(getattr(session, "session_location", None), "name", None),
-            session_address=getattr(getattr(session, "session_location", None), "address", None),
+            session_venue=session.location_name,
+            session_address=session.location_address,
             session_time=_format_time_range(session.day_of_week, session.start_time, session.end_time),
-            term_summary=f"{getattr(session, 'year', '')}"
-            if getattr(session, "session_type", "term") == "term"
-            else None,
+            term_summary=f"{session.year}" if session.session_type == "term" else None,
             what_to_bring=session.what_to_bring,
             signup_status=status,
             signup_id=str(signup.id),
@@ -323,29 +347,27 @@ class CaregiverController(Controller):
         caregiver = await get_current_caregiver(request, db)
         assert caregiver is not None  # Required by dependency
 
+        # Columns only: loading Session rows would also pull in each session's signups
         result = await db.execute(
-            select(Signup, Session, Child)
+            select(Signup.id, Signup.status, Signup.created_at, Session.id, Session.name, Child.id, Child.name)
             .join(Session, Signup.session_id == Session.id)
             .join(Child, Signup.child_id == Child.id)
             .where(Signup.caregiver_id == caregiver.id)
             .order_by(Signup.created_at.desc())
         )
 
-        rows = result.all()
-        out: list[CaregiverSignupOut] = []
-        for signup, session, child in rows:
-            out.append(
-                CaregiverSignupOut(
-                    id=str(signup.id),
-                    status=signup.status,
-                    createdAt=signup.created_at,
-                    sessionId=str(session.id),
-                    sessionName=session.name,
-                    childId=str(child.id),
-                    childName=child.name,
-                )
+        return [
+            CaregiverSignupOut(
+                id=str(signup_id),
+                status=status,
+                createdAt=created_at,
+                sessionId=str(session_id),
+                sessionName=session_name,
+                childId=str(child_id),
+                childName=child_name,
             )
-        return out
+            for signup_id, status, created_at, session_id, session_name, child_id, child_name in result.all()
+        ]
 
     @post(
         "/signup/{signup_id:uuid}/withdraw",
@@ -364,6 +386,7 @@ class CaregiverController(Controller):
             signup.status = "withdrawn"
             signup.withdrawn_at = datetime.now(UTC)
             await db.flush()
+            on_commit(db, availability_cache.invalidate)
 
         return SignupCreateResponse(
             id=str(signup.id), status=cast("Literal['pending', 'confirmed', 'waitlisted', 'withdrawn']", signup.status)
@@ -374,92 +397,54 @@ class CaregiverController(Controller):
         status_code=HTTP_200_OK,
         summary="Subscribe to signup calendar",
     )
-    async def get_signup_calendar_feed(self, request: Request, db: AsyncSession, signup_id: uuid.UUID) -> Response:
+    async def get_signup_calendar_feed(
+        self, request: Request, db: AsyncSession, signup_id: uuid.UUID, compact: bool = False
+    ) -> Response:
         """Generate a subscribable calendar feed for a specific signup.
 
         This provides a calendar subscription that includes all session occurrences
         for the child's signup. The calendar automatically updates when sessions
-        are modified or cancelled.
+        are modified or cancelled. `compact=true` publishes term sessions as weekly
+        recurring events.
 
         Add this URL to your calendar app to keep your schedule synchronized.
         """
         caregiver = await get_current_caregiver(request, db)
         assert caregiver is not None
 
-        # Get signup with related data
         result = await db.execute(
-            select(Signup)
-            .options(
-                selectinload(Signup.session).selectinload(Session.session_location),
-                selectinload(Signup.session).selectinload(Session.occurrences),
-                selectinload(Signup.child),
-            )
+            select(Signup.session_id, Signup.status, Child.name)
+            .join(Child, Child.id == Signup.child_id)
             .where(Signup.id == signup_id)
             .where(Signup.caregiver_id == caregiver.id)
         )
-        signup = result.scalar_one_or_none()
+        row = result.one_or_none()
 
-        if not signup or signup.status == "withdrawn":
+        if not row or row.status == "withdrawn":
             raise NotFoundException(detail="Signup not found or withdrawn")
 
-        session = signup.session
-        child = signup.child
-
-        # Default to Pacific/Auckland timezone
-        tzid = "Pacific/Auckland"
-        try:
-            from zoneinfo import ZoneInfo
-
-            tz = ZoneInfo(tzid)
-        except Exception:
-            tz = UTC
-            tzid = "UTC"
-
-        # Get relevant occurrences (future and recent past)
-        from datetime import timedelta
-
-        now = datetime.now(tz)
-        cutoff = now - timedelta(days=7)
-
-        occs = getattr(session, "occurrences", None) or []
-        relevant_occs = [o for o in occs if o.starts_at >= cutoff]
-        relevant_occs.sort(key=lambda o: o.starts_at)
-
-        # Convert to calendar feed format
-        occurrence_data = [
-            (
-                o.starts_at.astimezone(tz) if tz else o.starts_at,
-                o.ends_at.astimezone(tz) if tz else o.ends_at,
-                getattr(o, "cancelled", False),
-                getattr(o, "cancellation_reason", None),
-            )
-            for o in relevant_occs
-        ]
-
-        venue = session.session_location.name if session.session_location else session.name
-        address = session.session_location.address if session.session_location else ""
-        location = f"{venue} - {address}" if address else venue
-
-        # Include child name in session title
-        session_name = f"{session.name} - {child.name}"
-        url = f"{settings.frontend_base_url}/dashboard"
-
-        ics_text = build_session_calendar_feed(
-            session_id=str(signup.id),  # Use signup ID for uniqueness
-            session_name=session_name,
-            occurrences=occurrence_data,
-            location=location,
-            address=address,
-            tzid=tzid,
-            url=url,
-            refresh_interval_hours=24,
+        session_id, _status, child_name = row
+
+        # Include child name in session title; the variant key keeps this render apart from the public feed.
+        feed = await get_session_feed(
+            db,
+            session_id,
+            variant=f"signup:{signup_id}:{child_name}",
+            feed_id=str(signup_id),  # Use signup ID for uniqueness
+            title_suffix=child_name,
+            url=f"{settings.frontend_base_url}/dashboard",
+            public_only=False,
+            compact=compact,
         )
+        if feed is None:
+            raise NotFoundException(detail="Signup not found or withdrawn")
 
-        return Response(
-            content=ics_text,
-            media_type="text/calendar; charset=utf-8",
-            headers={
-                "Content-Disposition": f'inline; filename="session-{child.name.replace(" ", "-")}.ics"',
-                "Cache-Control": "public, max-age=3600",
-            },
-        )
+        headers = {
+            "Content-Disposition": f'inline; filename="session-{child_name.replace(" ", "-")}.ics"',
+            "Cache-Control": "public, max-age=3600",
+            **feed.validators,
+        }
+        if feed.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+            return Response(content=None, status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(content=feed.body, media_type="text/calendar; charset=utf-8", headers=headers)
@@ -1,33 +1,39 @@
 import logging
 from collections import defaultdict
-from datetime import UTC
+from typing import cast
 from uuid import UUID
 
-from litestar import Controller, get
+from litestar import Controller, MediaType, Request, get
 from litestar.di import Provide
-from litestar.exceptions import NotFoundException
+from litestar.exceptions import NotFoundException, ValidationException
 from litestar.response import Response
-from litestar.status_codes import HTTP_200_OK
+from litestar.status_codes import HTTP_200_OK, HTTP_304_NOT_MODIFIED
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.config import settings
 from app.db import get_db_session
-from app.models.session import Session
 from app.models.session_block import SessionBlock
 from app.models.session_block_link import SessionBlockLink
 from app.models.session_occurrence import SessionOccurrence
-from app.models.views import SessionOccurrencePublicView
+from app.models.views import SessionPublicView
 from app.schemas.session import (
-    SessionPublic,
+    SessionAvailability,
+    SessionNearby,
+    SessionNearbyPage,
     SessionPublicDetail,
     SessionRegionGroup,
 )
-from app.services.calendar import build_session_calendar_feed
+from app.services.availability import availability_cache
+from app.services.calendar_feeds import get_session_feed
+from app.services.catalogue import catalogue_cache
+from app.services.search import search_sessions
+from app.utils.http import etag_matches
 
 logger = logging.getLogger(__name__)
 
+MAX_NEARBY_LIMIT = 100
+
 
 class PublicController(Controller):
     """Public endpoints for caregivers (no auth required)."""
@@ -39,56 +45,102 @@ class PublicController(Controller):
     @get("/sessions", status_code=HTTP_200_OK, summary="List sessions")
     async def list_sessions(
         self,
+        request: Request,
         db: AsyncSession,
         q: str | None = None,
-    ) -> list[SessionRegionGroup]:
+    ) -> Response[list[SessionRegionGroup]]:
         """List active public sessions sorted by region.
 
         Returns only non-archived sessions with their block associations.
+        With `q`, sessions are ranked by fuzzy match on name, location, region and address.
+        The unfiltered listing is served from a cached snapshot with a strong ETag,
+        so revalidating clients receive `304 Not Modified`.
         """
-        # Load sessions with location
-        stmt = (
-            select(Session)
-            .options(selectinload(Session.session_location))
-            .where(~Session.archived)  # Only active sessions
-        )
-
         if q:
-            # Search in session name (simplified for cross-database compatibility)
-            search_term = f"%{q}%"
-            stmt = stmt.where(Session.name.ilike(search_term))
-
-        result = await db.execute(stmt)
-        sessions = result.unique().scalars().all()
-
-        # Load block info for each session via SQLAlchemy ORM (database-agnostic)
-        if sessions:
-            # Pre-load the block relationships using standard SQLAlchemy with eager loading
-            stmt_blocks = (
-                select(SessionBlockLink.session_id, SessionBlock.name)
-                .join(SessionBlock, SessionBlock.id == SessionBlockLink.block_id)
-                .where(SessionBlockLink.session_id.in_([s.id for s in sessions]))
+            return Response(content=await search_sessions(db, q))
+
+        snapshot = await catalogue_cache.get(db)
+        cache_headers = {
+            "Cache-Control": f"public, max-age={settings.public_catalogue_max_age_seconds}",
+            "Vary": "Accept-Encoding",
+        }
+
+        body, coding = snapshot.negotiate(request.headers.get("accept-encoding"))
+        etag = snapshot.etag_for(coding)
+
+        # The snapshot body is the serialised list; the annotation above documents it.
+        if etag_matches(request.headers.get("if-none-match"), snapshot.etags):
+            # Same validator as the 200 this client would get now, i.e. for its negotiated encoding
+            not_modified = Response(
+                content=None,
+                status_code=HTTP_304_NOT_MODIFIED,
+                headers={**cache_headers, "ETag": etag},
             )
-            block_result = await db.execute(stmt_blocks)
-            blocks_by_session = defaultdict(list)
+            return cast("Response[list[SessionRegionGroup]]", not_modified)
 
-            for session_id, block_name in block_result.all():
-                blocks_by_session[str(session_id)].append(block_name)
+        headers = {**cache_headers, "ETag": etag}
+        if coding:
+            headers["Content-Encoding"] = coding
+        return cast(
+            "Response[list[SessionRegionGroup]]", Response(content=body, media_type=MediaType.JSON, headers=headers)
+        )
 
-            # Attach blocks to sessions
-            for session in sessions:
-                session._blocks = blocks_by_session.get(str(session.id), [])  # type: ignore[attr-defined]
+    @get("/sessions/availability", status_code=HTTP_200_OK, summary="Get live session availability")
+    async def get_availability(
+        self,
+        db: AsyncSession,
+        ids: list[UUID] | None = None,
+    ) -> Response[dict[str, SessionAvailability]]:
+        """Spots left and waitlist state per active session, keyed by session id.
 
-        grouped: dict[str, list[SessionPublic]] = defaultdict(list)
-        for session in sessions:
-            region = session.session_location.region if session.session_location else "Unknown"
-            # Pass blocks to schema
-            blocks = getattr(session, "_blocks", [])
-            public_session = SessionPublic.from_orm_model(session, blocks=blocks)
-            grouped[region].append(public_session)
+        Pass `ids` (repeatable) to limit the response to specific sessions.
+        Counts are cached briefly, so they may lag the latest signups by a few seconds.
+        """
+        availability = await availability_cache.get(db)
+        if ids is not None:
+            wanted = {str(session_id) for session_id in ids}
+            availability = {sid: entry for sid, entry in availability.items() if sid in wanted}
 
-        sorted_groups = sorted(grouped.items(), key=lambda item: len(item[1]), reverse=True)
-        return [SessionRegionGroup(name=region_name, sessions=sessions) for region_name, sessions in sorted_groups]
+        return Response(
+            content=availability,
+            headers={"Cache-Control": f"public, max-age={settings.public_availability_ttl_seconds}"},
+        )
+
+    @get("/sessions/nearby", status_code=HTTP_200_OK, summary="List sessions near a point")
+    async def list_nearby_sessions(
+        self,
+        db: AsyncSession,
+        *,
+        lat: float,
+        lng: float,
+        limit: int = 20,
+        offset: int = 0,
+        radius_km: float | None = None,
+    ) -> SessionNearbyPage:
+        """List active public sessions nearest to `lat`/`lng`, with distances in kilometres.
+
+        Results are paginated with `limit`/`offset`; `radius_km` optionally caps the distance.
+        """
+        if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+            raise ValidationException(detail="Invalid coordinates")
+        if not 1 <= limit <= MAX_NEARBY_LIMIT or offset < 0:
+            raise ValidationException(detail="Invalid pagination")
+        if radius_km is not None and radius_km <= 0:
+            raise ValidationException(detail="Invalid radius")
+
+        snapshot = await catalogue_cache.get(db)
+        # Fetch one extra result to know whether another page exists.
+        nearest = snapshot.geo_index.nearest(lat, lng, limit=limit + 1, offset=offset, max_distance_km=radius_km)
+        items = [
+            SessionNearby(**session.model_dump(by_alias=True), distance_km=round(distance, 2))
+            for session, distance in nearest[:limit]
+        ]
+        return SessionNearbyPage(
+            items=items,
+            limit=limit,
+            offset=offset,
+            next_offset=offset + limit if len(nearest) > limit else None,
+        )
 
     @get("/session/{session_id:uuid}", status_code=HTTP_200_OK, summary="Get session")
     async def get_session(
@@ -99,12 +151,11 @@ class PublicController(Controller):
         """Fetch a session with full public details, including occurrences grouped by block."""
         from app.schemas.session import BlockOccurrences, SessionOccurrencePublic
 
-        session_res = await db.execute(
-            select(Session).options(selectinload(Session.session_location)).where(Session.id == session_id)
-        )
+        # sessions_public already excludes archived sessions and carries no relationships.
+        session_res = await db.execute(select(SessionPublicView).where(SessionPublicView.id == session_id))
         session = session_res.scalar_one_or_none()
 
-        if not session or session.archived:
+        if not session:
             raise NotFoundException(detail="Session not found")
 
         # Load blocks for this session (block id, name, type)
@@ -120,13 +171,19 @@ class PublicController(Controller):
         )
         block_rows = blocks_res.all()
 
-        # Load all occurrences for this session
+        # Load all occurrences for this session (columns only)
         occurrences_res = await db.execute(
-            select(SessionOccurrence)
+            select(
+                SessionOccurrence.block_id,
+                SessionOccurrence.starts_at,
+                SessionOccurrence.ends_at,
+                SessionOccurrence.cancelled,
+                SessionOccurrence.cancellation_reason,
+            )
             .where(SessionOccurrence.session_id == session_id)
             .order_by(SessionOccurrence.starts_at)
         )
-        all_occurrences = occurrences_res.scalars().all()
+        all_occurrences = occurrences_res.all()
 
         # Group occurrences by block
         occurrences_by_block_id = defaultdict(list)
@@ -169,8 +226,10 @@ class PublicController(Controller):
     )
     async def get_session_calendar(
         self,
+        request: Request,
         db: AsyncSession,
         session_id: UUID,
+        compact: bool = False,
     ) -> Response:
         """Generate an iCal (.ics) calendar for all session occurrences.
 
@@ -183,84 +242,22 @@ class PublicController(Controller):
         - Outlook (Add Calendar > From Internet)
         - Any iCal-compatible calendar application
 
-        The feed refreshes every 24 hours by default.
-        """
-        session_res = await db.execute(
-            select(Session).options(selectinload(Session.session_location)).where(Session.id == session_id)
-        )
-        session = session_res.scalar_one_or_none()
+        The feed refreshes every 24 hours by default. Rendered feeds are cached and carry
+        `ETag`/`Last-Modified`, so conditional polls get `304 Not Modified`.
 
-        if not session or session.archived:
+        With `compact=true`, term sessions are published as one weekly recurring event per
+        block (with exceptions) instead of one event per occurrence.
+        """
+        feed = await get_session_feed(db, session_id, compact=compact)
+        if feed is None:
             raise NotFoundException(detail="Session not found")
 
-        # Default to Pacific/Auckland for the calendar timezone
-        tzid = "Pacific/Auckland"
-        try:
-            from zoneinfo import ZoneInfo
-
-            tz = ZoneInfo(tzid)
-        except Exception:
-            tz = UTC
-            tzid = "UTC"
-
-        # Get all occurrences (including cancelled ones, which will be marked as CANCELLED)
-        from datetime import datetime
-
-        now = datetime.now(tz)
-        occ_res = await db.execute(
-            select(SessionOccurrencePublicView).where(SessionOccurrencePublicView.session_id == session_id)
-        )
-        occs = occ_res.scalars().all()
-
-        # Only include future and recent past occurrences (last 7 days)
-        from datetime import timedelta
-
-        def _ensure_aware(dt: datetime) -> datetime:
-            # SQLite may return naive datetimes even when timezone=True.
-            return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
-
-        cutoff = now - timedelta(days=7)
-        relevant_occs = [o for o in occs if _ensure_aware(o.starts_at) >= cutoff]
+        headers = {
+            "Content-Disposition": f'inline; filename="session-{session_id}.ics"',
+            "Cache-Control": "public, max-age=86400",  # Cache for 1 day
+            **feed.validators,
+        }
+        if feed.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+            return Response(content=None, status_code=HTTP_304_NOT_MODIFIED, headers=headers)
 
-        # Sort by start time
-        relevant_occs.sort(key=lambda o: _ensure_aware(o.starts_at))
-
-        # Convert to the format expected by build_session_calendar_feed
-        # (start, end, cancelled, cancellation_reason)
-        def _to_tz(dt: datetime) -> datetime:
-            return _ensure_aware(dt).astimezone(tz)
-
-        occurrence_data = [
-            (
-                _to_tz(o.starts_at) if tz else o.starts_at,
-                _to_tz(o.ends_at) if tz else o.ends_at,
-                getattr(o, "cancelled", False),
-                getattr(o, "cancellation_reason", None),
-            )
-            for o in relevant_occs
-        ]
-
-        venue = getattr(session, "location_name", None) or session.name
-        address = getattr(session, "location_address", None) or ""
-        location = f"{venue} - {address}" if address else venue
-        url = f"{settings.public_base_url}/sessions/{session.id}"
-
-        ics_text = build_session_calendar_feed(
-            session_id=str(session.id),
-            session_name=session.name,
-            occurrences=occurrence_data,
-            location=location,
-            address=address,
-            tzid=tzid,
-            url=url,
-            refresh_interval_hours=24,
-        )
-
-        return Response(
-            content=ics_text,
-            media_type="text/calendar; charset=utf-8",
-            headers={
-                "Content-Disposition": f'inline; filename="session-{session.id}.ics"',
-                "Cache-Control": "public, max-age= 86400",  # Cache for 1 day
-            },
-        )
+        return Response(content=feed.body, media_type="text/calendar; charset=utf-8", headers=headers)
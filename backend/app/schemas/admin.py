@@ -222,6 +222,33 @@ class OccurrenceCancel(BaseModel):
     cancellation_reason: str | None = Field(None, alias="cancellationReason")
 
 
+class OccurrencePreviewOut(BaseModel):
+    starts_at: datetime = Field(..., alias="startsAt")
+    ends_at: datetime = Field(..., alias="endsAt")
+    block_id: str = Field(..., alias="blockId")
+    block_name: str | None = Field(None, alias="blockName")
+    exists: bool = False  # An occurrence already starts at this time
+
+
+class OccurrenceBatchGenerate(BaseModel):
+    """Materialise occurrences for every term session in a year or a single block."""
+
+    year: int | None = None
+    block_id: str | None = Field(None, alias="blockId")
+
+
+# ---------- Background jobs ----------
+
+
+class JobStatusOut(BaseModel):
+    key: str
+    status: str
+    progress: float = 0.0
+    meta: dict = Field(default_factory=dict)
+    result: dict | None = None
+    error: str | None = None
+
+
 # ---------- Signups ----------
 
 
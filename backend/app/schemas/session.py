@@ -219,3 +219,25 @@ class SessionRegionGroup(BaseModel):
 
     name: str
     sessions: list[SessionPublic]
+
+
+class SessionNearby(SessionPublic):
+    """A public session with its distance from the caller."""
+
+    distance_km: float
+
+
+class SessionNearbyPage(BaseModel):
+    """One page of sessions ordered by distance."""
+
+    items: list[SessionNearby]
+    limit: int
+    offset: int
+    next_offset: int | None = None
+
+
+class SessionAvailability(BaseModel):
+    """Live availability for a session."""
+
+    spots_left: int
+    waitlist: bool  # New signups are waitlisted (waitlist mode or no spots left)
@@ -0,0 +1,72 @@
+"""Live session availability (spots left / waitlist) computed in SQL.
+
+Confirmed signups are counted with one `GROUP BY` instead of loading each
+session's signups into Python. The public map of all active sessions is cached
+for `public_availability_ttl_seconds`; signup writes in this process drop it
+early via `availability_cache.invalidate` (registered with `app.db.on_commit`).
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.session import Session
+from app.models.signup import Signup
+from app.schemas.session import SessionAvailability
+from app.utils.cache import TTLCache
+
+_ALL_ACTIVE = "all"
+
+
+async def load_availability(
+    db: AsyncSession, session_ids: list[uuid.UUID] | None = None, *, include_archived: bool = False
+) -> dict[str, SessionAvailability]:
+    """Return availability keyed by session id (all active sessions if `session_ids` is None)."""
+    confirmed = func.count(Signup.id).filter(Signup.status == "confirmed")
+    stmt = (
+        select(Session.id, Session.capacity, Session.waitlist, confirmed)
+        .outerjoin(Signup, Signup.session_id == Session.id)
+        .group_by(Session.id, Session.capacity, Session.waitlist)
+    )
+    if not include_archived:
+        stmt = stmt.where(~Session.archived)
+    if session_ids is not None:
+        stmt = stmt.where(Session.id.in_(session_ids))
+
+    result = await db.execute(stmt)
+    out: dict[str, SessionAvailability] = {}
+    for session_id, capacity, waitlist, confirmed_count in result.all():
+        spots_left = max(0, capacity - confirmed_count)
+        out[str(session_id)] = SessionAvailability(spots_left=spots_left, waitlist=waitlist or spots_left == 0)
+    return out
+
+
+async def spots_left(db: AsyncSession, session_id: uuid.UUID) -> int:
+    """Remaining confirmed places for a single session, archived or not."""
+    availability = await load_availability(db, [session_id], include_archived=True)
+    entry = availability.get(str(session_id))
+    return entry.spots_left if entry else 0
+
+
+class AvailabilityCache:
+    """Short-lived, process-local cache of the public availability map."""
+
+    def __init__(self) -> None:
+        self._cache: TTLCache[str, dict[str, SessionAvailability]] = TTLCache(maxsize=1, ttl_seconds=0)
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    async def get(self, db: AsyncSession) -> dict[str, SessionAvailability]:
+        availability = self._cache.get(_ALL_ACTIVE)
+        if availability is None:
+            availability = await load_availability(db)
+            self._cache.set(_ALL_ACTIVE, availability, ttl_seconds=settings.public_availability_ttl_seconds)
+        return availability
+
+
+availability_cache = AvailabilityCache()
@@ -0,0 +1,132 @@
+"""Cache invalidation events shared by every API worker and the SAQ worker.
+
+Hot caches (verified admin tokens, signed-in caregivers, rendered calendar feeds)
+live in each process's memory. When a process revokes or changes something it
+`publish`es an event: the handlers run in that process at once and, with the
+default `redis` `cache_events_backend`, in every other process through Redis
+pub/sub (`lifespan_cache_events` runs the subscriber in the API).
+
+Pub/sub is at most once: a process misses whatever is published while it is not
+subscribed. `connected` is only true while the subscription is up, and each
+`on_connect` callback runs when it is (re)confirmed, so caches drop entries that
+may have gone stale in between. Handlers must be idempotent; a publisher also
+receives its own event back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.services.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[dict[str, Any]], None]
+
+
+class CacheEvents:
+    """Routes published events to the handlers subscribed to their kind, in this process and (with Redis) others."""
+
+    def __init__(
+        self,
+        *,
+        use_redis: bool,
+        client: Callable[[], Redis] = get_redis,
+        channel: str = "cache-events",
+        reconnect_seconds: float = 1.0,
+    ) -> None:
+        self.use_redis = use_redis
+        self.client = client
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self._handlers: defaultdict[str, list[EventHandler]] = defaultdict(list)
+        self._on_connect: list[Callable[[], None]] = []
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        """Whether events published by other processes are currently being received."""
+        return self._connected
+
+    def subscribe(self, kind: str, handler: EventHandler, *, on_connect: Callable[[], None] | None = None) -> None:
+        self._handlers[kind].append(handler)
+        if on_connect is not None:
+            self._on_connect.append(on_connect)
+
+    async def publish(self, kind: str, **data: Any) -> None:
+        """Apply an event here, then send it to the other processes."""
+        self._dispatch(kind, data)
+        if not self.use_redis:
+            return
+        try:
+            await self.client().publish(self.channel, json.dumps({"kind": kind, **data}))
+        except RedisError as e:
+            logger.warning(f"Cache events unavailable, {kind} applied in this process only: {e}")
+
+    def receive(self, raw: bytes | str) -> None:
+        """Apply an event received from the channel; malformed ones are logged and dropped."""
+        try:
+            data = json.loads(raw)
+            kind = data.pop("kind")
+        except (ValueError, TypeError, AttributeError, KeyError):
+            logger.warning(f"Ignoring malformed cache event: {raw!r}")
+            return
+        self._dispatch(kind, data)
+
+    def _dispatch(self, kind: str, data: dict[str, Any]) -> None:
+        for handler in self._handlers.get(kind, []):
+            try:
+                handler(data)
+            except Exception:
+                logger.exception(f"Cache event handler failed for {kind}")
+
+    def _set_connected(self) -> None:
+        self._connected = True
+        for callback in self._on_connect:
+            callback()
+
+    async def listen(self) -> None:
+        """Receive events until cancelled, resubscribing after a lost connection."""
+        while True:
+            try:
+                async with self.client().pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "subscribe":
+                            self._set_connected()
+                        elif message["type"] == "message":
+                            self.receive(message["data"])
+            except RedisError as e:
+                logger.warning(f"Cache events subscription lost, retrying in {self.reconnect_seconds}s: {e}")
+            finally:
+                self._connected = False
+            await asyncio.sleep(self.reconnect_seconds)
+
+
+cache_events = CacheEvents(use_redis=settings.cache_events_backend == "redis")
+
+
+@asynccontextmanager
+async def lifespan_cache_events() -> AsyncGenerator[None, None]:
+    """Subscribe to other processes' events for the life of the app."""
+    if not cache_events.use_redis:
+        yield
+        return
+    task = asyncio.create_task(cache_events.listen())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
@@ -3,6 +3,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta
+from typing import TypedDict
 from zoneinfo import ZoneInfo
 
 
@@ -121,30 +122,128 @@ def _ics_escape(value: str) -> str:
     )
 
 
+@dataclass(frozen=True)
+class CalendarOccurrence:
+    id: str  # Stable occurrence id, used for the event UID
+    start: datetime
+    end: datetime
+    cancelled: bool = False
+    cancellation_reason: str | None = None
+
+
+@dataclass(frozen=True)
+class CalendarSeries:
+    """A weekly recurring event: one RRULE VEVENT plus EXDATEs and per-instance overrides."""
+
+    id: str  # Stable series id (e.g. the block id), used for the event UID
+    start: datetime  # First instance, in local time
+    end: datetime
+    until: datetime  # Start of the last instance
+    exdates: tuple[datetime, ...] = ()  # Local starts of instances that do not happen
+    overrides: tuple[tuple[datetime, CalendarOccurrence], ...] = ()  # (RECURRENCE-ID, replacement instance)
+
+
+_LOCAL_FMT = "%Y%m%dT%H%M%S"
+_UTC_FMT = "%Y%m%dT%H%M%SZ"
+
+
+class _EventFields(TypedDict):
+    """The `_vevent` arguments shared by every event in one feed."""
+
+    dtstamp: str
+    session_name: str
+    location: str
+    address: str
+    tzid: str
+    url: str | None
+
+
+def _vevent(
+    *,
+    uid: str,
+    dtstamp: str,
+    occ: CalendarOccurrence,
+    session_name: str,
+    location: str,
+    address: str,
+    tzid: str,
+    url: str | None,
+    extra: list[str] | None = None,
+) -> list[str]:
+    summary = f"Tūhura Tech: {session_name}"
+    if occ.cancelled:
+        summary = f"CANCELLED - {summary}"
+
+    description_parts = [session_name]
+    if address:
+        description_parts.append(address)
+    if occ.cancelled and occ.cancellation_reason:
+        description_parts.append(f"Cancelled: {occ.cancellation_reason}")
+    description = "\\n".join(description_parts)
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{_ics_escape(uid)}",
+        f"DTSTAMP:{dtstamp}",
+        *(extra or []),
+        f"DTSTART;TZID={_ics_escape(tzid)}:{occ.start.strftime(_LOCAL_FMT)}",
+        f"DTEND;TZID={_ics_escape(tzid)}:{occ.end.strftime(_LOCAL_FMT)}",
+        f"SUMMARY:{_ics_escape(summary)}",
+        f"LOCATION:{_ics_escape(location)}",
+        f"DESCRIPTION:{_ics_escape(description)}",
+        f"SEQUENCE:{1 if occ.cancelled else 0}",  # Bumped when an occurrence is cancelled
+    ]
+
+    if occ.cancelled:
+        lines.append("STATUS:CANCELLED")
+
+    if url:
+        lines.append(f"URL:{_ics_escape(url)}")
+
+    lines.append("END:VEVENT")
+    return lines
+
+
 def build_session_calendar_feed(
     *,
     session_id: str,
     session_name: str,
-    occurrences: list[tuple[datetime, datetime, bool, str | None]],
+    occurrences: list[CalendarOccurrence],
     location: str,
     address: str,
     tzid: str,
+    dtstamp: datetime,
     url: str | None = None,
     refresh_interval_hours: int = 24,
+    series: list[CalendarSeries] | None = None,
 ) -> str:
     """Create a subscribable calendar feed with multiple occurrences.
 
+    Output is a pure function of the arguments: UIDs come from occurrence/series ids
+    and DTSTAMP from `dtstamp`, so unchanged data renders byte-identical feeds.
+
     Args:
             session_id: Unique session identifier
             session_name: Display name of the session
-            occurrences: List of (start, end, cancelled, cancellation_reason) tuples
+            occurrences: Standalone occurrences with start/end already in `tzid` local time
             location: Venue name
             address: Venue address
             tzid: Timezone identifier (e.g., 'Pacific/Auckland')
+            dtstamp: When the feed data last changed (session, location and occurrence `updated_at`)
             url: Optional session details URL
             refresh_interval_hours: How often calendar clients should refresh (default 24h)
+            series: Weekly recurring events (compact feeds), emitted before `occurrences`
     """
-    dtstamp = datetime.now(ZoneInfo("UTC")).strftime("%Y%m%dT%H%M%SZ")
+    dtstamp_utc = dtstamp.astimezone(ZoneInfo("UTC")).strftime(_UTC_FMT)
+    tz_param = f"TZID={_ics_escape(tzid)}"
+    event_kwargs: _EventFields = {
+        "dtstamp": dtstamp_utc,
+        "session_name": session_name,
+        "location": location,
+        "address": address,
+        "tzid": tzid,
+        "url": url,
+    }
 
     lines: list[str] = [
         "BEGIN:VCALENDAR",
@@ -160,46 +259,25 @@ def build_session_calendar_feed(
         f"X-PUBLISHED-TTL:PT{refresh_interval_hours}H",
     ]
 
-    # Add each occurrence as a separate VEVENT
-    for idx, (start, end, cancelled, cancel_reason) in enumerate(occurrences):
-        start_local = start.strftime("%Y%m%dT%H%M%S")
-        end_local = end.strftime("%Y%m%dT%H%M%S")
-
-        # Unique UID for each occurrence
-        uid = f"session-{session_id}-occ-{idx}@tuhuratech.org.nz"
-
-        summary = f"Tūhura Tech: {session_name}"
-        if cancelled:
-            summary = f"CANCELLED - {summary}"
-
-        description_parts = [session_name]
-        if address:
-            description_parts.append(address)
-        if cancelled and cancel_reason:
-            description_parts.append(f"Cancelled: {cancel_reason}")
-        description = "\\n".join(description_parts)
-
-        lines.extend(
-            [
-                "BEGIN:VEVENT",
-                f"UID:{_ics_escape(uid)}",
-                f"DTSTAMP:{dtstamp}",
-                f"DTSTART;TZID={_ics_escape(tzid)}:{start_local}",
-                f"DTEND;TZID={_ics_escape(tzid)}:{end_local}",
-                f"SUMMARY:{_ics_escape(summary)}",
-                f"LOCATION:{_ics_escape(location)}",
-                f"DESCRIPTION:{_ics_escape(description)}",
-                f"SEQUENCE:{idx}",  # Version number for updates
-            ]
-        )
-
-        if cancelled:
-            lines.append("STATUS:CANCELLED")
-
-        if url:
-            lines.append(f"URL:{_ics_escape(url)}")
-
-        lines.append("END:VEVENT")
+    # One RRULE event per series; overrides share its UID and point at an instance via RECURRENCE-ID
+    for ser in series or []:
+        uid = f"session-{session_id}-series-{ser.id}@tuhuratech.org.nz"
+        # UNTIL must be UTC when DTSTART carries a TZID (RFC 5545 3.3.10).
+        rule = [f"RRULE:FREQ=WEEKLY;UNTIL={ser.until.astimezone(ZoneInfo('UTC')).strftime(_UTC_FMT)}"]
+        if ser.exdates:
+            rule.append(f"EXDATE;{tz_param}:{','.join(d.strftime(_LOCAL_FMT) for d in ser.exdates)}")
+        base = CalendarOccurrence(id=ser.id, start=ser.start, end=ser.end)
+        lines.extend(_vevent(uid=uid, occ=base, extra=rule, **event_kwargs))
+
+        for recurrence_id, occ in ser.overrides:
+            extra = [f"RECURRENCE-ID;{tz_param}:{recurrence_id.strftime(_LOCAL_FMT)}"]
+            lines.extend(_vevent(uid=uid, occ=occ, extra=extra, **event_kwargs))
+
+    # Add each standalone occurrence as a separate VEVENT
+    for occ in occurrences:
+        # Stable UID per occurrence, independent of its position in the feed
+        uid = f"session-{session_id}-occ-{occ.id}@tuhuratech.org.nz"
+        lines.extend(_vevent(uid=uid, occ=occ, **event_kwargs))
 
     lines.extend(["END:VCALENDAR", ""])
     return "\r\n".join(lines)
@@ -0,0 +1,413 @@
+"""Rendered, cached calendar (.ics) feeds for sessions and signups.
+
+Feeds come in two shapes: one VEVENT per occurrence (default), or a compact form for
+term sessions with one weekly RRULE event per block, EXDATEs for skipped weeks and
+RECURRENCE-ID overrides only for cancelled or moved weeks.
+
+Feeds are rendered deterministically (see `build_session_calendar_feed`) and kept
+per session in `calendar_feed_cache`, so most calendar-client polls are answered
+from memory, usually with `304 Not Modified`. `Last-Modified` and DTSTAMP are the
+latest `updated_at` of the session, its location, its occurrences and its blocks, or
+the local midnight at which the most recent past occurrence rolled out of the feed
+if that is later, so every process and every re-render reports the same time for the
+same data. Deleting occurrences or changing a session's blocks bumps the session's
+`updated_at`, since removed rows leave no timestamp behind. Exclusion dates only
+reach a feed through the occurrences regenerated from them. Admin writes that change
+a session's occurrences, the session itself, its location, its blocks or the
+exclusion dates drop the cached renders via `app.db.on_commit`. Writes made by the
+SAQ worker call `calendar_feed_cache.clear_everywhere`, which reaches the API
+processes as a cache event.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from functools import partial
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.session import Session
+from app.models.session_block import SessionBlock
+from app.models.session_block_link import SessionBlockLink
+from app.models.session_location import SessionLocation
+from app.models.session_occurrence import SessionOccurrence
+from app.models.views import SessionOccurrencePublicView
+from app.services.cache_events import CacheEvents, cache_events
+from app.services.calendar import CalendarOccurrence, CalendarSeries, build_session_calendar_feed
+from app.services.schedule_expander import local_datetime, local_span, weekly_dates
+from app.utils.cache import TTLCache
+from app.utils.http import http_date, not_modified, strong_etag
+
+FEED_TZID = "Pacific/Auckland"
+FEED_TZ = ZoneInfo(FEED_TZID)
+
+# Feeds include occurrences from the start of the local day this many days ago.
+RECENT_PAST_DAYS = 7
+
+CALENDAR_FEEDS_CLEARED_EVENT = "calendar-feeds-cleared"
+
+
+def _ensure_aware(dt: datetime) -> datetime:
+    # SQLite may return naive datetimes even when timezone=True.
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
+
+
+def feed_cutoff(now: datetime | None = None) -> datetime:
+    """Earliest occurrence start included in feeds.
+
+    Rounded to local midnight so a feed's content only changes once a day on its own.
+    """
+    today = (now or datetime.now(FEED_TZ)).astimezone(FEED_TZ).date()
+    return datetime.combine(today - timedelta(days=RECENT_PAST_DAYS), datetime.min.time(), tzinfo=FEED_TZ)
+
+
+def dropped_from_feed_at(starts_at: datetime) -> datetime:
+    """When an occurrence starting at `starts_at` stops being included by `feed_cutoff`."""
+    last_day = _ensure_aware(starts_at).astimezone(FEED_TZ).date() + timedelta(days=RECENT_PAST_DAYS)
+    return datetime.combine(last_day + timedelta(days=1), datetime.min.time(), tzinfo=FEED_TZ)
+
+
+@dataclass(frozen=True)
+class RenderedFeed:
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+    @property
+    def validators(self) -> dict[str, str]:
+        return {"ETag": self.etag, "Last-Modified": http_date(self.last_modified)}
+
+    def not_modified(self, if_none_match: str | None, if_modified_since: str | None) -> bool:
+        return not_modified(if_none_match, if_modified_since, self.etag, self.last_modified)
+
+
+class CalendarFeedCache:
+    """Rendered feeds keyed by session id, then by feed variant (public feed or a signup's feed)."""
+
+    def __init__(self, events: CacheEvents = cache_events) -> None:
+        self._cache: TTLCache[str, dict[str, RenderedFeed]] = TTLCache(
+            maxsize=settings.calendar_feed_cache_size,
+            ttl_seconds=settings.calendar_feed_cache_ttl_seconds,
+        )
+        self.events = events
+        events.subscribe(CALENDAR_FEEDS_CLEARED_EVENT, lambda _: self.clear(), on_connect=self.clear)
+
+    def get(self, session_id: uuid.UUID, variant: str) -> RenderedFeed | None:
+        variants = self._cache.get(str(session_id))
+        return variants.get(variant) if variants else None
+
+    def set(self, session_id: uuid.UUID, variant: str, feed: RenderedFeed) -> None:
+        variants = self._cache.get(str(session_id))
+        if variants is None:
+            variants = {}
+            self._cache.set(str(session_id), variants)
+        variants[variant] = feed
+
+    def invalidate(self, session_id: uuid.UUID | str) -> None:
+        """Drop every cached feed for one session."""
+        self._cache.pop(str(session_id))
+
+    def invalidator(self, session_id: uuid.UUID | str) -> Callable[[], None]:
+        """Callback for `on_commit` that drops one session's feeds."""
+        return partial(self.invalidate, session_id)
+
+    def clear(self) -> None:
+        """Drop every cached feed (e.g. after a location change)."""
+        self._cache.clear()
+
+    async def clear_everywhere(self) -> None:
+        """Drop every cached feed in every process, for writes made outside the API."""
+        await self.events.publish(CALENDAR_FEEDS_CLEARED_EVENT)
+
+
+calendar_feed_cache = CalendarFeedCache()
+
+
+def _plan_block_series(
+    block_id: str,
+    block_start: date,
+    block_end: date,
+    *,
+    weekday: int,
+    start_time: time,
+    end_time: time,
+    occurrences: list[CalendarOccurrence],
+    from_date: date,
+) -> tuple[CalendarSeries | None, list[CalendarOccurrence]]:
+    """Describe a block's occurrences as a weekly series.
+
+    Each weekly slot from `from_date` to the block end is matched with the block's
+    occurrence on that date. Slots with no occurrence (exclusion dates, deleted weeks)
+    become EXDATEs, and a matched occurrence that is cancelled or moved becomes an
+    override. Occurrences that match no slot are returned for standalone events.
+    """
+    slots = weekly_dates(max(block_start, from_date), block_end, weekday)
+
+    if not slots or not occurrences:
+        return None, occurrences
+
+    by_date: dict[date, list[CalendarOccurrence]] = defaultdict(list)
+    for occ in occurrences:
+        by_date[occ.start.date()].append(occ)
+
+    exdates: list[datetime] = []
+    overrides: list[tuple[datetime, CalendarOccurrence]] = []
+    leftovers: list[CalendarOccurrence] = []
+    for day in slots:
+        expected_start, expected_end = local_span(day, start_time, end_time, FEED_TZ)
+        candidates = by_date.pop(day, [])
+        if not candidates:
+            exdates.append(expected_start)
+            continue
+
+        candidates.sort(key=lambda o: abs(o.start - expected_start))
+        match, *rest = candidates
+        leftovers.extend(rest)
+        if match.cancelled or match.start != expected_start or match.end != expected_end:
+            overrides.append((expected_start, match))
+
+    leftovers.extend(occ for day_occs in by_date.values() for occ in day_occs)
+    if len(exdates) == len(slots):
+        # Nothing follows the weekly pattern; a series of exceptions only would be noise.
+        return None, occurrences
+
+    first_start, first_end = local_span(slots[0], start_time, end_time, FEED_TZ)
+    series = CalendarSeries(
+        id=block_id,
+        start=first_start,
+        end=first_end,
+        until=local_datetime(slots[-1], start_time, FEED_TZ),
+        exdates=tuple(exdates),
+        overrides=tuple(overrides),
+    )
+    return series, leftovers
+
+
+async def _compact_term_events(
+    db: AsyncSession,
+    session_id: uuid.UUID,
+    *,
+    weekday: int,
+    start_time: time,
+    end_time: time,
+    cutoff: datetime,
+) -> tuple[list[CalendarSeries], list[CalendarOccurrence]]:
+    """Split a term session's occurrences into per-block weekly series and standalone events."""
+    blocks_res = await db.execute(
+        select(SessionBlock.id, SessionBlock.start_date, SessionBlock.end_date)
+        .join(SessionBlockLink, SessionBlockLink.block_id == SessionBlock.id)
+        .where(SessionBlockLink.session_id == session_id, SessionBlock.end_date >= cutoff.date())
+        .order_by(SessionBlock.start_date)
+    )
+    occ_res = await db.execute(
+        select(
+            SessionOccurrence.id,
+            SessionOccurrence.block_id,
+            SessionOccurrence.starts_at,
+            SessionOccurrence.ends_at,
+            SessionOccurrence.cancelled,
+            SessionOccurrence.cancellation_reason,
+        )
+        .where(SessionOccurrence.session_id == session_id, SessionOccurrence.starts_at >= cutoff.astimezone(UTC))
+        .order_by(SessionOccurrence.starts_at)
+    )
+
+    by_block: dict[str | None, list[CalendarOccurrence]] = defaultdict(list)
+    for o in occ_res.all():
+        by_block[str(o.block_id) if o.block_id else None].append(
+            CalendarOccurrence(
+                id=str(o.id),
+                start=_ensure_aware(o.starts_at).astimezone(FEED_TZ),
+                end=_ensure_aware(o.ends_at).astimezone(FEED_TZ),
+                cancelled=bool(o.cancelled),
+                cancellation_reason=o.cancellation_reason,
+            )
+        )
+
+    series: list[CalendarSeries] = []
+    for block_id, block_start, block_end in blocks_res.all():
+        block_series, leftovers = _plan_block_series(
+            str(block_id),
+            block_start,
+            block_end,
+            weekday=weekday,
+            start_time=start_time,
+            end_time=end_time,
+            occurrences=by_block.pop(str(block_id), []),
+            from_date=cutoff.date(),
+        )
+        if block_series is not None:
+            series.append(block_series)
+        by_block[None].extend(leftovers)
+
+    standalone = sorted((occ for occs in by_block.values() for occ in occs), key=lambda o: o.start)
+    return series, standalone
+
+
+async def _render_session_feed(
+    db: AsyncSession,
+    session_id: uuid.UUID,
+    *,
+    feed_id: str,
+    title_suffix: str | None,
+    url: str,
+    public_only: bool,
+    compact: bool,
+) -> RenderedFeed | None:
+    cutoff = feed_cutoff()
+    # Latest change to any of the session's occurrences (e.g. a cancellation)
+    occurrences_changed_at = (
+        select(func.max(SessionOccurrence.updated_at))
+        .where(SessionOccurrence.session_id == Session.id)
+        .scalar_subquery()
+    )
+    # Latest change to a linked block's dates (compact feeds end each series at the block end)
+    blocks_changed_at = (
+        select(func.max(SessionBlock.updated_at))
+        .join(SessionBlockLink, SessionBlockLink.block_id == SessionBlock.id)
+        .where(SessionBlockLink.session_id == Session.id)
+        .scalar_subquery()
+    )
+    # The most recent occurrence already behind the cutoff
+    last_dropped_start = (
+        select(func.max(SessionOccurrence.starts_at))
+        .where(SessionOccurrence.session_id == Session.id, SessionOccurrence.starts_at < cutoff.astimezone(UTC))
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Session.name,
+            Session.updated_at,
+            Session.session_type,
+            Session.day_of_week,
+            Session.start_time,
+            Session.end_time,
+            SessionLocation.name,
+            SessionLocation.address,
+            SessionLocation.updated_at,
+            occurrences_changed_at,
+            blocks_changed_at,
+            last_dropped_start,
+        )
+        .join(SessionLocation, SessionLocation.id == Session.session_location_id)
+        .where(Session.id == session_id)
+    )
+    if public_only:
+        stmt = stmt.where(~Session.archived)
+
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        return None
+    (
+        session_name,
+        session_updated_at,
+        session_type,
+        day_of_week,
+        start_time,
+        end_time,
+        venue,
+        address,
+        location_updated_at,
+        occurrence_updated_at,
+        block_updated_at,
+        dropped_start,
+    ) = row
+    # When the feed's data last changed: the same in every process and across re-renders
+    changed_at = [session_updated_at, location_updated_at, occurrence_updated_at, block_updated_at]
+    if dropped_start is not None:
+        changed_at.append(dropped_from_feed_at(dropped_start))
+    data_updated_at = max(_ensure_aware(ts) for ts in changed_at if ts is not None).replace(microsecond=0)
+
+    series: list[CalendarSeries] = []
+    if compact and session_type == "term" and day_of_week is not None:
+        series, occurrences = await _compact_term_events(
+            db,
+            session_id,
+            weekday=int(day_of_week),
+            start_time=start_time,
+            end_time=end_time,
+            cutoff=cutoff,
+        )
+    else:
+        # Occurrences from the cutoff on (including cancelled ones, which will be marked as CANCELLED),
+        # windowed and ordered in SQL on the (session_id, starts_at) index.
+        occ_res = await db.execute(
+            select(SessionOccurrencePublicView)
+            .where(
+                SessionOccurrencePublicView.session_id == session_id,
+                SessionOccurrencePublicView.starts_at >= cutoff.astimezone(UTC),
+            )
+            .order_by(SessionOccurrencePublicView.starts_at)
+        )
+        occurrences = [
+            CalendarOccurrence(
+                id=str(o.id),
+                start=_ensure_aware(o.starts_at).astimezone(FEED_TZ),
+                end=_ensure_aware(o.ends_at).astimezone(FEED_TZ),
+                cancelled=bool(o.cancelled),
+                cancellation_reason=o.cancellation_reason,
+            )
+            for o in occ_res.scalars().all()
+        ]
+
+    venue = venue or session_name
+    address = address or ""
+    ics_text = build_session_calendar_feed(
+        session_id=feed_id,
+        session_name=f"{session_name} - {title_suffix}" if title_suffix else session_name,
+        occurrences=occurrences,
+        location=f"{venue} - {address}" if address else venue,
+        address=address,
+        tzid=FEED_TZID,
+        dtstamp=data_updated_at,
+        url=url,
+        refresh_interval_hours=24,
+        series=series,
+    )
+    body = ics_text.encode()
+    return RenderedFeed(body=body, etag=strong_etag(body), last_modified=data_updated_at)
+
+
+async def get_session_feed(
+    db: AsyncSession,
+    session_id: uuid.UUID,
+    *,
+    variant: str = "public",
+    feed_id: str | None = None,
+    title_suffix: str | None = None,
+    url: str | None = None,
+    public_only: bool = True,
+    compact: bool = False,
+) -> RenderedFeed | None:
+    """Return the rendered feed for a session, from cache when possible.
+
+    `variant` distinguishes feeds of the same session that render differently (the
+    public feed vs a signup feed titled with the child's name); it must change whenever
+    `feed_id`, `title_suffix` or `url` would. Returns None if the session does not exist.
+    `compact` selects the RRULE form for term sessions.
+    """
+    if compact:
+        variant = f"{variant}:compact"
+    feed = calendar_feed_cache.get(session_id, variant)
+    if feed is not None:
+        return feed
+
+    feed = await _render_session_feed(
+        db,
+        session_id,
+        feed_id=feed_id or str(session_id),
+        title_suffix=title_suffix,
+        url=url or f"{settings.public_base_url}/sessions/{session_id}",
+        public_only=public_only,
+        compact=compact,
+    )
+    if feed is not None:
+        calendar_feed_cache.set(session_id, variant, feed)
+    return feed
@@ -0,0 +1,173 @@
+"""Public session catalogue snapshot.
+
+The unfiltered `/api/v1/sessions` response is identical for every caller, so it is
+built once, serialised (plus pre-compressed variants) and served from memory with a
+strong ETag. Admin writes that touch sessions, locations or blocks invalidate it via
+`catalogue_cache.invalidate` (registered with `app.db.on_commit`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import importlib
+import importlib.util
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.session_block import SessionBlock
+from app.models.session_block_link import SessionBlockLink
+from app.models.views import SessionPublicView
+from app.schemas.session import SessionPublic, SessionRegionGroup
+from app.utils.http import accepted_encodings, strong_etag
+
+if TYPE_CHECKING:
+    from app.services.geo import GeoGridIndex
+    from app.services.search import SessionSearchIndex
+
+# Optional: gzip is always available.
+brotli: ModuleType | None = importlib.import_module("brotli") if importlib.util.find_spec("brotli") else None
+
+logger = logging.getLogger(__name__)
+
+_groups_adapter = TypeAdapter(list[SessionRegionGroup])
+
+
+async def build_region_groups(db: AsyncSession) -> list[SessionRegionGroup]:
+    """Load active public sessions and group them by region (largest region first)."""
+    # sessions_public holds active sessions with their location flattened in: no relationship loads.
+    result = await db.execute(select(SessionPublicView))
+    sessions = result.scalars().all()
+
+    blocks_by_session: dict[str, list[str]] = defaultdict(list)
+    if sessions:
+        stmt_blocks = (
+            select(SessionBlockLink.session_id, SessionBlock.name)
+            .join(SessionBlock, SessionBlock.id == SessionBlockLink.block_id)
+            .where(SessionBlockLink.session_id.in_([s.id for s in sessions]))
+        )
+        block_result = await db.execute(stmt_blocks)
+        for session_id, block_name in block_result.all():
+            blocks_by_session[str(session_id)].append(block_name)
+
+    grouped: dict[str, list[SessionPublic]] = defaultdict(list)
+    for session in sessions:
+        region = session.location_region or "Unknown"
+        blocks = blocks_by_session.get(str(session.id), [])
+        grouped[region].append(SessionPublic.from_orm_model(session, blocks=blocks))
+
+    sorted_groups = sorted(grouped.items(), key=lambda item: len(item[1]), reverse=True)
+    return [SessionRegionGroup(name=region_name, sessions=sessions) for region_name, sessions in sorted_groups]
+
+
+@dataclass
+class CatalogueSnapshot:
+    """A serialised catalogue response and its pre-compressed variants."""
+
+    version: int
+    groups: list[SessionRegionGroup]
+    body: bytes
+    etag: str
+    built_at: float
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, version: int, groups: list[SessionRegionGroup]) -> CatalogueSnapshot:
+        body = _groups_adapter.dump_json(groups, by_alias=True)
+        encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encoded["br"] = brotli.compress(body)
+        return cls(
+            version=version,
+            groups=groups,
+            body=body,
+            etag=strong_etag(body),
+            built_at=time.monotonic(),
+            encoded=encoded,
+        )
+
+    @cached_property
+    def sessions_by_id(self) -> dict[str, SessionPublic]:
+        return {session.id: session for group in self.groups for session in group.sessions}
+
+    @cached_property
+    def search_index(self) -> SessionSearchIndex:
+        """Trigram index for in-process search, built on first use."""
+        from app.services.search import SessionSearchIndex
+
+        return SessionSearchIndex([session for group in self.groups for session in group.sessions])
+
+    @cached_property
+    def geo_index(self) -> GeoGridIndex:
+        """Spatial grid for nearest-session queries, built on first use."""
+        from app.services.geo import GeoGridIndex
+
+        return GeoGridIndex([session for group in self.groups for session in group.sessions])
+
+    @property
+    def etags(self) -> list[str]:
+        """ETags for every representation (each encoding is a distinct representation)."""
+        return [self.etag] + [self.etag_for(coding) for coding in self.encoded]
+
+    def etag_for(self, coding: str | None) -> str:
+        if not coding:
+            return self.etag
+        return f'{self.etag[:-1]}-{coding}"'
+
+    def negotiate(self, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """Pick the best pre-compressed body for the client's `Accept-Encoding`."""
+        accepted = accepted_encodings(accept_encoding)
+        for coding in ("br", "gzip"):
+            if coding in self.encoded and (coding in accepted or "*" in accepted):
+                return self.encoded[coding], coding
+        return self.body, None
+
+
+class CatalogueCache:
+    """Process-local holder for the current catalogue snapshot."""
+
+    def __init__(self) -> None:
+        self._snapshot: CatalogueSnapshot | None = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Mark the current snapshot stale; the next read rebuilds it."""
+        self._version += 1
+
+    def _is_fresh(self, snapshot: CatalogueSnapshot) -> bool:
+        if snapshot.version != self._version:
+            return False
+        return time.monotonic() - snapshot.built_at < settings.public_catalogue_ttl_seconds
+
+    async def get(self, db: AsyncSession) -> CatalogueSnapshot:
+        """Return the current snapshot, rebuilding it (once, under a lock) if stale."""
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(snapshot):
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and self._is_fresh(snapshot):
+                return snapshot
+
+            # Capture the version first so a write that lands mid-build leaves this snapshot stale.
+            version = self._version
+            groups = await build_region_groups(db)
+            snapshot = CatalogueSnapshot.build(version, groups)
+            self._snapshot = snapshot
+            logger.info("Rebuilt public catalogue snapshot v%s (%s bytes)", version, len(snapshot.body))
+            return snapshot
+
+
+catalogue_cache = CatalogueCache()
@@ -1,19 +1,28 @@
 """Email service using Mailgun API with Jinja2 templating."""
 
+import json
 import logging
-from dataclasses import dataclass
-from pathlib import Path
+from dataclasses import dataclass, field
 
 import httpx
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
 
 from app.config import settings
+from app.services.email_governor import (
+    EmailDeferredError,
+    build_email_governor,
+    emails_deferred,
+    emails_failed,
+    emails_sent,
+    emails_throttled,
+    retry_after_seconds,
+    transient_errors_deferred,
+)
+from app.services.email_templates import build_template_registry
+from app.services.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
-# Template directory
-TEMPLATES_DIR = Path(__file__).parent.parent / "templates" / "email"
-
 
 @dataclass
 class EmailMessage:
@@ -27,6 +36,14 @@ class EmailMessage:
     reply_to: str | None = None
 
 
+@dataclass
+class BatchRecipient:
+    """One recipient of `EmailService.send_batch` and their personalised template values."""
+
+    email: str
+    variables: dict[str, str] = field(default_factory=dict)
+
+
 class EmailService:
     """Service for sending emails via Mailgun."""
 
@@ -37,12 +54,11 @@ class EmailService:
         self.from_email = settings.email_from
         self.from_name = settings.email_from_name
         self.dry_run = settings.email_dry_run
+        self.max_recipients = settings.mailgun_max_recipients
+        self.governor = build_email_governor()
 
-        # Initialize Jinja2 environment
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(TEMPLATES_DIR),
-            autoescape=select_autoescape(["html", "xml"]),
-        )
+        # All email templates, compiled once
+        self.templates = build_template_registry()
 
     def render_template(self, template_name: str, **context) -> tuple[str, str | None]:
         """Render an email template.
@@ -50,25 +66,19 @@ class EmailService:
         Returns (html_content, text_content) tuple.
         Text content is None if no .txt template exists.
         """
-        html_template = self.jinja_env.get_template(f"{template_name}.html")
-        html_content = html_template.render(**context)
-
-        text_content = None
-        try:
-            text_template = self.jinja_env.get_template(f"{template_name}.txt")
-            text_content = text_template.render(**context)
-        except Exception:
-            # Text template is optional
-            pass
-
-        return html_content, text_content
+        return self.templates.render(template_name, **context)
 
     async def send(self, message: EmailMessage) -> bool:
         """Send an email via Mailgun.
 
         In dry_run mode, logs the email instead of sending.
         Returns True if successful (or dry run), False otherwise.
-        Always sends HTML form; text is optional fallback.
+        Always sends HTML form; text is optional fallback. A BCC list larger than
+        `mailgun_max_recipients` is split across several API calls.
+        Calls are paced by `app.services.email_governor`; inside
+        `deferring_transient_errors()` a throttled or transient failure raises
+        `EmailDeferredError` instead of returning False. A retry after that sends
+        every BCC chunk again, including those already accepted.
         """
         if self.dry_run:
             logger.info(
@@ -97,30 +107,149 @@ class EmailService:
         if message.text:
             data["text"] = message.text
 
-        if message.bcc:
-            data["bcc"] = message.bcc
-
         if message.reply_to:
             data["h:Reply-To"] = message.reply_to
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
+        # Large BCC lists go out as several calls, each within the provider's recipient limit
+        sent = True
+        for bcc in self._bcc_chunks(message):
+            sent = await self._post_message({**data, "bcc": bcc} if bcc else data, str(message.to)) and sent
+        return sent
+
+    def _render_batch_template(
+        self, template_name: str, variable_names: list[str], **context
+    ) -> tuple[str, str | None]:
+        # Per-recipient values become Mailgun placeholders. Mailgun substitutes them verbatim,
+        # so the HTML body points at the pre-escaped `<name>_html` copy of each value.
+        html_template, text_template = self.templates.get(template_name)
+        html_content = html_template.render(
+            **context, **{name: Markup("%recipient.{}_html%").format(name) for name in variable_names}
+        )
+
+        text_content = None
+        if text_template is not None:
+            text_content = text_template.render(**context, **{name: f"%recipient.{name}%" for name in variable_names})
+
+        return html_content, text_content
+
+    async def send_batch(
+        self,
+        *,
+        template_name: str,
+        subject: str,
+        recipients: list[BatchRecipient],
+        reply_to: str | None = None,
+        **context,
+    ) -> int:
+        """Send one template to many recipients, personalised by Mailgun recipient-variables.
+
+        The template is rendered once; each key of `BatchRecipient.variables` is filled
+        in per recipient by Mailgun, and `subject` may use the same `%recipient.<name>%`
+        placeholders. Every recipient gets their own message with only their address in
+        To. Recipient emails must be unique. Requests carry at most
+        `mailgun_max_recipients` recipients each; if one is deferred (see `send`), a
+        retry of the whole call emails the recipients of earlier requests again, so
+        callers that retry pass at most that many recipients per call.
+
+        Returns the number of recipients accepted (all of them in dry_run mode).
+        """
+        if not recipients:
+            return 0
+
+        variable_names = sorted({name for r in recipients for name in r.variables})
+        html, text = self._render_batch_template(template_name, variable_names, **context)
+
+        if self.dry_run:
+            logger.info(
+                "DRY RUN - Would send batch email:\n"
+                f"  To: {len(recipients)} recipients\n"
+                f"  Subject: {subject}\n"
+                f"  Reply-To: {reply_to}"
+                f"\n\n{html}"
+            )
+            return len(recipients)
+
+        if not self.api_key or not self.domain:
+            logger.error("Mailgun API key or domain not configured")
+            return 0
+
+        data = {
+            "from": f"{self.from_name} <{self.from_email}>",
+            "subject": subject,
+            "html": html,
+        }
+        if text:
+            data["text"] = text
+        if reply_to:
+            data["h:Reply-To"] = reply_to
+
+        accepted = 0
+        size = max(1, self.max_recipients)
+        for start in range(0, len(recipients), size):
+            chunk = recipients[start : start + size]
+            recipient_variables = {}
+            for r in chunk:
+                values = {name: r.variables.get(name, "") for name in variable_names}
+                values.update({f"{name}_html": str(escape(value)) for name, value in values.items()})
+                recipient_variables[r.email] = values
+
+            batch = {
+                **data,
+                "to": [r.email for r in chunk],
+                "recipient-variables": json.dumps(recipient_variables),
+            }
+            if await self._post_message(batch, f"{len(chunk)} recipients", count=len(chunk)):
+                accepted += len(chunk)
+        return accepted
+
+    def _bcc_chunks(self, message: EmailMessage) -> list[list[str]]:
+        if not message.bcc:
+            return [[]]
+        size = max(1, self.max_recipients - len(message.to))
+        return [message.bcc[i : i + size] for i in range(0, len(message.bcc), size)]
+
+    async def _post_message(self, data: dict, to: str, count: int = 1) -> bool:
+        """POST one Mailgun message request carrying `count` messages, paced by the governor."""
+        async with self.governor.slot():
+            try:
+                response = await get_http_client().post(
                     f"{self.api_url}/{self.domain}/messages",
                     auth=("api", self.api_key),
                     data=data,
                 )
-                response.raise_for_status()
-                logger.info(f"Email sent successfully to {message.to}")
-                return True
-
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Mailgun API error: {e.response.status_code} - {e.response.text}")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to send email: {e}")
+            except httpx.TransportError as e:
+                return self._transient_failure(f"Failed to send email: {e}", None, count)
+            except Exception as e:
+                logger.error(f"Failed to send email: {e}")
+                emails_failed.add(count)
+                return False
+
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = retry_after_seconds(response)
+            if response.status_code == 429:
+                self.governor.throttle(retry_after)
+                emails_throttled.add(count)
+            return self._transient_failure(
+                f"Mailgun API error: {response.status_code} - {response.text}", retry_after, count
+            )
+        if response.is_error:
+            logger.error(f"Mailgun API error: {response.status_code} - {response.text}")
+            emails_failed.add(count)
             return False
 
+        emails_sent.add(count)
+        logger.info(f"Email sent successfully to {to}")
+        return True
+
+    def _transient_failure(self, reason: str, retry_after: float | None, count: int) -> bool:
+        if transient_errors_deferred():
+            logger.warning(f"{reason}; deferring for retry")
+            emails_deferred.add(count)
+            raise EmailDeferredError(reason, retry_after=retry_after)
+        logger.error(reason)
+        emails_failed.add(count)
+        return False
+
     async def send_signup_confirmation(
         self,
         to_email: str,
@@ -0,0 +1,158 @@
+"""Client-side pacing for outbound email (Mailgun).
+
+`EmailGovernor` caps in-flight API calls with a semaphore and paces them with a
+token bucket at `mailgun_requests_per_second`. A 429 pauses every caller until its
+`Retry-After` has passed.
+
+Transient failures (429, 5xx, network errors) are reported as `False` like any
+other failed send, except inside `deferring_transient_errors()`: there they raise
+`EmailDeferredError` so a worker task can be retried later by SAQ (see
+`app.worker`) rather than dropping the message or holding its slot asleep. Inside
+that block a caller that would have to wait longer than
+`email_max_throttle_wait_seconds` for its turn also gets `EmailDeferredError`;
+elsewhere (a magic link sent during a request) it waits.
+
+A deferred send that spans several requests (a long BCC list, a batch above
+`mailgun_max_recipients`) is retried from its first request, so the recipients of
+requests already accepted get the message again. Tasks that must not duplicate
+send one request's worth per call and record their progress, as
+`send_session_notice_task` and `process_batch_emails_task` do.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+from opentelemetry import metrics
+
+from app.config import settings
+
+_meter = metrics.get_meter(__name__)
+emails_sent = _meter.create_counter("email.messages.sent", unit="{message}", description="Messages accepted by Mailgun")
+emails_throttled = _meter.create_counter(
+    "email.messages.throttled", unit="{message}", description="Messages rejected by Mailgun with 429"
+)
+emails_failed = _meter.create_counter(
+    "email.messages.failed", unit="{message}", description="Messages that failed and will not be retried"
+)
+emails_deferred = _meter.create_counter(
+    "email.messages.deferred", unit="{message}", description="Messages handed back to the queue for a later retry"
+)
+
+_defer_transient: ContextVar[bool] = ContextVar("defer_transient_email_errors", default=False)
+
+
+class EmailDeferredError(Exception):
+    """A send hit a transient failure or throttle and should be retried later."""
+
+    def __init__(self, reason: str, retry_after: float | None = None) -> None:
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+@contextmanager
+def deferring_transient_errors() -> Generator[None, None, None]:
+    """Within this block, transient send failures raise `EmailDeferredError` instead of returning False."""
+    token = _defer_transient.set(True)
+    try:
+        yield
+    finally:
+        _defer_transient.reset(token)
+
+
+def transient_errors_deferred() -> bool:
+    return _defer_transient.get()
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """Parse a `Retry-After` header given as delta-seconds or an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(UTC)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Reserve-ahead token bucket: `reserve()` returns how long the caller must wait."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self) -> None:
+        self._tokens = min(self.burst, self._tokens + 1)
+
+
+class EmailGovernor:
+    def __init__(
+        self,
+        *,
+        requests_per_second: float,
+        burst: int,
+        max_concurrency: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self._bucket = TokenBucket(requests_per_second, burst)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._paused_until = 0.0
+        self.max_wait_seconds = max_wait_seconds
+
+    def throttle(self, retry_after: float | None) -> None:
+        """Pause all sends after a 429 (for `Retry-After`, or one second if not given)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + (retry_after or 1.0))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None, None]:
+        """Wait for a paced, concurrency-limited turn to call the provider.
+
+        Inside `deferring_transient_errors()`, raises `EmailDeferredError` rather than
+        waiting longer than `max_wait_seconds`.
+        """
+        pause = self._paused_until - time.monotonic()
+        if pause > self.max_wait_seconds and transient_errors_deferred():
+            msg = "Provider asked us to slow down"
+            raise EmailDeferredError(msg, retry_after=pause)
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+        async with self._semaphore:
+            wait = self._bucket.reserve()
+            if wait > self.max_wait_seconds and transient_errors_deferred():
+                self._bucket.refund()
+                msg = "Outbound email rate limit reached"
+                raise EmailDeferredError(msg, retry_after=wait)
+            if wait:
+                await asyncio.sleep(wait)
+            yield
+
+
+def build_email_governor() -> EmailGovernor:
+    return EmailGovernor(
+        requests_per_second=settings.mailgun_requests_per_second,
+        burst=settings.mailgun_burst,
+        max_concurrency=settings.mailgun_max_concurrency,
+        max_wait_seconds=settings.email_max_throttle_wait_seconds,
+    )
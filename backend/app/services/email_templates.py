@@ -0,0 +1,81 @@
+"""Precompiled email templates.
+
+Every template under `templates/email` is compiled once when the registry is
+loaded, with its optional `.txt` variant recorded up front, so rendering is a dict
+lookup plus `Template.render` with no loader calls, stat()s or swallowed
+`TemplateNotFound` per email. Auto-reload is only enabled with `settings.debug`;
+compiled bytecode can be shared across processes and restarts through
+`email_template_bytecode_cache_dir`.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates" / "email"
+
+
+class EmailTemplateRegistry:
+    def __init__(
+        self,
+        templates_dir: Path = TEMPLATES_DIR,
+        *,
+        auto_reload: bool = False,
+        bytecode_cache_dir: str | None = None,
+    ) -> None:
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+        self.env = Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=select_autoescape(["html", "xml"]),
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache,
+        )
+        self.auto_reload = auto_reload
+        self._html: dict[str, Template] = {}
+        self._text: dict[str, Template] = {}
+
+    def load(self) -> None:
+        """Compile every `.html` template and its `.txt` variant, if any."""
+        names = self.env.list_templates(extensions=["html", "txt"])
+        for filename in names:
+            name, _, ext = filename.rpartition(".")
+            (self._html if ext == "html" else self._text)[name] = self.env.get_template(filename)
+        logger.info(f"Compiled {len(self._html)} email templates ({len(self._text)} with text variants)")
+
+    def get(self, name: str) -> tuple[Template, Template | None]:
+        """Return the (html, text) templates for `name`; text is None if there is no `.txt` variant."""
+        if self.auto_reload:
+            # Development: go through Jinja so edited templates are picked up
+            html = self.env.get_template(f"{name}.html")
+            text = self.env.get_template(f"{name}.txt") if name in self._text else None
+            return html, text
+
+        html = self._html.get(name)
+        if html is None:
+            # Not preloaded: let Jinja load it (or raise TemplateNotFound as before)
+            html = self._html[name] = self.env.get_template(f"{name}.html")
+        return html, self._text.get(name)
+
+    def render(self, name: str, **context) -> tuple[str, str | None]:
+        html, text = self.get(name)
+        return html.render(**context), text.render(**context) if text is not None else None
+
+
+def build_template_registry() -> EmailTemplateRegistry:
+    registry = EmailTemplateRegistry(
+        auto_reload=settings.debug,
+        bytecode_cache_dir=settings.email_template_bytecode_cache_dir or None,
+    )
+    registry.load()
+    return registry
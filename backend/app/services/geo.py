@@ -0,0 +1,120 @@
+"""Nearest-session lookup over session location coordinates.
+
+Locations are bucketed into a fixed lat/lng grid kept in memory alongside the
+catalogue snapshot, so it is rebuilt whenever sessions or locations change. A
+query walks outward ring by ring from the caller's cell and stops as soon as no
+unvisited cell can hold anything closer than the results already found.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from collections.abc import Iterator
+
+from app.schemas.session import SessionPublic
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# ~28 km of latitude per cell: a handful of cells covers a city.
+GRID_CELL_DEGREES = 0.25
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+_Entry = tuple[float, float, SessionPublic]
+
+
+class GeoGridIndex:
+    """Grid index of sessions by location coordinates."""
+
+    def __init__(self, sessions: list[SessionPublic], cell_degrees: float = GRID_CELL_DEGREES) -> None:
+        self._cell = cell_degrees
+        self._lng_cells = round(360 / cell_degrees)
+        self._cells: dict[tuple[int, int], list[_Entry]] = defaultdict(list)
+        self._size = 0
+
+        for session in sessions:
+            loc = session.location_details
+            if loc is None:
+                continue
+            lat, lng = loc.latlong.lat, loc.latlong.lng
+            self._cells[self._key(lat, lng)].append((lat, lng, session))
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _key(self, lat: float, lng: float) -> tuple[int, int]:
+        # Longitude wraps so the antimeridian (e.g. the Chatham Islands) is not an edge.
+        return math.floor(lat / self._cell), math.floor(lng / self._cell) % self._lng_cells
+
+    def _ring(self, centre: tuple[int, int], radius: int) -> Iterator[tuple[int, int]]:
+        """Cells at exactly `radius` steps (Chebyshev distance) from `centre`."""
+        row, col = centre
+        if radius == 0:
+            yield centre
+            return
+        for d_col in range(-radius, radius + 1):
+            yield row - radius, (col + d_col) % self._lng_cells
+            yield row + radius, (col + d_col) % self._lng_cells
+        for d_row in range(-radius + 1, radius):
+            yield row + d_row, (col - radius) % self._lng_cells
+            yield row + d_row, (col + radius) % self._lng_cells
+
+    def _unvisited_bound_km(self, lat: float, radius: int) -> float:
+        """Lower bound on the distance to any cell outside rings `0..radius`."""
+        far_lat = min(89.9, abs(lat) + (radius + 1) * self._cell)
+        return radius * self._cell * KM_PER_DEGREE * math.cos(math.radians(far_lat))
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        limit: int,
+        offset: int = 0,
+        max_distance_km: float | None = None,
+    ) -> list[tuple[SessionPublic, float]]:
+        """Return `(session, distance_km)` pairs, nearest first, for one page of results."""
+        wanted = offset + limit
+        found: list[tuple[float, str, SessionPublic]] = []
+        centre = self._key(lat, lng)
+        visited = 0
+        radius = 0
+
+        while visited < self._size:
+            # Once a ring has more cells than are occupied, a full scan is cheaper.
+            if 8 * radius > len(self._cells):
+                found = [
+                    (haversine_km(lat, lng, e_lat, e_lng), session.name, session)
+                    for entries in self._cells.values()
+                    for e_lat, e_lng, session in entries
+                ]
+                break
+
+            for key in self._ring(centre, radius):
+                for e_lat, e_lng, session in self._cells.get(key, ()):
+                    found.append((haversine_km(lat, lng, e_lat, e_lng), session.name, session))
+                    visited += 1
+
+            bound = self._unvisited_bound_km(lat, radius)
+            if max_distance_km is not None and bound > max_distance_km:
+                break
+            if len(found) >= wanted:
+                found.sort(key=lambda item: (item[0], item[1]))
+                if found[wanted - 1][0] <= bound:
+                    break
+            radius += 1
+
+        found.sort(key=lambda item: (item[0], item[1]))
+        if max_distance_km is not None:
+            found = [item for item in found if item[0] <= max_distance_km]
+        return [(session, distance) for distance, _name, session in found[offset:wanted]]
@@ -0,0 +1,72 @@
+"""Shared outbound HTTP client (Mailgun, newsletter webhook).
+
+One pooled `httpx.AsyncClient` per process keeps connections (and their TLS
+sessions) alive between calls instead of handshaking for every email. The web app
+opens and closes it in its lifespan (`lifespan_http`), the SAQ worker in its
+startup/shutdown hooks. HTTP/2 is negotiated when the optional `h2` package is
+installed (`httpx[http2]`); otherwise HTTP/1.1 keep-alive is used.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+import httpx
+
+from app.config import settings
+
+
+class SharedHTTPClient:
+    """Holds the process's pooled client, (re)creating it on first use after a close."""
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+
+    def get(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build()
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _build() -> httpx.AsyncClient:
+        http2 = importlib.util.find_spec("h2") is not None
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(
+                settings.http_client_timeout_seconds, connect=settings.http_client_connect_timeout_seconds
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.http_client_max_connections,
+                max_keepalive_connections=settings.http_client_max_connections,
+                keepalive_expiry=settings.http_client_keepalive_seconds,
+            ),
+        )
+
+
+shared_http_client = SharedHTTPClient()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use (e.g. in scripts without a lifespan)."""
+    return shared_http_client.get()
+
+
+async def close_http_client() -> None:
+    await shared_http_client.close()
+
+
+@asynccontextmanager
+async def lifespan_http() -> AsyncGenerator[None, None]:
+    """Open the shared client for the app's lifetime and close its connections on shutdown."""
+    get_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
@@ -9,9 +9,8 @@ from __future__ import annotations
 
 import logging
 
-import httpx
-
 from app.config import settings
+from app.services.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +46,6 @@ async def notify_newsletter_subscription(*, email: str, name: str | None = None)
         logger.info("DRY RUN - Would POST newsletter opt-in to %s: %s", url, payload)
         return
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        path = f"{url}/ghost/api/admin/members/"
-        resp = await client.post(path, json=payload, headers=headers)
-        resp.raise_for_status()
+    path = f"{url}/ghost/api/admin/members/"
+    resp = await get_http_client().post(path, json=payload, headers=headers)
+    resp.raise_for_status()
@@ -0,0 +1,215 @@
+"""The signed-in caregiver principal and its cache, keyed by session token hash.
+
+`CaregiverPrincipal` is the few caregiver fields request handlers need, resolved
+from the session cookie by `app.auth.get_current_caregiver` with one joined
+projection (no ORM instance, no relationships). Without the cache that query runs
+on every authenticated request. Entries are kept in an in-process LRU for
+`caregiver_principal_cache_ttl_seconds` and, with `caregiver_principal_cache_redis`,
+in Redis for `caregiver_principal_cache_redis_ttl_seconds` so other API workers can
+skip the database too. No entry outlives its session's `expires_at`.
+
+Logout and profile changes call `principal_cache.invalidate`. It drops the entries
+in this process and in Redis straight away, and again once the transaction
+commits, and publishes a cache event each time so every other API worker drops its
+in-process copies too. While a worker's cache event subscription is down it does
+not serve in-process copies at all, and it empties them when it resubscribes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import on_commit
+from app.models.caregiver_auth import CaregiverSession
+from app.services.cache_events import CacheEvents, cache_events
+from app.services.redis import get_redis
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CAREGIVER_SESSIONS_INVALIDATED_EVENT = "caregiver-sessions-invalidated"
+
+
+@dataclass(frozen=True)
+class CaregiverPrincipal:
+    """The signed-in caregiver. Load `Caregiver` explicitly to change the account."""
+
+    id: uuid.UUID
+    email: str
+    name: str | None
+    phone: str | None
+    email_verified: bool
+
+    @property
+    def profile_complete(self) -> bool:
+        return bool(self.name and self.phone)
+
+    def to_json(self) -> dict[str, Any]:
+        return {**asdict(self), "id": str(self.id)}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> CaregiverPrincipal:
+        """Rebuild a principal from `to_json` output; raises TypeError if a field is missing or mistyped."""
+        caregiver_id, email, name, phone, email_verified = (
+            data.get(key) for key in ("id", "email", "name", "phone", "email_verified")
+        )
+        if (
+            not isinstance(caregiver_id, str)
+            or not isinstance(email, str)
+            or not isinstance(name, str | None)
+            or not isinstance(phone, str | None)
+            or not isinstance(email_verified, bool)
+        ):
+            msg = "Malformed caregiver principal"
+            raise TypeError(msg)
+        return cls(id=uuid.UUID(caregiver_id), email=email, name=name, phone=phone, email_verified=email_verified)
+
+
+class PrincipalCache:
+    """Principals by session token hash: in-process LRU, optionally backed by Redis.
+
+    Invalidations reach the other processes' LRUs through `events`.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        ttl_seconds: float,
+        redis_ttl_seconds: float,
+        use_redis: bool,
+        client: Callable[[], Redis] = get_redis,
+        events: CacheEvents = cache_events,
+        prefix: str = "principal",
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.use_redis = use_redis
+        self.client = client
+        self.events = events
+        self.prefix = prefix
+        self._local: TTLCache[str, CaregiverPrincipal] = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._pending: set[asyncio.Task] = set()
+        # Invalidations missed while unsubscribed may cover any entry, so start afresh
+        events.subscribe(CAREGIVER_SESSIONS_INVALIDATED_EVENT, self._on_invalidated, on_connect=self._local.clear)
+
+    def _key(self, token_hash: str) -> str:
+        return f"{self.prefix}:{token_hash}"
+
+    async def get(self, token_hash: str) -> CaregiverPrincipal | None:
+        """The principal of a live session, or None if not cached."""
+        if self._local_is_current():
+            principal = self._local.get(token_hash)
+            if principal is not None:
+                return principal
+        if not self.use_redis:
+            return None
+
+        try:
+            raw = await self.client().get(self._key(token_hash))
+        except RedisError as e:
+            logger.warning(f"Principal cache unavailable: {e}")
+            return None
+        if raw is None:
+            return None
+
+        try:
+            payload = json.loads(raw)
+            principal = CaregiverPrincipal.from_json(payload["caregiver"])
+            expires_at = float(payload["expiresAt"])
+        except (KeyError, TypeError, ValueError) as e:
+            # Written by another version, or not by us: treat as a miss and reload from the database
+            logger.warning(f"Ignoring malformed principal cache entry: {e!r}")
+            return None
+        self._set_local(token_hash, principal, expires_at)
+        return principal
+
+    async def set(self, token_hash: str, principal: CaregiverPrincipal, session_expires_at: datetime) -> None:
+        if session_expires_at.tzinfo is None:
+            session_expires_at = session_expires_at.replace(tzinfo=UTC)
+        expires_at = session_expires_at.timestamp()
+        self._set_local(token_hash, principal, expires_at)
+        if not self.use_redis:
+            return
+
+        ttl = min(self.redis_ttl_seconds, expires_at - time.time())
+        if ttl < 1:
+            return
+        payload = {"caregiver": principal.to_json(), "expiresAt": expires_at}
+        try:
+            await self.client().set(self._key(token_hash), json.dumps(payload), ex=int(ttl))
+        except RedisError as e:
+            logger.warning(f"Principal cache unavailable: {e}")
+
+    def _local_is_current(self) -> bool:
+        """Whether other processes' invalidations are reaching the in-process entries."""
+        return not self.events.use_redis or self.events.connected
+
+    def _set_local(self, token_hash: str, principal: CaregiverPrincipal, expires_at: float) -> None:
+        ttl = min(self.ttl_seconds, expires_at - time.time())
+        if ttl > 0:
+            self._local.set(token_hash, principal, ttl_seconds=ttl)
+
+    def _drop_local(self, token_hashes: tuple[str, ...]) -> None:
+        for token_hash in token_hashes:
+            self._local.pop(token_hash)
+
+    def _on_invalidated(self, event: dict[str, Any]) -> None:
+        self._drop_local(tuple(event["token_hashes"]))
+
+    async def _drop(self, token_hashes: tuple[str, ...]) -> None:
+        self._drop_local(token_hashes)
+        if not token_hashes:
+            return
+        if self.use_redis:
+            try:
+                await self.client().delete(*(self._key(h) for h in token_hashes))
+            except RedisError as e:
+                logger.warning(f"Principal cache unavailable: {e}")
+        await self.events.publish(CAREGIVER_SESSIONS_INVALIDATED_EVENT, token_hashes=list(token_hashes))
+
+    def _drop_after_commit(self, token_hashes: tuple[str, ...]) -> None:
+        # on_commit callbacks are synchronous; the Redis delete and event run in the background
+        self._drop_local(token_hashes)
+        if (self.use_redis or self.events.use_redis) and token_hashes:
+            task = asyncio.get_running_loop().create_task(self._drop(token_hashes))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def invalidate(self, db: AsyncSession, *token_hashes: str) -> None:
+        """Drop these sessions' entries now and again when `db` commits."""
+        await self._drop(token_hashes)
+        on_commit(db, partial(self._drop_after_commit, token_hashes))
+
+    async def invalidate_caregiver(self, db: AsyncSession, caregiver_id: uuid.UUID) -> None:
+        """Drop the entries of every live session of a caregiver (e.g. after a profile change)."""
+        result = await db.execute(
+            select(CaregiverSession.token_hash).where(
+                CaregiverSession.caregiver_id == caregiver_id,
+                CaregiverSession.revoked_at.is_(None),
+            )
+        )
+        await self.invalidate(db, *result.scalars().all())
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.caregiver_principal_cache_size,
+    ttl_seconds=settings.caregiver_principal_cache_ttl_seconds,
+    redis_ttl_seconds=settings.caregiver_principal_cache_redis_ttl_seconds,
+    use_redis=settings.caregiver_principal_cache_redis,
+)
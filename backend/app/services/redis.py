@@ -0,0 +1,52 @@
+"""Shared Redis client for the web app (rate limits, auth caches, cache events).
+
+One pooled `redis.asyncio.Redis` per process, created on first use and closed in
+the app lifespan (`lifespan_redis`). The SAQ queue keeps its own connection.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+from redis.asyncio import Redis
+
+from app.config import settings
+
+
+class SharedRedisClient:
+    """Holds the process's Redis client, (re)creating it on first use after a close."""
+
+    def __init__(self) -> None:
+        self._client: Redis | None = None
+
+    def get(self) -> Redis:
+        if self._client is None:
+            self._client = Redis.from_url(settings.redis_url)
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+shared_redis_client = SharedRedisClient()
+
+
+def get_redis() -> Redis:
+    """Return the shared client; connections are opened lazily on the first command."""
+    return shared_redis_client.get()
+
+
+async def close_redis() -> None:
+    await shared_redis_client.close()
+
+
+@asynccontextmanager
+async def lifespan_redis() -> AsyncGenerator[None, None]:
+    """Close the shared client's connections on shutdown."""
+    try:
+        yield
+    finally:
+        await close_redis()
@@ -0,0 +1,289 @@
+"""Materialise term session schedules into `SessionOccurrence` rows.
+
+Candidate occurrences are computed by `app.services.schedule_expander` from the
+session's weekly slot, its linked blocks and the exclusion dates, then written
+with one bulk `INSERT ... ON CONFLICT (session_id, starts_at) DO NOTHING`. On PostgreSQL a
+transaction-scoped advisory lock per session serialises concurrent runs.
+
+`materialise_term_occurrences` does the same for every term session of a year or
+block in one pass (run by the `materialise_occurrences_task` worker job).
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time
+from typing import Any
+
+from sqlalchemy import BigInteger, bindparam, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.exclusion_date import ExclusionDate
+from app.models.session import Session
+from app.models.session_block import SessionBlock
+from app.models.session_block_link import SessionBlockLink
+from app.models.session_occurrence import SessionOccurrence
+from app.services.schedule_expander import (
+    BlockRange,
+    ExpandedOccurrence,
+    SlotOccurrences,
+    WeeklySlot,
+    expand_weekly_slots,
+    iter_occurrences,
+)
+
+# Rows per INSERT statement (well under SQLite's bound-parameter limit).
+INSERT_BATCH_SIZE = 500
+
+
+class ScheduleError(ValueError):
+    """The session cannot be materialised (wrong type, incomplete or invalid schedule, no blocks)."""
+
+
+@dataclass(frozen=True)
+class MaterialiseResult:
+    created: int
+    skipped_existing: int
+    deleted: int = 0
+
+
+@dataclass(frozen=True)
+class BatchMaterialiseResult:
+    sessions: int
+    created: int
+    skipped_existing: int
+    skipped_sessions: int  # Linked term sessions with an incomplete or invalid weekly slot
+
+
+# Called with (sessions processed, sessions total) after each chunk.
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+def _advisory_lock_key(session_id: uuid.UUID) -> int:
+    # pg_advisory_xact_lock takes a signed bigint.
+    return int.from_bytes(session_id.bytes[:8], "big", signed=True)
+
+
+async def _lock_session_schedule(db: AsyncSession, session_id: uuid.UUID) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(select(func.pg_advisory_xact_lock(_advisory_lock_key(session_id))))
+
+
+async def _lock_session_schedules(db: AsyncSession, session_ids: list[uuid.UUID]) -> None:
+    """Take the per-session advisory locks for many sessions in one round trip, in key order."""
+    if db.get_bind().dialect.name != "postgresql" or not session_ids:
+        return
+    keys = sorted({_advisory_lock_key(session_id) for session_id in session_ids})
+    lock_keys = func.unnest(bindparam("keys", keys, type_=postgresql.ARRAY(BigInteger))).table_valued("key")
+    await db.execute(select(func.pg_advisory_xact_lock(lock_keys.c.key)).select_from(lock_keys))
+
+
+async def _load_exclusions(db: AsyncSession, years: set[int]) -> dict[int, set[date]]:
+    ex_res = await db.execute(
+        select(ExclusionDate.year, ExclusionDate.exclusion_date).where(ExclusionDate.year.in_(years))
+    )
+    excluded_by_year: dict[int, set[date]] = {}
+    for year, excluded_date in ex_res.all():
+        excluded_by_year.setdefault(year, set()).add(excluded_date)
+    return excluded_by_year
+
+
+def _occurrence_rows(expanded: list[SlotOccurrences]) -> list[dict[str, Any]]:
+    # Written in UTC: SQLite keeps the wall time of whatever offset it is given
+    return [
+        {
+            "id": uuid.uuid4(),
+            "session_id": session_id,
+            "block_id": block_id,
+            "starts_at": starts_at.astimezone(UTC),
+            "ends_at": ends_at.astimezone(UTC),
+            "cancelled": False,
+            "auto_generated": True,
+        }
+        for session_id, block_id, spans in expanded
+        for starts_at, ends_at in spans
+    ]
+
+
+async def _insert_ignoring_existing(db: AsyncSession, rows: list[dict[str, Any]]) -> int:
+    """Bulk insert rows, skipping any whose (session_id, starts_at) already exists; return rows inserted."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:  # pragma: no cover - only PostgreSQL (prod) and SQLite (dev/tests) are supported
+        msg = f"Unsupported dialect for occurrence upsert: {dialect}"
+        raise RuntimeError(msg)
+
+    inserted = 0
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        stmt = (
+            insert(SessionOccurrence)
+            .values(rows[start : start + INSERT_BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=["session_id", "starts_at"])
+            .returning(SessionOccurrence.id)
+        )
+        result = await db.execute(stmt)
+        inserted += len(result.all())
+    return inserted
+
+
+def _is_valid_slot(start_time: time | None, end_time: time | None) -> bool:
+    # Occurrences start and end on the same day
+    return start_time is not None and end_time is not None and end_time > start_time
+
+
+def _weekly_slot(session: Session) -> WeeklySlot:
+    if session.session_type != "term":
+        msg = "Occurrence generation is for term sessions"
+        raise ScheduleError(msg)
+    if session.day_of_week is None or session.start_time is None or session.end_time is None:
+        msg = "Session schedule is incomplete"
+        raise ScheduleError(msg)
+    if not _is_valid_slot(session.start_time, session.end_time):
+        msg = "Session end time must be after its start time"
+        raise ScheduleError(msg)
+    return WeeklySlot(session.id, int(session.day_of_week), session.start_time, session.end_time)
+
+
+async def _expand_session_slots(db: AsyncSession, session: Session) -> list[SlotOccurrences]:
+    slot = _weekly_slot(session)
+    blocks_res = await db.execute(
+        select(SessionBlock.id, SessionBlock.year, SessionBlock.start_date, SessionBlock.end_date)
+        .join(SessionBlockLink, SessionBlockLink.block_id == SessionBlock.id)
+        .where(SessionBlockLink.session_id == session.id)
+        .order_by(SessionBlock.start_date)
+    )
+    blocks = [BlockRange(*row) for row in blocks_res.all()]
+    if not blocks:
+        msg = "No blocks selected for this session. Please add blocks first."
+        raise ScheduleError(msg)
+
+    excluded_by_year = await _load_exclusions(db, {b.year for b in blocks})
+    return expand_weekly_slots([slot], {session.id: blocks}, excluded_by_year)
+
+
+async def expand_session_schedule(db: AsyncSession, session: Session) -> list[ExpandedOccurrence]:
+    """Occurrences a term session's weekly slot, linked blocks and exclusions imply. Writes nothing."""
+    return list(iter_occurrences(await _expand_session_slots(db, session)))
+
+
+async def existing_occurrence_starts(db: AsyncSession, session_id: uuid.UUID) -> set[datetime]:
+    """Start times of the session's occurrences, in UTC.
+
+    SQLite returns stored values naive; generated occurrences are written in UTC,
+    so naive values are read as UTC.
+    """
+    res = await db.execute(select(SessionOccurrence.starts_at).where(SessionOccurrence.session_id == session_id))
+    return {(dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)).astimezone(UTC) for dt in res.scalars()}
+
+
+async def materialise_session_occurrences(
+    db: AsyncSession,
+    session: Session,
+    *,
+    replace_auto_generated: bool = False,
+) -> MaterialiseResult:
+    """Create the missing occurrences of a term session from its linked blocks and exclusions.
+
+    Idempotent: occurrences that already exist (by start time) are left untouched.
+    With `replace_auto_generated`, previously auto-generated occurrences are deleted
+    first; manual occurrences are never deleted.
+    """
+    expanded = await _expand_session_slots(db, session)
+
+    await _lock_session_schedule(db, session.id)
+
+    deleted = 0
+    if replace_auto_generated:
+        result = await db.execute(
+            delete(SessionOccurrence).where(
+                SessionOccurrence.session_id == session.id,
+                SessionOccurrence.auto_generated.is_(True),
+            )
+        )
+        deleted = getattr(result, "rowcount", 0) or 0
+        if deleted:
+            # Deleted rows leave no updated_at behind; mark the session changed so feeds' Last-Modified moves
+            await db.execute(update(Session).where(Session.id == session.id).values(updated_at=func.now()))
+
+    rows = _occurrence_rows(expanded)
+    created = await _insert_ignoring_existing(db, rows) if rows else 0
+    return MaterialiseResult(created=created, skipped_existing=len(rows) - created, deleted=deleted)
+
+
+async def materialise_term_occurrences(
+    db: AsyncSession,
+    *,
+    year: int | None = None,
+    block_id: uuid.UUID | None = None,
+    progress: ProgressCallback | None = None,
+    chunk_size: int = 50,
+) -> BatchMaterialiseResult:
+    """Create the missing occurrences of every non-archived term session in a year or block.
+
+    Blocks, block links and exclusion dates are each loaded once; candidates are
+    inserted `chunk_size` sessions at a time with the same conflict-ignoring insert
+    as `materialise_session_occurrences`, so re-running is safe. Only blocks in the
+    requested year (or the single requested block) are expanded. The caller commits.
+    """
+    if (year is None) == (block_id is None):
+        msg = "Specify exactly one of year or block"
+        raise ScheduleError(msg)
+
+    block_stmt = select(SessionBlock.id, SessionBlock.year, SessionBlock.start_date, SessionBlock.end_date)
+    if block_id is not None:
+        block_stmt = block_stmt.where(SessionBlock.id == block_id)
+    else:
+        block_stmt = block_stmt.where(SessionBlock.year == year)
+    blocks_by_id = {row.id: BlockRange(*row) for row in (await db.execute(block_stmt)).all()}
+    if not blocks_by_id:
+        msg = "No blocks found"
+        raise ScheduleError(msg)
+
+    excluded_by_year = await _load_exclusions(db, {b.year for b in blocks_by_id.values()})
+
+    links_res = await db.execute(
+        select(Session.id, Session.day_of_week, Session.start_time, Session.end_time, SessionBlockLink.block_id)
+        .join(SessionBlockLink, SessionBlockLink.session_id == Session.id)
+        .where(
+            Session.session_type == "term",
+            ~Session.archived,
+            SessionBlockLink.block_id.in_(blocks_by_id),
+        )
+        .order_by(Session.id)
+    )
+    slots: dict[uuid.UUID, WeeklySlot | None] = {}
+    blocks_by_session: dict[uuid.UUID, list[BlockRange]] = {}
+    for session_id, day_of_week, start_time, end_time, linked_block_id in links_res.all():
+        valid = day_of_week is not None and _is_valid_slot(start_time, end_time)
+        slots[session_id] = WeeklySlot(session_id, int(day_of_week), start_time, end_time) if valid else None
+        blocks_by_session.setdefault(session_id, []).append(blocks_by_id[linked_block_id])
+    for blocks in blocks_by_session.values():
+        blocks.sort(key=lambda b: b.start_date)
+
+    session_ids = list(slots)
+    total = len(session_ids)
+    created = candidates = skipped_sessions = 0
+    for start in range(0, total, chunk_size):
+        chunk = [slot for session_id in session_ids[start : start + chunk_size] if (slot := slots[session_id])]
+        skipped_sessions += min(chunk_size, total - start) - len(chunk)
+        await _lock_session_schedules(db, [slot.session_id for slot in chunk])
+
+        rows = _occurrence_rows(expand_weekly_slots(chunk, blocks_by_session, excluded_by_year))
+        if rows:
+            created += await _insert_ignoring_existing(db, rows)
+            candidates += len(rows)
+        if progress is not None:
+            await progress(min(start + chunk_size, total), total)
+
+    return BatchMaterialiseResult(
+        sessions=total - skipped_sessions,
+        created=created,
+        skipped_existing=candidates - created,
+        skipped_sessions=skipped_sessions,
+    )
@@ -0,0 +1,127 @@
+"""Pure expansion of weekly session slots into dated occurrences.
+
+No I/O and no ORM objects: callers pass in the weekly slots, block date ranges and
+exclusion dates, and get back the occurrences those imply. Dates are produced with
+ordinal arithmetic (`range(first, last + 1, 7)`) rather than a day-by-day loop.
+Sessions sharing a block, weekday and start/end time share one tuple of local
+start/end pairs, computed once, and expansion returns one `SlotOccurrences` per
+session and block rather than an object per occurrence, so expanding thousands of
+sessions over a year takes milliseconds. Callers flatten a chunk at a time.
+
+Local times are resolved in `Pacific/Auckland`, including across DST changes: a
+wall time that does not exist (inside the spring-forward gap) moves forward by the
+gap, and an ambiguous one (repeated at fall-back) resolves to its first, daylight
+time instance. A slot starts and ends on the same day; callers reject slots whose
+end is not after their start.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from collections.abc import Set as AbstractSet
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+TZ = ZoneInfo("Pacific/Auckland")
+
+
+@dataclass(frozen=True)
+class WeeklySlot:
+    session_id: uuid.UUID
+    day_of_week: int  # Monday=0
+    start_time: time
+    end_time: time
+
+
+@dataclass(frozen=True)
+class BlockRange:
+    id: uuid.UUID
+    year: int
+    start_date: date
+    end_date: date
+
+
+class ExpandedOccurrence(NamedTuple):
+    session_id: uuid.UUID
+    block_id: uuid.UUID
+    starts_at: datetime
+    ends_at: datetime
+
+
+class SlotOccurrences(NamedTuple):
+    """A slot's occurrences in one block, as (starts_at, ends_at) pairs in date order."""
+
+    session_id: uuid.UUID
+    block_id: uuid.UUID
+    spans: tuple[tuple[datetime, datetime], ...]
+
+
+def weekly_dates(start: date, end: date, weekday: int) -> list[date]:
+    """Every date on `weekday` (Monday=0) from `start` to `end` inclusive."""
+    first = start.toordinal() + (weekday - start.weekday()) % 7
+    return [date.fromordinal(ordinal) for ordinal in range(first, end.toordinal() + 1, 7)]
+
+
+def local_datetime(day: date, at: time, tz: ZoneInfo = TZ) -> datetime:
+    """Wall-clock `day` + `at` in `tz`, normalised across DST transitions.
+
+    The UTC round trip moves a non-existent time past the gap (02:30 on the
+    spring-forward date becomes 03:30); fold=0 keeps ambiguous times on their
+    first instance.
+    """
+    return datetime.combine(day, at, tzinfo=tz).astimezone(UTC).astimezone(tz)
+
+
+def local_span(day: date, start_time: time, end_time: time, tz: ZoneInfo = TZ) -> tuple[datetime, datetime]:
+    """Start and end of a slot on `day`, both on that day."""
+    return local_datetime(day, start_time, tz), local_datetime(day, end_time, tz)
+
+
+def expand_weekly_slots(
+    slots: Iterable[WeeklySlot],
+    blocks_by_session: Mapping[uuid.UUID, Sequence[BlockRange]],
+    excluded_by_year: Mapping[int, AbstractSet[date]],
+    tz: ZoneInfo = TZ,
+) -> list[SlotOccurrences]:
+    """Expand each slot over its session's blocks, skipping exclusion dates of the block's year.
+
+    Output is grouped by slot, then block (in the order given). Slots with the same
+    block, weekday and times share one `spans` tuple.
+    """
+    dates_by_block_weekday: dict[tuple[uuid.UUID, int], list[date]] = {}
+    spans_by_day: dict[tuple[date, time, time], tuple[datetime, datetime]] = {}
+    spans_by_block_slot: dict[tuple[uuid.UUID, int, time, time], tuple[tuple[datetime, datetime], ...]] = {}
+    out: list[SlotOccurrences] = []
+
+    for slot in slots:
+        for block in blocks_by_session.get(slot.session_id, ()):
+            slot_key = (block.id, slot.day_of_week, slot.start_time, slot.end_time)
+            spans = spans_by_block_slot.get(slot_key)
+            if spans is None:
+                days_key = (block.id, slot.day_of_week)
+                days = dates_by_block_weekday.get(days_key)
+                if days is None:
+                    excluded = excluded_by_year.get(block.year, frozenset())
+                    weekly = weekly_dates(block.start_date, block.end_date, slot.day_of_week)
+                    days = dates_by_block_weekday[days_key] = [d for d in weekly if d not in excluded]
+                day_spans = []
+                for day in days:
+                    # Blocks can overlap, so a day's span may already exist under another block
+                    span_key = (day, slot.start_time, slot.end_time)
+                    span = spans_by_day.get(span_key)
+                    if span is None:
+                        span = spans_by_day[span_key] = local_span(day, slot.start_time, slot.end_time, tz)
+                    day_spans.append(span)
+                spans = spans_by_block_slot[slot_key] = tuple(day_spans)
+            out.append(SlotOccurrences(slot.session_id, block.id, spans))
+    return out
+
+
+def iter_occurrences(expanded: Iterable[SlotOccurrences]) -> Iterator[ExpandedOccurrence]:
+    """The individual occurrences of `expand_weekly_slots` output, in the same order."""
+    for session_id, block_id, spans in expanded:
+        for starts_at, ends_at in spans:
+            yield ExpandedOccurrence(session_id, block_id, starts_at, ends_at)
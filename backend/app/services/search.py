@@ -0,0 +1,168 @@
+"""Ranked free-text search over the public session catalogue.
+
+Matches the query against session name, location name, region and address.
+
+- PostgreSQL: `pg_trgm` word similarity plus substring matching, served by the GIN
+  trigram indexes from migration 0004. Only `(id, rank)` is read from the database.
+- Other dialects (SQLite in dev/tests): an in-process trigram index built once per
+  catalogue snapshot.
+
+Either way the matched sessions are materialised from the catalogue snapshot, so a
+typeahead keystroke costs at most one small query.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+
+from sqlalchemy import ColumnElement, func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.session import Session
+from app.models.session_location import SessionLocation
+from app.schemas.session import SessionPublic, SessionRegionGroup
+from app.services.catalogue import CatalogueSnapshot, catalogue_cache
+
+# Relative weight of each searchable field; a name hit outranks an address hit.
+FIELD_WEIGHTS: dict[str, float] = {
+    "name": 1.0,
+    "location_name": 0.8,
+    "region": 0.7,
+    "address": 0.6,
+}
+
+# Minimum (weighted) score for an in-process fuzzy match to be returned.
+MIN_SCORE = 0.35
+
+MAX_RESULTS = 50
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _trigrams(text: str) -> set[str]:
+    """Split text into pg_trgm-style trigrams (lowercased words padded with spaces)."""
+    grams: set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _searchable_fields(session: SessionPublic) -> dict[str, str]:
+    loc = session.location_details
+    return {
+        "name": session.name,
+        "location_name": loc.name if loc else "",
+        "region": loc.region if loc else "",
+        "address": loc.address if loc else "",
+    }
+
+
+@dataclass(frozen=True)
+class _Posting:
+    session_index: int
+    field: str
+
+
+class SessionSearchIndex:
+    """Inverted trigram index over a catalogue snapshot's sessions."""
+
+    def __init__(self, sessions: list[SessionPublic]) -> None:
+        self._sessions = sessions
+        self._texts: list[dict[str, str]] = []
+        self._postings: dict[str, list[_Posting]] = defaultdict(list)
+
+        for idx, session in enumerate(sessions):
+            fields = _searchable_fields(session)
+            self._texts.append({name: value.lower() for name, value in fields.items()})
+            for field_name, value in fields.items():
+                for gram in _trigrams(value):
+                    self._postings[gram].append(_Posting(idx, field_name))
+
+    def search(self, q: str, limit: int = MAX_RESULTS) -> list[tuple[SessionPublic, float]]:
+        """Return `(session, score)` pairs ranked best-first."""
+        needle = q.strip().lower()
+        query_grams = _trigrams(needle)
+        if not needle or not query_grams:
+            return []
+
+        # Count shared trigrams per (session, field): word similarity ~= shared / |query trigrams|.
+        hits: dict[tuple[int, str], int] = defaultdict(int)
+        for gram in query_grams:
+            for posting in self._postings.get(gram, ()):
+                hits[(posting.session_index, posting.field)] += 1
+
+        scores: dict[int, float] = {}
+        for (idx, field_name), shared in hits.items():
+            similarity = shared / len(query_grams)
+            if needle in self._texts[idx][field_name]:
+                similarity = 1.0
+            score = similarity * FIELD_WEIGHTS[field_name]
+            if score > scores.get(idx, 0.0):
+                scores[idx] = score
+
+        ranked = sorted(
+            ((idx, score) for idx, score in scores.items() if score >= MIN_SCORE),
+            key=lambda item: (-item[1], self._sessions[item[0]].name),
+        )
+        return [(self._sessions[idx], score) for idx, score in ranked[:limit]]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def _rank_in_postgres(db: AsyncSession, q: str, limit: int) -> list[tuple[str, float]]:
+    pattern = f"%{_escape_like(q)}%"
+    columns = {
+        "name": Session.name,
+        "location_name": SessionLocation.name,
+        "region": SessionLocation.region,
+        "address": SessionLocation.address,
+    }
+
+    matches: list[ColumnElement[bool]] = []
+    ranks: list[ColumnElement[float]] = []
+    for field_name, column in columns.items():
+        # Both `ILIKE` and `%>` (word similarity above pg_trgm's threshold) use the GIN trigram index.
+        matches.append(column.ilike(pattern, escape="\\"))
+        matches.append(column.op("%>")(q))
+        ranks.append(func.word_similarity(literal(q), column) * FIELD_WEIGHTS[field_name])
+
+    rank = func.greatest(*ranks).label("rank")
+    stmt = (
+        select(Session.id, rank)
+        .join(SessionLocation, SessionLocation.id == Session.session_location_id)
+        .where(~Session.archived, or_(*matches))
+        .order_by(rank.desc(), Session.name.asc())
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return [(str(session_id), float(score or 0.0)) for session_id, score in result.all()]
+
+
+def _group_ranked(ranked: list[tuple[SessionPublic, float]]) -> list[SessionRegionGroup]:
+    """Group ranked sessions by region, ordering regions by their best match."""
+    grouped: dict[str, list[SessionPublic]] = defaultdict(list)
+    for session, _score in ranked:
+        region = session.location_details.region if session.location_details else "Unknown"
+        grouped[region].append(session)
+    return [SessionRegionGroup(name=region, sessions=sessions) for region, sessions in grouped.items()]
+
+
+async def search_sessions(db: AsyncSession, q: str, limit: int = MAX_RESULTS) -> list[SessionRegionGroup]:
+    """Search active public sessions, returning region groups ranked by relevance."""
+    snapshot: CatalogueSnapshot = await catalogue_cache.get(db)
+    q = q.strip()
+    if not q:
+        return []
+
+    if db.get_bind().dialect.name == "postgresql":
+        by_id = snapshot.sessions_by_id
+        ranked = [(by_id[sid], score) for sid, score in await _rank_in_postgres(db, q, limit) if sid in by_id]
+    else:
+        ranked = snapshot.search_index.search(q, limit)
+
+    return _group_ranked(ranked)
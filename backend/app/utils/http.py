@@ -0,0 +1,84 @@
+"""Helpers for HTTP conditional requests and content negotiation."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+
+def strong_etag(*parts: bytes) -> str:
+    """Build a quoted strong ETag from the given body bytes."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part)
+    return f'"{h.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etags: Iterable[str]) -> bool:
+    """Return True if an `If-None-Match` header matches any of `etags`.
+
+    Uses weak comparison (RFC 9110 13.1.2), which is what caches use for GET revalidation.
+    """
+    if not if_none_match:
+        return False
+
+    candidates = {tag.strip() for tag in if_none_match.split(",") if tag.strip()}
+    if "*" in candidates:
+        return True
+
+    normalized = {tag.removeprefix("W/") for tag in candidates}
+    return any(etag.removeprefix("W/") in normalized for etag in etags)
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an IMF-fixdate (`Last-Modified` / `Expires`)."""
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def not_modified(
+    if_none_match: str | None,
+    if_modified_since: str | None,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> bool:
+    """Evaluate GET preconditions; True means the client's copy is current (send 304).
+
+    `If-None-Match` takes precedence; `If-Modified-Since` is only consulted without it.
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, [etag])
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """Parse `Accept-Encoding` into the set of codings the client accepts (q > 0)."""
+    if not accept_encoding:
+        return set()
+
+    accepted: set[str] = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(coding)
+    return accepted
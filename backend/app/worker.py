@@ -1,27 +1,72 @@
 """SAQ worker for background task processing."""
 
 import asyncio
+import functools
 import logging
+import random
+import uuid
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any
 
 from saq import CronJob, Queue
 from saq.types import Context
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from app.config import settings
 from app.services.email import email_service
+from app.services.email_governor import EmailDeferredError, deferring_transient_errors
+from app.services.http import close_http_client, get_http_client
 from app.services.newsletter import notify_newsletter_subscription
+from app.services.redis import close_redis
 
 logger = logging.getLogger(__name__)
 
 
-def _build_bcc(to_email: str, contact_email: str | None = None, bcc_emails: list[str] | None = None) -> list[str]:
-    # Keep recipients private; de-dupe while preserving order.
-    return list(dict.fromkeys([to_email] + ([contact_email] if contact_email else []) + (bcc_emails or [])))
+class WorkerContext(Context, total=False):
+    """SAQ task context plus what `startup` adds."""
 
+    db_engine: AsyncEngine
+    db_sessionmaker: async_sessionmaker[AsyncSession]
 
+
+Task = Callable[..., Awaitable[dict[str, Any]]]
+
+
+def retry_when_throttled(func: Task) -> Task:
+    """Retry an email task later, via SAQ, when Mailgun throttles or fails transiently.
+
+    The job is handed back to the queue with a delay (the provider's `Retry-After`
+    or an exponential backoff, plus jitter) instead of sleeping in a worker slot.
+    After `email_retry_max_attempts` attempts the job fails.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(ctx: WorkerContext, **kwargs: Any) -> dict[str, Any]:
+        try:
+            with deferring_transient_errors():
+                return await func(ctx, **kwargs)
+        except EmailDeferredError as e:
+            job = ctx.get("job")
+            if job is not None and job.attempts < settings.email_retry_max_attempts:
+                backoff = settings.email_retry_base_delay_seconds * 2 ** max(0, job.attempts - 1)
+                job.retries = max(job.retries, job.attempts + 1)
+                job.retry_delay = max(e.retry_after or 0.0, backoff) + random.uniform(0, backoff)  # noqa: S311
+                job.retry_backoff = False
+                logger.warning(f"Deferring {job.function} for {job.retry_delay:.0f}s: {e}")
+            raise
+
+    return wrapper
+
+
+def _join_names(names: list[str]) -> str:
+    names = list(dict.fromkeys(names))
+    return names[0] if len(names) == 1 else f"{', '.join(names[:-1])} and {names[-1]}"
+
+
+@retry_when_throttled
 async def send_signup_confirmation_task(
-    ctx: Context,
+    ctx: WorkerContext,
     *,
     to_email: str,
     caregiver_name: str,
@@ -67,126 +112,9 @@ async def send_signup_confirmation_task(
     }
 
 
-async def send_session_reminder_task(
-    ctx: Context,
-    *,
-    to_email: str,
-    caregiver_name: str,
-    child_name: str,
-    session_name: str,
-    session_venue: str | None,
-    session_address: str,
-    session_time: str,
-    session_date: str | None = None,
-    what_to_bring: str | None = None,
-    contact_email: str | None = None,
-    bcc_emails: list[str] | None = None,
-) -> dict[str, Any]:
-    """Background task to send session reminder email (1 day before).
-
-    Batch email: all caregivers BCC'd, staff and session contact also BCC'd.
-    """
-    logger.info(f"Sending session reminder to {to_email}")
-
-    html, text = email_service.render_template(
-        "session_reminder",
-        caregiver_name=caregiver_name,
-        child_name=child_name,
-        session_name=session_name,
-        session_venue=session_venue or session_name,
-        session_address=session_address,
-        session_time=session_time,
-        session_date=session_date,
-        what_to_bring=[what_to_bring] if what_to_bring else [],
-        contact_email=contact_email or settings.email_contact,
-    )
-
-    from app.services.email import EmailMessage
-
-    # 1-day notice is a batch email: org email in To, all recipients BCC'd
-    all_bcc = _build_bcc(to_email, contact_email, bcc_emails)
-
-    message = EmailMessage(
-        to=[settings.email_contact],
-        subject=f"Reminder: {child_name}'s session tomorrow - {session_name}",
-        html=html,
-        text=text,
-        bcc=all_bcc,
-        reply_to=settings.email_contact,
-    )
-
-    success = await email_service.send(message)
-
-    return {
-        "success": success,
-        "to_email": to_email,
-        "sent_at": datetime.now().isoformat(),
-    }
-
-
-async def send_session_term_info_task(
-    ctx: Context,
-    *,
-    to_email: str,
-    caregiver_name: str,
-    child_name: str,
-    session_name: str,
-    session_venue: str | None,
-    session_address: str,
-    session_time: str,
-    first_session_date: str,
-    calendar_url: str,
-    term_summary: str | None = None,
-    what_to_bring: str | None = None,
-    contact_email: str | None = None,
-    bcc_emails: list[str] | None = None,
-) -> dict[str, Any]:
-    """Background task to send session term info email (2 weeks before).
-
-    Batch email: org email in To, all caregivers + staff + session contact BCC'd.
-    """
-    logger.info(f"Sending session term info to {to_email}")
-
-    html, text = email_service.render_template(
-        "session_term_info",
-        caregiver_name=caregiver_name,
-        child_name=child_name,
-        session_name=session_name,
-        session_venue=session_venue or session_name,
-        session_address=session_address,
-        session_time=session_time,
-        first_session_date=first_session_date,
-        calendar_url=calendar_url,
-        term_summary=term_summary,
-        what_to_bring=what_to_bring,
-        contact_email=contact_email or settings.email_contact,
-    )
-
-    from app.services.email import EmailMessage
-
-    # 2-week notice is a batch email: org email in To, all recipients BCC'd
-    all_bcc = _build_bcc(to_email, contact_email, bcc_emails)
-
-    message = EmailMessage(
-        to=[settings.email_contact],
-        subject=f"Session details: {child_name} - {session_name}",
-        html=html,
-        text=text,
-        bcc=all_bcc,
-        reply_to=contact_email or settings.email_contact,
-    )
-
-    success = await email_service.send(message)
-
-    return {
-        "success": success,
-        "to_email": to_email,
-        "sent_at": datetime.now().isoformat(),
-    }
-
-
+@retry_when_throttled
 async def send_waitlist_confirmed_task(
-    ctx: Context,
+    ctx: WorkerContext,
     *,
     to_email: str,
     caregiver_name: str,
@@ -236,8 +164,9 @@ async def send_waitlist_confirmed_task(
     }
 
 
+@retry_when_throttled
 async def send_session_change_alert_task(
-    ctx: Context,
+    ctx: WorkerContext,
     *,
     to_email: str,
     caregiver_name: str,
@@ -254,7 +183,8 @@ async def send_session_change_alert_task(
 ) -> dict[str, Any]:
     """Send an email for cancellations/venue changes/time changes (direct to caregiver).
 
-    Triggered by admin functionality.
+    Triggered by admin functionality for a single signup; notices to every signup of
+    a session go through `send_session_notice_task`.
     """
     logger.info(f"Sending session change alert to {to_email}")
 
@@ -290,8 +220,143 @@ async def send_session_change_alert_task(
     }
 
 
+@retry_when_throttled
+async def send_session_notice_task(
+    ctx: WorkerContext,
+    *,
+    session_id: str,
+    update_title: str,
+    update_message: str | None = None,
+    affected_date: str | None = None,
+    contact_email: str | None = None,
+) -> dict[str, Any]:
+    """Send a session change alert to every caregiver with a confirmed signup.
+
+    Enqueued once per notice by the admin notify, bulk email and cancel-occurrence
+    endpoints. Recipients are streamed from the database in caregiver order and sent
+    `mailgun_max_recipients` at a time with `EmailService.send_batch` (children of
+    the same caregiver are named together). After each batch the last caregiver sent
+    is saved in the job's meta, so a retry after a throttled batch resumes there
+    instead of emailing earlier batches again.
+    """
+    from sqlalchemy import func, select
+
+    from app.models import Caregiver, Child, Session, SessionLocation, Signup
+    from app.schemas.session import _format_time_range
+    from app.services.email import BatchRecipient
+
+    job = ctx.get("job")
+    meta = dict(job.meta) if job is not None else {}
+    cursor = uuid.UUID(meta["cursor"]) if meta.get("cursor") else None
+    sent = meta.get("recipientsSent", 0)
+    accepted = meta.get("recipientsAccepted", 0)
+
+    async with ctx["db_sessionmaker"]() as db:
+        res = await db.execute(
+            select(
+                Session.name,
+                Session.day_of_week,
+                Session.start_time,
+                Session.end_time,
+                SessionLocation.name,
+                SessionLocation.address,
+            )
+            .join(SessionLocation, SessionLocation.id == Session.session_location_id)
+            .where(Session.id == uuid.UUID(session_id))
+        )
+        row = res.one_or_none()
+        if row is None:
+            return {"success": False, "error": "Session not found", "sent_at": datetime.now().isoformat()}
+        session_name, day_of_week, start_time, end_time, session_venue, session_address = row
+
+        recipients_filter = (
+            Signup.session_id == uuid.UUID(session_id),
+            Signup.status == "confirmed",
+            Caregiver.email.is_not(None),
+            Caregiver.name.is_not(None),
+        )
+        total = (
+            await db.scalar(
+                select(func.count(func.distinct(Signup.caregiver_id)))
+                .join(Caregiver, Caregiver.id == Signup.caregiver_id)
+                .where(*recipients_filter)
+            )
+            or 0
+        )
+
+        stmt = (
+            select(Signup.caregiver_id, Caregiver.email, Caregiver.name, Child.name)
+            .join(Caregiver, Caregiver.id == Signup.caregiver_id)
+            .join(Child, Child.id == Signup.child_id)
+            .where(*recipients_filter)
+            .order_by(Signup.caregiver_id, Signup.created_at)
+            .execution_options(yield_per=500)
+        )
+        if cursor is not None:
+            stmt = stmt.where(Signup.caregiver_id > cursor)
+
+        async def send(batch: dict[uuid.UUID, dict[str, Any]]) -> None:
+            nonlocal sent, accepted
+            recipients = [
+                BatchRecipient(
+                    email=r["email"],
+                    variables={"caregiver_name": r["caregiver_name"], "child_name": _join_names(r["children"])},
+                )
+                for r in batch.values()
+            ]
+            accepted += await email_service.send_batch(
+                template_name="session_change_alert",
+                subject=f"Update: {session_name} - %recipient.child_name%",
+                recipients=recipients,
+                reply_to=settings.email_contact,
+                session_name=session_name,
+                session_venue=session_venue or session_name,
+                session_address=session_address,
+                session_time=_format_time_range(day_of_week, start_time, end_time),
+                update_title=update_title,
+                update_message=update_message,
+                affected_date=affected_date,
+                contact_email=contact_email or settings.email_contact,
+            )
+            sent += len(batch)
+            if job is not None:
+                await job.update(
+                    progress=min(1.0, sent / total) if total else 1.0,
+                    meta={
+                        "cursor": str(next(reversed(batch))),
+                        "recipientsSent": sent,
+                        "recipientsAccepted": accepted,
+                        "recipientsTotal": total,
+                    },
+                )
+
+        batch_size = max(1, email_service.max_recipients)
+        batch: dict[uuid.UUID, dict[str, Any]] = {}
+        result = await db.stream(stmt)
+        async for caregiver_id, email, caregiver_name, child_name in result:
+            if caregiver_id not in batch and len(batch) >= batch_size:
+                await send(batch)
+                batch = {}
+            recipient = batch.setdefault(
+                caregiver_id, {"email": email, "caregiver_name": caregiver_name, "children": []}
+            )
+            recipient["children"].append(child_name)
+        if batch:
+            await send(batch)
+
+    logger.info(f"Sent session notice for {session_id} to {sent} caregivers")
+    return {
+        "success": accepted == sent,
+        "session_id": session_id,
+        "recipients": sent,
+        "accepted": accepted,
+        "sent_at": datetime.now().isoformat(),
+    }
+
+
+@retry_when_throttled
 async def send_missed_session_followup_task(
-    ctx: Context,
+    ctx: WorkerContext,
     *,
     to_email: str,
     caregiver_name: str,
@@ -343,7 +408,7 @@ async def send_missed_session_followup_task(
 
 
 async def notify_newsletter_subscription_task(
-    ctx: Context,
+    ctx: WorkerContext,
     *,
     email: str,
     name: str | None = None,
@@ -375,258 +440,233 @@ async def notify_newsletter_subscription_task(
     return {"success": False, "email": email, "sent_at": datetime.now().isoformat()}
 
 
-async def process_batch_emails_task(ctx: Context) -> dict[str, Any]:
+@retry_when_throttled
+async def process_batch_emails_task(ctx: WorkerContext) -> dict[str, Any]:
     """Cron job that runs daily at 9am to send batch emails.
 
-    Checks database for:
-    - Signups that are 2 weeks before their first session (send 2-week notice)
-    - Signups that are 1 day before their first session (send 1-day reminder)
+    One streamed query finds confirmed signups whose session's first non-cancelled
+    occurrence starts in 2 weeks (send 2-week notice) or tomorrow (send 1-day
+    reminder), local time. Sessions without materialised occurrences get no notice.
 
-    Emails are sent as batch emails with org email in To and all recipients BCC'd.
+    Each session's notice is rendered once and sent with `EmailService.send_batch`:
+    one Mailgun request per session (per `mailgun_max_recipients` recipients) delivers
+    a personalised message to each caregiver. Recipients go out in email order, and
+    after each request the day being processed and the last recipient sent for that
+    notice are saved in the job's meta, so a retry after a throttled send resumes
+    there, on the same day's windows, instead of emailing anyone twice.
     """
-    from datetime import datetime, time, timedelta
+    from datetime import UTC, date, datetime, time, timedelta
     from zoneinfo import ZoneInfo
 
-    from sqlalchemy import select
-    from sqlalchemy.ext.asyncio import AsyncSession
-    from sqlalchemy.orm import selectinload
+    from sqlalchemy import ColumnElement, and_, func, or_, select
+    from sqlalchemy.orm import InstrumentedAttribute
 
-    from app.models.session import Session
-    from app.models.session_block import SessionBlock
-    from app.models.session_block_link import SessionBlockLink
-    from app.models.session_occurrence import SessionOccurrence
-    from app.models.signup import Signup
+    from app.models import Caregiver, Child, Session, SessionBlock, SessionLocation, SessionOccurrence, Signup
     from app.schemas.session import _format_time_range
-    from app.services.email import EmailMessage
+    from app.services.email import BatchRecipient
 
     logger.info("Processing batch emails at 9am")
 
+    job = ctx.get("job")
+    meta = dict(job.meta) if job is not None else {}
     tz = ZoneInfo("Pacific/Auckland")
-    now_local = datetime.now(tz)
-    today_local = now_local.date()
-
-    # Get database session
-    db = AsyncSession()
-    try:
-        # Find all confirmed signups
-        signups_result = await db.execute(
-            select(Signup)
-            .where(Signup.status == "confirmed")
-            .options(
-                selectinload(Signup.session).selectinload(Session.session_location),
-                selectinload(Signup.caregiver),
-                selectinload(Signup.child),
+    today_local = date.fromisoformat(meta["day"]) if meta.get("day") else datetime.now(tz).date()
+    # Last recipient email sent per "<kind>:<session id>" notice, on earlier attempts of this job
+    sent_up_to: dict[str, str] = dict(meta.get("sentUpTo") or {})
+
+    def local_day_utc(days_ahead: int) -> tuple[datetime, datetime]:
+        day = today_local + timedelta(days=days_ahead)
+        start = datetime.combine(day, time(hour=0), tzinfo=tz)
+        end = datetime.combine(day + timedelta(days=1), time(hour=0), tzinfo=tz)
+        return start.astimezone(UTC), end.astimezone(UTC)
+
+    # First sessions that start tomorrow (1-day reminder) or in two weeks (2-week notice), as UTC ranges
+    reminder_range = local_day_utc(1)
+    term_info_range = local_day_utc(14)
+
+    def starts_in_window(column: ColumnElement[datetime] | InstrumentedAttribute[datetime]) -> ColumnElement[bool]:
+        return or_(*(and_(column >= lo, column < hi) for lo, hi in (reminder_range, term_info_range)))
+
+    # Each due session's first non-cancelled occurrence; only sessions with an occurrence
+    # in one of the windows are ranked, so the window function never scans all history.
+    due_sessions = select(SessionOccurrence.session_id).where(
+        SessionOccurrence.cancelled.is_(False),
+        starts_in_window(SessionOccurrence.starts_at),
+    )
+    ranked = (
+        select(
+            SessionOccurrence.session_id,
+            SessionOccurrence.starts_at,
+            SessionOccurrence.block_id,
+            func.row_number()
+            .over(
+                partition_by=SessionOccurrence.session_id,
+                order_by=(SessionOccurrence.starts_at, SessionOccurrence.id),
             )
+            .label("rn"),
         )
-        signups = signups_result.scalars().all()
-
-        emails_to_send = []  # List of (email_type, email_data) tuples
-
-        for signup in signups:
-            session = signup.session
-            caregiver = signup.caregiver
-            child = signup.child
-            loc = session.session_location if hasattr(session, "session_location") else None
-
-            if not loc:
-                continue
-
-            session_venue = loc.name if loc else session.name
-            session_address = loc.address if loc else ""
-            session_contact_email = loc.contact_email if loc else None
-            session_time = _format_time_range(session.day_of_week, session.start_time, session.end_time)
-
-            # Determine first session date
-            first_start_local = None
-            block_label = None
-
-            session_type = getattr(session, "session_type", "term")
-
-            if session_type == "special":
-                # For special sessions, use first non-cancelled occurrence
-                first_occ_result = await db.execute(
-                    select(SessionOccurrence)
-                    .where(
-                        SessionOccurrence.session_id == session.id,
-                        SessionOccurrence.cancelled.is_(False),
-                    )
-                    .order_by(SessionOccurrence.starts_at.asc())
-                    .limit(1)
-                )
-                first_occ = first_occ_result.scalar_one_or_none()
-                if first_occ and first_occ.starts_at:
-                    first_start_local = first_occ.starts_at.astimezone(tz)
-            else:
-                # For term sessions, find first occurrence in earliest block
-                blocks_result = await db.execute(
-                    select(SessionBlock)
-                    .join(SessionBlockLink, SessionBlockLink.block_id == SessionBlock.id)
-                    .where(SessionBlockLink.session_id == session.id)
-                    .order_by(SessionBlock.year.asc(), SessionBlock.start_date.asc())
-                    .limit(1)
-                )
-                block = blocks_result.scalar_one_or_none()
-
-                if block:
-                    block_label = block.name
-                    block_start_local = datetime.combine(block.start_date, time(hour=0), tzinfo=tz)
-
-                    # Find first occurrence in this block
-                    occ_result = await db.execute(
-                        select(SessionOccurrence)
-                        .where(
-                            SessionOccurrence.session_id == session.id,
-                            SessionOccurrence.cancelled.is_(False),
-                            SessionOccurrence.block_id == block.id,
-                            SessionOccurrence.starts_at >= block_start_local,
-                        )
-                        .order_by(SessionOccurrence.starts_at.asc())
-                        .limit(1)
-                    )
-                    occ = occ_result.scalar_one_or_none()
-
-                    if occ and occ.starts_at:
-                        first_start_local = occ.starts_at.astimezone(tz)
-                    # Calculate based on day of week
-                    elif session.day_of_week is not None and session.start_time is not None:
-                        days_ahead = (int(session.day_of_week) - block_start_local.weekday() + 7) % 7
-                        first_date = block_start_local.date() + timedelta(days=days_ahead)
-                        first_start_local = datetime.combine(first_date, session.start_time, tzinfo=tz)
-
-            if not first_start_local:
-                continue
-
-            first_session_date = first_start_local.strftime("%a %d %b %Y, %-I:%M%p")
-            calendar_url = f"{settings.public_base_url}/api/v1/session/{session.id}/calendar.ics"
-
-            # Check if today is 2 weeks before first session
-            two_weeks_before = (first_start_local - timedelta(days=14)).date()
-            if today_local == two_weeks_before:
-                emails_to_send.append(
-                    (
-                        "term_info",
-                        {
-                            "caregiver_email": caregiver.email,
-                            "caregiver_name": caregiver.name,
-                            "child_name": child.name,
-                            "session_name": session.name,
-                            "session_venue": session_venue,
-                            "session_address": session_address,
-                            "session_time": session_time,
-                            "first_session_date": first_session_date,
-                            "calendar_url": calendar_url,
-                            "term_summary": block_label,
-                            "what_to_bring": session.what_to_bring,
-                            "contact_email": session_contact_email,
-                        },
-                    )
-                )
+        .where(
+            SessionOccurrence.cancelled.is_(False),
+            SessionOccurrence.session_id.in_(due_sessions),
+        )
+        .subquery("ranked")
+    )
+    stmt = (
+        select(
+            ranked.c.starts_at,
+            Session.id,
+            Session.name,
+            Session.session_type,
+            Session.day_of_week,
+            Session.start_time,
+            Session.end_time,
+            Session.what_to_bring,
+            SessionLocation.name,
+            SessionLocation.address,
+            SessionLocation.contact_email,
+            SessionBlock.name,
+            Caregiver.email,
+            Caregiver.name,
+            Child.name,
+        )
+        .select_from(ranked)
+        .join(Session, Session.id == ranked.c.session_id)
+        .join(SessionLocation, SessionLocation.id == Session.session_location_id)
+        .join(Signup, Signup.session_id == Session.id)
+        .join(Caregiver, Caregiver.id == Signup.caregiver_id)
+        .join(Child, Child.id == Signup.child_id)
+        .outerjoin(SessionBlock, SessionBlock.id == ranked.c.block_id)
+        .where(
+            ranked.c.rn == 1,
+            starts_in_window(ranked.c.starts_at),
+            Signup.status == "confirmed",
+            Session.archived.is_(False),
+        )
+        .order_by(Session.id)
+        .execution_options(yield_per=500)
+    )
 
-            # Check if today is 1 day before first session
-            one_day_before = (first_start_local - timedelta(days=1)).date()
-            if today_local == one_day_before:
-                emails_to_send.append(
-                    (
-                        "reminder",
-                        {
-                            "caregiver_email": caregiver.email,
-                            "caregiver_name": caregiver.name,
-                            "child_name": child.name,
-                            "session_name": session.name,
-                            "session_venue": session_venue,
-                            "session_address": session_address,
-                            "session_time": session_time,
-                            "session_date": first_session_date,
-                            "what_to_bring": session.what_to_bring,
-                            "contact_email": session_contact_email,
-                        },
-                    )
+    try:
+        # One notice per (kind, session): rendered once, personalised per caregiver by Mailgun
+        notices: dict[tuple[str, uuid.UUID], dict[str, Any]] = {}
+
+        async with ctx["db_sessionmaker"]() as db:
+            result = await db.stream(stmt)
+            async for (
+                first_start,
+                session_id,
+                session_name,
+                session_type,
+                day_of_week,
+                start_time,
+                end_time,
+                what_to_bring,
+                session_venue,
+                session_address,
+                session_contact_email,
+                block_name,
+                caregiver_email,
+                caregiver_name,
+                child_name,
+            ) in result:
+                # SQLite returns naive datetimes even for timezone=True columns; they are UTC
+                first_start_local = (
+                    first_start if first_start.tzinfo is not None else first_start.replace(tzinfo=UTC)
+                ).astimezone(tz)
+                kind = "term_info" if first_start_local.date() == today_local + timedelta(days=14) else "reminder"
+                notice: dict[str, Any] | None = notices.get((kind, session_id))
+                if notice is None:
+                    notice = notices[(kind, session_id)] = {
+                        "session_name": session_name,
+                        "session_venue": session_venue,
+                        "session_address": session_address,
+                        "session_time": _format_time_range(day_of_week, start_time, end_time),
+                        "first_session_date": first_start_local.strftime("%a %d %b %Y, %-I:%M%p"),
+                        "calendar_url": f"{settings.public_base_url}/api/v1/session/{session_id}/calendar.ics",
+                        "term_summary": block_name if session_type == "term" else None,
+                        "what_to_bring": what_to_bring,
+                        "contact_email": session_contact_email,
+                        "recipients": {},
+                    }
+                recipient = notice["recipients"].setdefault(
+                    caregiver_email, {"caregiver_name": caregiver_name, "children": []}
                 )
-
-        # Group emails by type and send batch emails
-        term_info_emails = [e for t, e in emails_to_send if t == "term_info"]
-        reminder_emails = [e for t, e in emails_to_send if t == "reminder"]
+                recipient["children"].append(child_name)
 
         sent_count = 0
-
-        # Send 2-week notice as batch
-        if term_info_emails:
-            logger.info(f"Sending {len(term_info_emails)} 2-week notice emails")
-            for email_data in term_info_emails:
-                html, text = email_service.render_template(
-                    "session_term_info",
-                    caregiver_name=email_data["caregiver_name"],
-                    child_name=email_data["child_name"],
-                    session_name=email_data["session_name"],
-                    session_venue=email_data["session_venue"],
-                    session_address=email_data["session_address"],
-                    session_time=email_data["session_time"],
-                    first_session_date=email_data["first_session_date"],
-                    calendar_url=email_data["calendar_url"],
-                    term_summary=email_data["term_summary"],
-                    what_to_bring=email_data["what_to_bring"],
-                    contact_email=email_data["contact_email"] or settings.email_contact,
-                )
-
-                bcc_recipients = [
-                    email_data["caregiver_email"],
-                ]
-                if email_data["contact_email"]:
-                    bcc_recipients.append(email_data["contact_email"])
-
-                message = EmailMessage(
-                    to=[settings.email_contact],
-                    subject=f"Session details: {email_data['child_name']} - {email_data['session_name']}",
-                    html=html,
-                    text=text,
-                    bcc=bcc_recipients,
-                    reply_to=email_data["contact_email"] or settings.email_contact,
-                )
-
-                if await email_service.send(message):
-                    sent_count += 1
-
-        # Send 1-day reminder as batch
-        if reminder_emails:
-            logger.info(f"Sending {len(reminder_emails)} 1-day reminder emails")
-            for email_data in reminder_emails:
-                html, text = email_service.render_template(
-                    "session_reminder",
-                    caregiver_name=email_data["caregiver_name"],
-                    child_name=email_data["child_name"],
-                    session_name=email_data["session_name"],
-                    session_venue=email_data["session_venue"],
-                    session_address=email_data["session_address"],
-                    session_time=email_data["session_time"],
-                    session_date=email_data["session_date"],
-                    what_to_bring=[email_data["what_to_bring"]] if email_data["what_to_bring"] else [],
-                    contact_email=email_data["contact_email"] or settings.email_contact,
+        batch_size = max(1, email_service.max_recipients)
+        logger.info(f"Sending {len(notices)} session notices")
+
+        for (kind, session_id), notice in notices.items():
+            contact_email = notice["contact_email"]
+            # One personalised message per caregiver (children in the same session are
+            # named together); the session contact and org inbox get a generic copy.
+            recipients = [
+                BatchRecipient(
+                    email=email,
+                    variables={
+                        "caregiver_name": r["caregiver_name"] or "there",
+                        "child_name": _join_names(r["children"]),
+                    },
                 )
+                for email, r in notice["recipients"].items()
+            ]
+            for copy_to in dict.fromkeys([contact_email, settings.email_contact]):
+                if copy_to and copy_to not in notice["recipients"]:
+                    recipients.append(
+                        BatchRecipient(email=copy_to, variables={"caregiver_name": "there", "child_name": "your child"})
+                    )
 
-                bcc_recipients = [
-                    email_data["caregiver_email"],
-                ]
-                if email_data["contact_email"]:
-                    bcc_recipients.append(email_data["contact_email"])
-
-                message = EmailMessage(
-                    to=[settings.email_contact],
-                    subject=f"Reminder: {email_data['child_name']}'s session tomorrow - {email_data['session_name']}",
-                    html=html,
-                    text=text,
-                    bcc=bcc_recipients,
-                    reply_to=email_data["contact_email"] or settings.email_contact,
+            if kind == "term_info":
+                template_name = "session_term_info"
+                subject = f"Session details: %recipient.child_name% - {notice['session_name']}"
+                context = {
+                    "first_session_date": notice["first_session_date"],
+                    "calendar_url": notice["calendar_url"],
+                    "term_summary": notice["term_summary"],
+                    "what_to_bring": notice["what_to_bring"],
+                }
+            else:
+                template_name = "session_reminder"
+                subject = f"Reminder: %recipient.child_name%'s session tomorrow - {notice['session_name']}"
+                context = {
+                    "session_date": notice["first_session_date"],
+                    "what_to_bring": [notice["what_to_bring"]] if notice["what_to_bring"] else [],
+                }
+
+            notice_key = f"{kind}:{session_id}"
+            recipients.sort(key=lambda r: r.email)
+            if notice_key in sent_up_to:
+                recipients = [r for r in recipients if r.email > sent_up_to[notice_key]]
+
+            for start in range(0, len(recipients), batch_size):
+                chunk = recipients[start : start + batch_size]
+                sent_count += await email_service.send_batch(
+                    template_name=template_name,
+                    subject=subject,
+                    recipients=chunk,
+                    reply_to=contact_email or settings.email_contact,
+                    session_name=notice["session_name"],
+                    session_venue=notice["session_venue"],
+                    session_address=notice["session_address"],
+                    session_time=notice["session_time"],
+                    contact_email=contact_email or settings.email_contact,
+                    **context,
                 )
-
-                if await email_service.send(message):
-                    sent_count += 1
+                sent_up_to[notice_key] = chunk[-1].email
+                if job is not None:
+                    await job.update(meta={"day": today_local.isoformat(), "sentUpTo": sent_up_to})
 
         return {
             "success": True,
+            "notices": len(notices),
             "emails_sent": sent_count,
             "processed_at": datetime.now().isoformat(),
         }
 
+    except EmailDeferredError:
+        # Retried by `retry_when_throttled`, resuming from the saved meta
+        raise
     except Exception as e:
         logger.error(f"Error processing batch emails: {e}", exc_info=True)
         return {
@@ -634,8 +674,85 @@ async def process_batch_emails_task(ctx: Context) -> dict[str, Any]:
             "error": str(e),
             "processed_at": datetime.now().isoformat(),
         }
-    finally:
-        await db.close()
+
+
+async def materialise_occurrences_task(
+    ctx: WorkerContext,
+    *,
+    year: int | None = None,
+    block_id: str | None = None,
+) -> dict[str, Any]:
+    """Generate occurrences for every non-archived term session in a year or block.
+
+    Enqueued by the admin batch-generate endpoint. Progress (sessions processed so
+    far) is published on the job so the admin UI can poll `/api/v1/admin/jobs/{key}`.
+    Once new occurrences are committed, every API process drops its cached calendar feeds.
+    """
+    from app.services.calendar_feeds import calendar_feed_cache
+    from app.services.schedule import ScheduleError, materialise_term_occurrences
+
+    job = ctx.get("job")
+
+    async def report(done: int, total: int) -> None:
+        if job is not None:
+            await job.update(
+                progress=done / total if total else 1.0,
+                meta={"sessionsProcessed": done, "sessionsTotal": total},
+            )
+
+    logger.info("Materialising occurrences for year=%s block=%s", year, block_id)
+
+    async with ctx["db_sessionmaker"]() as db:
+        try:
+            result = await materialise_term_occurrences(
+                db,
+                year=year,
+                block_id=uuid.UUID(block_id) if block_id else None,
+                progress=report,
+            )
+        except ScheduleError as e:
+            return {"success": False, "error": str(e), "processed_at": datetime.now().isoformat()}
+        await db.commit()
+    if result.created:
+        await calendar_feed_cache.clear_everywhere()
+
+    return {
+        "success": True,
+        "sessions": result.sessions,
+        "created": result.created,
+        "skippedExisting": result.skipped_existing,
+        "skippedSessions": result.skipped_sessions,
+        "processed_at": datetime.now().isoformat(),
+    }
+
+
+async def startup(ctx: WorkerContext) -> None:
+    """Open the worker's database engine and shared HTTP client.
+
+    Tasks open database sessions with `ctx["db_sessionmaker"]`.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    import app.models  # noqa: F401  # register all mappers before the first query
+
+    engine = create_async_engine(
+        settings.database_url,
+        echo=settings.sqlalchemy_echo,
+        pool_pre_ping=True,
+        pool_size=5,
+        max_overflow=5,
+    )
+    ctx["db_engine"] = engine
+    ctx["db_sessionmaker"] = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    get_http_client()
+
+
+async def shutdown(ctx: WorkerContext) -> None:
+    engine = ctx.get("db_engine")
+    if engine is not None:
+        await engine.dispose()
+    await close_http_client()
+    await close_redis()
 
 
 # Queue settings
@@ -643,15 +760,17 @@ queue_settings = {
     "queue": Queue.from_url(settings.redis_url),
     "functions": [
         send_signup_confirmation_task,
-        send_session_reminder_task,
-        send_session_term_info_task,
         send_waitlist_confirmed_task,
         send_session_change_alert_task,
+        send_session_notice_task,
         send_missed_session_followup_task,
         notify_newsletter_subscription_task,
         process_batch_emails_task,
+        materialise_occurrences_task,
     ],
     "concurrency": 10,
+    "startup": startup,
+    "shutdown": shutdown,
     "cron_jobs": [
         # Run batch email processing daily at 9:00 AM Pacific/Auckland time
         CronJob(process_batch_emails_task, cron="0 9 * * *"),
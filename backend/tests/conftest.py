@@ -0,0 +1,352 @@
+"""Shared test fixtures.
+
+Tests use `DATABASE_URL` when it is set (CI points it at Postgres) and a SQLite
+file otherwise. Each xdist worker gets its own database, so schema setup and
+teardown in one worker never touch another's tables.
+"""
+
+import asyncio
+import os
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+# Kept in its own variable so xdist workers, which inherit the rewritten DATABASE_URL, see the original
+BASE_DATABASE_URL = os.environ.setdefault("TESTS_BASE_DATABASE_URL", os.environ.get("DATABASE_URL", ""))
+SQLITE_PATH = Path(tempfile.gettempdir()) / f"sessions-test-{WORKER}.db"
+
+
+def _worker_database_url() -> str:
+    if not BASE_DATABASE_URL:
+        return f"sqlite+aiosqlite:///{SQLITE_PATH}"
+    url = make_url(BASE_DATABASE_URL)
+    return url.set(database=f"{url.database}_{WORKER}").render_as_string(hide_password=False)
+
+
+# Settings are read when `app` is first imported, so these must be set before that.
+os.environ["DATABASE_URL"] = _worker_database_url()
+os.environ.setdefault("EMAIL_DRY_RUN", "true")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+os.environ.setdefault("ADMIN_TOKEN_REVOCATION_BACKEND", "memory")
+os.environ.setdefault("CACHE_EVENTS_BACKEND", "memory")
+
+# The public views, as created by the 0001/0002 migrations (portable to SQLite).
+VIEWS = {
+    "sessions_public": """
+        SELECT s.id, s.name, s.age_lower, s.age_upper, s.day_of_week, s.start_time, s.end_time,
+               s.year, s.session_type, s.what_to_bring, s.prerequisites, s.waitlist,
+               l.id AS location_id, l.name AS location_name, l.address AS location_address,
+               l.region AS location_region, l.lat AS location_lat, l.lng AS location_lng,
+               l.instructions AS location_instructions
+        FROM sessions s
+        JOIN session_locations l ON l.id = s.session_location_id
+        WHERE COALESCE(s.archived, false) = false
+    """,
+    "session_occurrences_public": """
+        SELECT so.id, so.session_id, so.starts_at, so.ends_at, so.cancelled, so.cancellation_reason
+        FROM session_occurrences so
+    """,
+    "children_staff": """
+        SELECT c.id, c.caregiver_id, c.name, c.date_of_birth, c.media_consent, c.medical_info,
+               c.needs_devices, c.other_info
+        FROM children c
+    """,
+    "caregivers_staff": """
+        SELECT cg.id, cg.name, cg.email, cg.phone, cg.email_verified FROM caregivers cg
+    """,
+}
+
+
+async def _recreate_postgres_database() -> None:
+    database = make_url(os.environ["DATABASE_URL"]).database
+    admin_engine = create_async_engine(BASE_DATABASE_URL, isolation_level="AUTOCOMMIT")
+    try:
+        async with admin_engine.connect() as conn:
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{database}"'))
+            await conn.execute(text(f'CREATE DATABASE "{database}"'))
+    finally:
+        await admin_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def worker_database() -> Iterator[None]:
+    """Create this worker's empty database."""
+    if BASE_DATABASE_URL:
+        asyncio.run(_recreate_postgres_database())
+    else:
+        SQLITE_PATH.unlink(missing_ok=True)
+    yield
+    if not BASE_DATABASE_URL:
+        SQLITE_PATH.unlink(missing_ok=True)
+
+
+@pytest_asyncio.fixture
+async def db_schema(worker_database: None) -> AsyncIterator[None]:
+    """Create every table and public view, and drop them (and reset app caches) afterwards."""
+    from app.db import engine
+    from app.models.base import Base
+    from app.services.availability import availability_cache
+    from app.services.calendar_feeds import calendar_feed_cache
+    from app.services.catalogue import catalogue_cache
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for name, query in VIEWS.items():
+            await conn.execute(text(f"CREATE VIEW {name} AS {query}"))
+
+    catalogue_cache.invalidate()
+    availability_cache.invalidate()
+    calendar_feed_cache.clear()
+    yield
+
+    async with engine.begin() as conn:
+        for name in reversed(VIEWS):
+            await conn.execute(text(f"DROP VIEW IF EXISTS {name}"))
+        await conn.run_sync(Base.metadata.drop_all)
+    # Connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def seeded(db_schema: None) -> dict[str, list]:
+    """Three weekly term sessions with a block, ten upcoming occurrences and five signups each.
+
+    Returns the created ids as `{"sessions": [...], "blocks": [...], "locations": [...]}`.
+    """
+    from app.db import async_session_factory
+    from app.models import (
+        Caregiver,
+        Child,
+        Session,
+        SessionBlock,
+        SessionBlockLink,
+        SessionLocation,
+        SessionOccurrence,
+        Signup,
+    )
+
+    first = datetime.now(UTC).replace(hour=2, minute=30, second=0, microsecond=0) + timedelta(days=7)
+    async with async_session_factory() as db:
+        block = SessionBlock(
+            year=first.year,
+            block_type="term_1",
+            name="Term 1",
+            start_date=first.date(),
+            end_date=(first + timedelta(weeks=10)).date(),
+        )
+        locations = [
+            SessionLocation(
+                name=name,
+                address=f"{i} Main St",
+                region=region,
+                lat=lat,
+                lng=lng,
+                contact_name="Venue contact",
+                contact_email="venue@example.com",
+            )
+            for i, (name, region, lat, lng) in enumerate(
+                [
+                    ("Hutt Library", "Wellington", -41.21, 174.90),
+                    ("Central Library", "Auckland", -36.85, 174.76),
+                    ("Christchurch Hub", "Canterbury", -43.53, 172.63),
+                ]
+            )
+        ]
+        db.add_all([block, *locations])
+        await db.flush()
+
+        sessions = [
+            Session(
+                session_location_id=location.id,
+                year=first.year,
+                session_type="term",
+                name=f"Robotics Club {i}",
+                age_lower=8,
+                age_upper=12,
+                day_of_week=1,
+                start_time=time(15, 30),
+                end_time=time(17, 0),
+                capacity=10,
+            )
+            for i, location in enumerate(locations)
+        ]
+        db.add_all(sessions)
+        await db.flush()
+
+        for session in sessions:
+            db.add(SessionBlockLink(session_id=session.id, block_id=block.id))
+            db.add_all(
+                SessionOccurrence(
+                    session_id=session.id,
+                    block_id=block.id,
+                    starts_at=first + timedelta(weeks=week),
+                    ends_at=first + timedelta(weeks=week, hours=1, minutes=30),
+                    auto_generated=True,
+                )
+                for week in range(10)
+            )
+            for n in range(5):
+                caregiver = Caregiver(email=f"{session.id}-{n}@example.com", name=f"Caregiver {n}")
+                db.add(caregiver)
+                await db.flush()
+                child = Child(caregiver_id=caregiver.id, name=f"Child {n}", date_of_birth=date(2016, 1, 1))
+                db.add(child)
+                await db.flush()
+                db.add(Signup(session_id=session.id, caregiver_id=caregiver.id, child_id=child.id, status="confirmed"))
+
+        await db.commit()
+        return {
+            "sessions": [s.id for s in sessions],
+            "blocks": [block.id],
+            "locations": [location.id for location in locations],
+        }
+
+
+@pytest.fixture
+def statements() -> Iterator[list[str]]:
+    """SQL statements executed on the app engine while the test runs."""
+    from app.db import engine
+
+    executed: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+class RecordingQueue:
+    """Stands in for the SAQ queue: keeps enqueued jobs by key, in memory.
+
+    Like SAQ, a job whose key is already queued or running is not enqueued again
+    (`enqueue` returns None).
+    """
+
+    def __init__(self) -> None:
+        from saq.job import Job
+
+        self._job_fields = set(Job.__dataclass_fields__)
+        self.jobs: dict[str, Any] = {}
+
+    async def enqueue(self, function: str, **kwargs: Any) -> Any:
+        from saq.job import TERMINAL_STATUSES, Job, Status
+
+        job_kwargs: dict[str, Any] = {"kwargs": {}}
+        for name, value in kwargs.items():
+            if name in self._job_fields:
+                job_kwargs[name] = value
+            else:
+                job_kwargs["kwargs"][name] = value
+        job = Job(function=function, status=Status.QUEUED, **job_kwargs)
+
+        existing = self.jobs.get(job.key)
+        if existing is not None and existing.status not in TERMINAL_STATUSES:
+            return None
+        self.jobs[job.key] = job
+        return job
+
+    async def job(self, key: str) -> Any:
+        return self.jobs.get(key)
+
+    def enqueued(self, function: str) -> list[Any]:
+        """Jobs enqueued for `function`, oldest first."""
+        return [job for job in self.jobs.values() if job.function == function]
+
+
+@pytest.fixture
+def queue(monkeypatch: pytest.MonkeyPatch) -> RecordingQueue:
+    """An in-memory queue returned by every `get_queue()` the API routes call."""
+    from app.routes import admin, caregiver
+
+    recording = RecordingQueue()
+    monkeypatch.setattr(admin, "get_queue", lambda: recording)
+    monkeypatch.setattr(caregiver, "get_queue", lambda: recording)
+    return recording
+
+
+class FakeJob:
+    """Stands in for a running SAQ job: `update` keeps progress and meta, as a retry would see them."""
+
+    def __init__(self, function: str = "task") -> None:
+        self.function = function
+        self.meta: dict[str, Any] = {}
+        self.progress = 0.0
+        self.attempts = 1
+        self.retries = 1
+        self.retry_delay = 0.0
+        self.retry_backoff: bool | float = False
+        self.updates: list[dict[str, Any]] = []
+
+    async def update(self, **kwargs: Any) -> None:
+        self.updates.append(kwargs)
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    @property
+    def retryable(self) -> bool:
+        return self.retries > self.attempts
+
+
+@pytest.fixture
+def job() -> FakeJob:
+    """A job for a worker task's context (`{"job": job}`)."""
+    return FakeJob()
+
+
+class RecordingMailer:
+    """Records `send_batch` calls; the calls numbered in `defer_calls` raise EmailDeferredError instead."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+        self.attempted = 0
+        self.defer_calls: set[int] = set()
+
+    async def send_batch(self, *, recipients: list[Any], **kwargs: Any) -> int:
+        from app.services.email_governor import EmailDeferredError
+
+        self.attempted += 1
+        if self.attempted in self.defer_calls:
+            msg = "429 Too Many Requests"
+            raise EmailDeferredError(msg, retry_after=10)
+        self.calls.append({"recipients": recipients, **kwargs})
+        return len(recipients)
+
+
+@pytest.fixture
+def mailer(monkeypatch: pytest.MonkeyPatch) -> RecordingMailer:
+    """Replaces the worker's `email_service.send_batch`, recording each call."""
+    from app import worker
+
+    recording = RecordingMailer()
+    monkeypatch.setattr(worker.email_service, "send_batch", recording.send_batch)
+    return recording
+
+
+@pytest_asyncio.fixture
+async def listening() -> AsyncIterator[Callable[[Any], Awaitable[asyncio.Task[None]]]]:
+    """Starts a `CacheEvents` subscriber, returning once it is subscribed; all are stopped after the test."""
+    listeners: list[asyncio.Task[None]] = []
+
+    async def listen(events: Any) -> asyncio.Task[None]:
+        connected = asyncio.Event()
+        events.subscribe("subscribed", lambda _: None, on_connect=connected.set)
+        listeners.append(asyncio.create_task(events.listen()))
+        async with asyncio.timeout(1):
+            await connected.wait()
+        return listeners[-1]
+
+    yield listen
+    for listener in listeners:
+        listener.cancel()
+    await asyncio.gather(*listeners, return_exceptions=True)
@@ -0,0 +1,150 @@
+"""Background occurrence generation jobs and their status endpoint."""
+
+from typing import Any, cast
+
+import pytest
+from litestar.testing import AsyncTestClient
+from saq.job import Status
+
+from app.admin_auth import create_admin_session
+from app.db import async_session_factory
+from app.main import app
+from app.services.cache_events import cache_events
+from app.services.calendar_feeds import CALENDAR_FEEDS_CLEARED_EVENT, calendar_feed_cache
+from app.worker import WorkerContext, materialise_occurrences_task
+
+pytestmark = [pytest.mark.integration, pytest.mark.endpoints]
+
+
+def _headers() -> dict[str, str]:
+    token = create_admin_session(email="admin@example.com", provider="google", provider_user_id="1")
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_returns_the_running_job(seeded, queue):
+    block_id = str(seeded["blocks"][0])
+    async with AsyncTestClient(app) as client:
+        first = await client.post("/api/v1/admin/occurrences/generate", json={"blockId": block_id}, headers=_headers())
+        second = await client.post("/api/v1/admin/occurrences/generate", json={"blockId": block_id}, headers=_headers())
+
+    assert first.status_code == second.status_code == 202
+    assert first.json()["key"] == second.json()["key"] == f"materialise-occurrences-block-{block_id}"
+    (job,) = queue.enqueued("materialise_occurrences_task")
+    assert job.kwargs == {"block_id": block_id}
+
+
+@pytest.mark.asyncio
+async def test_finished_job_can_be_started_again(seeded, queue):
+    async with AsyncTestClient(app) as client:
+        first = await client.post("/api/v1/admin/occurrences/generate", json={"year": 2026}, headers=_headers())
+        queue.jobs[first.json()["key"]].status = Status.COMPLETE
+
+        second = await client.post("/api/v1/admin/occurrences/generate", json={"year": 2026}, headers=_headers())
+
+    assert second.status_code == 202
+    assert second.json()["status"] == "queued"
+    assert queue.jobs[second.json()["key"]].kwargs == {"year": 2026}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [{}, {"year": 2026, "blockId": "0b7c1c1e-6a51-4c8f-9b8e-6f1f0e3c2d1a"}],
+)
+async def test_exactly_one_of_year_or_block_is_required(db_schema, queue, body):
+    async with AsyncTestClient(app) as client:
+        response = await client.post("/api/v1/admin/occurrences/generate", json=body, headers=_headers())
+
+    assert response.status_code == 400
+    assert queue.jobs == {}
+
+
+@pytest.mark.asyncio
+async def test_unknown_block_is_not_found(db_schema, queue):
+    async with AsyncTestClient(app) as client:
+        response = await client.post(
+            "/api/v1/admin/occurrences/generate",
+            json={"blockId": "0b7c1c1e-6a51-4c8f-9b8e-6f1f0e3c2d1a"},
+            headers=_headers(),
+        )
+
+    assert response.status_code == 404
+    assert queue.jobs == {}
+
+
+@pytest.mark.asyncio
+async def test_job_status_reports_progress_and_result(seeded, queue):
+    async with AsyncTestClient(app) as client:
+        started = await client.post("/api/v1/admin/occurrences/generate", json={"year": 2026}, headers=_headers())
+        key = started.json()["key"]
+
+        job = queue.jobs[key]
+        job.status = Status.ACTIVE
+        job.progress = 0.5
+        job.meta = {"sessions": 3}
+        running = (await client.get(f"/api/v1/admin/jobs/{key}", headers=_headers())).json()
+
+        job.status = Status.COMPLETE
+        job.progress = 1.0
+        job.result = {"created": 30, "skippedExisting": 0}
+        done = (await client.get(f"/api/v1/admin/jobs/{key}", headers=_headers())).json()
+
+        missing = await client.get("/api/v1/admin/jobs/no-such-job", headers=_headers())
+
+    assert (running["status"], running["progress"], running["meta"]) == ("active", 0.5, {"sessions": 3})
+    assert (done["status"], done["result"]) == ("complete", {"created": 30, "skippedExisting": 0})
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_generating_occurrences_clears_cached_feeds_in_every_process(seeded, job, monkeypatch):
+    session_id = seeded["sessions"][0]
+    published: list[str] = []
+    publish = cache_events.publish
+
+    async def recording_publish(kind: str, **data: Any) -> None:
+        published.append(kind)
+        await publish(kind, **data)
+
+    monkeypatch.setattr(cache_events, "publish", recording_publish)
+    ctx = cast("WorkerContext", {"db_sessionmaker": async_session_factory, "job": job})
+    async with AsyncTestClient(app) as client:
+        assert (await client.get(f"/api/v1/session/{session_id}/calendar.ics")).status_code == 200
+        assert calendar_feed_cache.get(session_id, "public") is not None
+
+        result = await materialise_occurrences_task(ctx, block_id=str(seeded["blocks"][0]))
+
+        assert result["created"] > 0
+        assert published == [CALENDAR_FEEDS_CLEARED_EVENT]
+        assert calendar_feed_cache.get(session_id, "public") is None
+
+        # Nothing new the second time, so the cached feeds stay
+        await client.get(f"/api/v1/session/{session_id}/calendar.ics")
+        result = await materialise_occurrences_task(ctx, block_id=str(seeded["blocks"][0]))
+
+    assert result["created"] == 0
+    assert published == [CALENDAR_FEEDS_CLEARED_EVENT]
+    assert calendar_feed_cache.get(session_id, "public") is not None
+
+
+@pytest.mark.asyncio
+async def test_job_status_requires_an_admin(db_schema, queue):
+    async with AsyncTestClient(app) as client:
+        response = await client.get("/api/v1/admin/jobs/anything")
+
+    assert response.status_code == 401
+
+
+def test_job_endpoints_use_a_declared_openapi_tag():
+    schema = app.openapi_schema
+    declared = {tag.name for tag in schema.tags or []}
+    assert schema.paths is not None
+    operations = [
+        schema.paths["/api/v1/admin/jobs/{job_key}"].get,
+        schema.paths["/api/v1/admin/occurrences/generate"].post,
+    ]
+
+    for operation in operations:
+        assert operation is not None
+        assert set(operation.tags or []) <= declared
@@ -0,0 +1,95 @@
+"""Live availability counts and their process-local cache."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.db import async_session_factory, on_commit
+from app.models import Caregiver, Child, Session, Signup
+from app.services.availability import availability_cache, load_availability, spots_left
+
+pytestmark = [pytest.mark.integration, pytest.mark.services]
+
+
+async def _add_signups(db, session_id, statuses: list[str], tag: str = "extra") -> None:
+    for n, status in enumerate(statuses):
+        caregiver = Caregiver(email=f"{tag}-{session_id}-{n}@example.com", name=f"Extra {n}")
+        db.add(caregiver)
+        await db.flush()
+        child = Child(caregiver_id=caregiver.id, name=f"Extra child {n}", date_of_birth=date(2016, 1, 1))
+        db.add(child)
+        await db.flush()
+        db.add(Signup(session_id=session_id, caregiver_id=caregiver.id, child_id=child.id, status=status))
+
+
+@pytest.mark.asyncio
+async def test_only_confirmed_signups_take_spots(seeded):
+    first, second, _third = seeded["sessions"]
+    async with async_session_factory() as db:
+        await _add_signups(db, first, ["pending", "waitlisted", "withdrawn"])
+        await _add_signups(db, second, ["confirmed"] * 5)
+        await db.commit()
+
+        availability = await load_availability(db)
+
+    assert availability[str(first)].spots_left == 5
+    assert not availability[str(first)].waitlist
+    # Full sessions are waitlisted even without the waitlist flag
+    assert availability[str(second)].spots_left == 0
+    assert availability[str(second)].waitlist
+
+
+@pytest.mark.asyncio
+async def test_archived_sessions_are_counted_only_when_asked_for(seeded):
+    archived = seeded["sessions"][0]
+    async with async_session_factory() as db:
+        await db.execute(update(Session).where(Session.id == archived).values(archived=True))
+        await db.commit()
+
+        assert str(archived) not in await load_availability(db)
+        assert str(archived) not in await load_availability(db, [archived])
+        included = await load_availability(db, [archived], include_archived=True)
+        assert included[str(archived)].spots_left == 5
+        # Signup checks still see the archived session's confirmed signups
+        assert await spots_left(db, archived) == 5
+
+
+@pytest.mark.asyncio
+async def test_sessions_without_signups_have_full_capacity(seeded):
+    session_id = seeded["sessions"][0]
+    async with async_session_factory() as db:
+        signups = (await db.execute(select(Signup).where(Signup.session_id == session_id))).scalars().all()
+        for signup in signups:
+            await db.delete(signup)
+        await db.commit()
+
+        assert await spots_left(db, session_id) == 10
+
+
+@pytest.mark.asyncio
+async def test_cache_is_dropped_only_when_the_write_commits(seeded, monkeypatch):
+    monkeypatch.setattr(settings, "public_availability_ttl_seconds", 3600)
+    session_id = seeded["sessions"][0]
+    key = str(session_id)
+
+    async with async_session_factory() as db:
+        assert (await availability_cache.get(db))[key].spots_left == 5
+
+        # A write that does not register the callback leaves the cached counts stale
+        await _add_signups(db, session_id, ["confirmed"])
+        await db.commit()
+        assert (await availability_cache.get(db))[key].spots_left == 5
+
+        # Callbacks registered in a rolled-back transaction are discarded
+        on_commit(db, availability_cache.invalidate)
+        await db.rollback()
+        assert (await availability_cache.get(db))[key].spots_left == 5
+
+        await _add_signups(db, session_id, ["confirmed", "confirmed"], tag="later")
+        on_commit(db, availability_cache.invalidate)
+        assert (await availability_cache.get(db))[key].spots_left == 5
+        await db.commit()
+
+        assert (await availability_cache.get(db))[key].spots_left == 2
@@ -0,0 +1,159 @@
+"""The daily batch email cron: which signups are due a notice, and resuming after a deferral."""
+
+import time as time_module
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from typing import cast
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import select, update
+
+from app import worker
+from app.db import async_session_factory
+from app.models import Caregiver, Child, SessionOccurrence, Signup
+from app.services.email_governor import EmailDeferredError
+from app.worker import WorkerContext, process_batch_emails_task
+
+pytestmark = [pytest.mark.integration, pytest.mark.email]
+
+TZ = ZoneInfo("Pacific/Auckland")
+
+
+async def _start_first_occurrence(session_id, days_ahead: int) -> None:
+    """Move a session's weekly occurrences so the first starts `days_ahead` local days from today."""
+    first = datetime.combine(datetime.now(TZ).date() + timedelta(days=days_ahead), time(15, 30), tzinfo=TZ)
+    async with async_session_factory() as db:
+        occurrences = (
+            await db.scalars(
+                select(SessionOccurrence)
+                .where(SessionOccurrence.session_id == session_id)
+                .order_by(SessionOccurrence.starts_at)
+            )
+        ).all()
+        for week, occ in enumerate(occurrences):
+            occ.starts_at = (first + timedelta(weeks=week)).astimezone(UTC)
+            occ.ends_at = occ.starts_at + timedelta(hours=1, minutes=30)
+        await db.commit()
+
+
+def _ctx(job=None) -> WorkerContext:
+    return cast("WorkerContext", {"db_sessionmaker": async_session_factory, "job": job})
+
+
+@pytest.mark.asyncio
+async def test_notices_go_to_confirmed_signups_of_sessions_first_starting_in_a_window(seeded, mailer):
+    tomorrow, in_two_weeks, next_week = seeded["sessions"]
+    await _start_first_occurrence(tomorrow, 1)
+    await _start_first_occurrence(in_two_weeks, 14)
+    # Its second week falls in the 2-week window, but only a session's first occurrence counts
+    await _start_first_occurrence(next_week, 7)
+    async with async_session_factory() as db:
+        waitlisted = await db.scalar(select(Signup.id).where(Signup.session_id == tomorrow).limit(1))
+        await db.execute(update(Signup).where(Signup.id == waitlisted).values(status="waitlisted"))
+        await db.commit()
+
+    result = await process_batch_emails_task(_ctx())
+
+    assert result["success"] is True
+    assert result["notices"] == 2
+    sent = {call["template_name"]: call for call in mailer.calls}
+    assert set(sent) == {"session_reminder", "session_term_info"}
+
+    reminder = sent["session_reminder"]
+    assert reminder["session_name"] == "Robotics Club 0"
+    caregivers = [r.email for r in reminder["recipients"] if r.email != "venue@example.com"]
+    assert len(caregivers) == 4
+    assert all(email.startswith(f"{tomorrow}-") for email in caregivers)
+
+    term_info = sent["session_term_info"]
+    assert term_info["session_name"] == "Robotics Club 1"
+    assert term_info["term_summary"] == "Term 1"
+    assert len(term_info["recipients"]) == 6  # five caregivers and the venue contact
+
+
+@pytest.mark.asyncio
+async def test_each_due_session_is_one_batch_naming_siblings_together(seeded, mailer):
+    first, second, _later = seeded["sessions"]
+    await _start_first_occurrence(first, 1)
+    await _start_first_occurrence(second, 1)
+    async with async_session_factory() as db:
+        caregiver = await db.scalar(select(Caregiver).where(Caregiver.email == f"{first}-0@example.com"))
+        assert caregiver is not None
+        sibling = Child(caregiver_id=caregiver.id, name="Sibling", date_of_birth=date(2017, 1, 1))
+        db.add(sibling)
+        await db.flush()
+        db.add(Signup(session_id=first, caregiver_id=caregiver.id, child_id=sibling.id, status="confirmed"))
+        await db.commit()
+
+    result = await process_batch_emails_task(_ctx())
+
+    assert result["notices"] == 2
+    assert [call["template_name"] for call in mailer.calls] == ["session_reminder", "session_reminder"]
+    by_session = {call["session_name"]: {r.email: r.variables for r in call["recipients"]} for call in mailer.calls}
+    assert set(by_session) == {"Robotics Club 0", "Robotics Club 1"}
+    for recipients in by_session.values():
+        assert len(recipients) == 6  # five caregivers and the venue contact, one message each
+    assert by_session["Robotics Club 0"][f"{first}-0@example.com"]["child_name"] == "Child 0 and Sibling"
+    assert by_session["Robotics Club 0"]["venue@example.com"]["child_name"] == "your child"
+
+
+@pytest.fixture
+def new_york_system_time(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Run with a non-UTC system zone, where a naive datetime's `astimezone` is hours off."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time_module.tzset()
+    yield
+    monkeypatch.undo()
+    time_module.tzset()
+
+
+@pytest.mark.asyncio
+async def test_first_occurrence_read_back_naive_is_treated_as_utc(seeded, mailer, new_york_system_time):
+    session_id = seeded["sessions"][0]
+    await _start_first_occurrence(session_id, 14)
+    # 8:30pm local: read as New York time it would land on the next local day, as a 1:30am start
+    evening = datetime.combine(datetime.now(TZ).date() + timedelta(days=14), time(20, 30), tzinfo=TZ)
+    async with async_session_factory() as db:
+        occ = await db.scalar(
+            select(SessionOccurrence)
+            .where(SessionOccurrence.session_id == session_id)
+            .order_by(SessionOccurrence.starts_at)
+            .limit(1)
+        )
+        assert occ is not None
+        occ.starts_at = evening.astimezone(UTC)
+        occ.ends_at = occ.starts_at + timedelta(hours=1)
+        await db.commit()
+
+    await process_batch_emails_task(_ctx())
+
+    (call,) = mailer.calls
+    assert call["template_name"] == "session_term_info"
+    assert call["first_session_date"].endswith("8:30PM")
+
+
+@pytest.mark.asyncio
+async def test_deferred_batch_resumes_after_the_last_recipient_sent(seeded, mailer, job, monkeypatch):
+    session_id = seeded["sessions"][0]
+    await _start_first_occurrence(session_id, 1)
+    monkeypatch.setattr(worker.email_service, "max_recipients", 2)
+    mailer.defer_calls = {2}
+
+    with pytest.raises(EmailDeferredError):
+        await process_batch_emails_task(_ctx(job))
+
+    # Handed back to SAQ with a delay, and the first request's recipients recorded
+    assert job.retries > job.attempts
+    assert job.retry_delay >= 10
+    assert len(mailer.calls) == 1
+    assert job.meta["sentUpTo"] == {f"reminder:{session_id}": mailer.calls[0]["recipients"][-1].email}
+
+    job.attempts += 1
+    result = await process_batch_emails_task(_ctx(job))
+
+    assert result["success"] is True
+    sent = [r.email for call in mailer.calls for r in call["recipients"]]
+    assert len(sent) == 6  # five caregivers and the venue contact, each once
+    assert sent == sorted(set(sent))
+    assert [len(call["recipients"]) for call in mailer.calls] == [2, 2, 2]
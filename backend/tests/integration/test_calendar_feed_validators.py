@@ -0,0 +1,209 @@
+"""Calendar feed `Last-Modified` follows every change to the feed's content."""
+
+from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+import pytest
+from litestar.testing import AsyncTestClient
+from sqlalchemy import select, update
+
+from app.admin_auth import create_admin_session
+from app.db import async_session_factory
+from app.main import app
+from app.models import ExclusionDate, Session, SessionBlock, SessionBlockLink, SessionLocation, SessionOccurrence
+from app.services import calendar_feeds
+from app.services.calendar_feeds import FEED_TZ, calendar_feed_cache, feed_cutoff
+
+pytestmark = [pytest.mark.integration, pytest.mark.endpoints]
+
+STALE = datetime(2020, 1, 1, tzinfo=UTC)
+
+
+def _admin_headers() -> dict[str, str]:
+    token = create_admin_session(email="admin@example.com", provider="google", provider_user_id="1")
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _age_everything() -> None:
+    """Move every row's updated_at far into the past, so any later change is visible."""
+    async with async_session_factory() as db:
+        for model in (Session, SessionLocation, SessionOccurrence, SessionBlock, SessionBlockLink, ExclusionDate):
+            await db.execute(update(model).values(updated_at=STALE))
+        await db.commit()
+    calendar_feed_cache.clear()
+
+
+async def _feed(client: AsyncTestClient, session_id, *, compact: bool = False) -> tuple[datetime, str, str]:
+    response = await client.get(f"/api/v1/session/{session_id}/calendar.ics", params={"compact": compact})
+    assert response.status_code == 200
+    return parsedate_to_datetime(response.headers["last-modified"]), response.headers["etag"], response.text
+
+
+async def _first_start(session_id) -> datetime:
+    async with async_session_factory() as db:
+        starts = await db.scalar(
+            select(SessionOccurrence.starts_at)
+            .where(SessionOccurrence.session_id == session_id)
+            .order_by(SessionOccurrence.starts_at)
+        )
+    assert starts is not None
+    return starts if starts.tzinfo is not None else starts.replace(tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_data_keeps_last_modified(seeded):
+    session_id = seeded["sessions"][0]
+    await _age_everything()
+    async with AsyncTestClient(app) as client:
+        last_modified, etag, _body = await _feed(client, session_id)
+        calendar_feed_cache.clear()
+
+        assert last_modified == STALE
+        assert await _feed(client, session_id) == (last_modified, etag, _body)
+
+
+@pytest.mark.asyncio
+async def test_deleting_occurrences_moves_last_modified(seeded):
+    session_id, block_id = seeded["sessions"][0], seeded["blocks"][0]
+    first_day = (await _first_start(session_id)).astimezone(FEED_TZ).date()
+    async with async_session_factory() as db:
+        # A one-day block on an excluded date: regenerating leaves the session with no occurrences
+        await db.execute(
+            update(SessionBlock).where(SessionBlock.id == block_id).values(start_date=first_day, end_date=first_day)
+        )
+        db.add(ExclusionDate(year=first_day.year, exclusion_date=first_day, reason="Closed"))
+        await db.commit()
+    await _age_everything()
+
+    async with AsyncTestClient(app) as client:
+        before, _etag, _body = await _feed(client, session_id)
+        response = await client.post(
+            f"/api/v1/admin/sessions/{session_id}/occurrences/regenerate",
+            params={"delete_auto_generated": True},
+            headers=_admin_headers(),
+        )
+        assert response.status_code == 200
+        assert response.json()["deleted"] == 10
+        assert response.json()["created"] == 0
+
+        after, _etag, body = await _feed(client, session_id)
+
+    assert before == STALE
+    assert after > STALE
+    assert "BEGIN:VEVENT" not in body
+
+
+@pytest.mark.asyncio
+async def test_block_edit_moves_compact_feed_last_modified(seeded):
+    session_id, block_id = seeded["sessions"][0], seeded["blocks"][0]
+    first_day = (await _first_start(session_id)).astimezone(FEED_TZ).date()
+    await _age_everything()
+
+    async with AsyncTestClient(app) as client:
+        before, etag, _body = await _feed(client, session_id, compact=True)
+        response = await client.patch(
+            f"/api/v1/admin/blocks/{block_id}",
+            json={"endDate": (first_day + timedelta(weeks=4)).isoformat()},
+            headers=_admin_headers(),
+        )
+        assert response.status_code == 200
+
+        # The cached render was dropped with the block edit
+        after, new_etag, _body = await _feed(client, session_id, compact=True)
+
+    assert before == STALE
+    assert after > STALE
+    assert new_etag != etag
+
+
+@pytest.mark.asyncio
+async def test_unlinking_blocks_moves_last_modified(seeded):
+    session_id = seeded["sessions"][0]
+    await _age_everything()
+
+    async with AsyncTestClient(app) as client:
+        before, _etag, _body = await _feed(client, session_id, compact=True)
+        response = await client.patch(
+            f"/api/v1/admin/sessions/{session_id}", json={"blockIds": []}, headers=_admin_headers()
+        )
+        assert response.status_code == 200
+
+        after, _etag, _body = await _feed(client, session_id, compact=True)
+
+    assert before == STALE
+    assert after > STALE
+
+
+@pytest.mark.asyncio
+async def test_exclusion_moves_last_modified_once_occurrences_are_regenerated(seeded):
+    session_id = seeded["sessions"][0]
+    excluded = (await _first_start(session_id)).astimezone(FEED_TZ).date() + timedelta(weeks=2)
+    await _age_everything()
+
+    async with AsyncTestClient(app) as client:
+        response = await client.post(
+            "/api/v1/admin/exclusions", json={"date": excluded.isoformat()}, headers=_admin_headers()
+        )
+        assert response.status_code == 201
+
+        # An exclusion alone does not change any feed's content
+        before, _etag, _body = await _feed(client, session_id)
+        assert before == STALE
+
+        response = await client.post(
+            f"/api/v1/admin/sessions/{session_id}/occurrences/regenerate",
+            params={"delete_auto_generated": True},
+            headers=_admin_headers(),
+        )
+        assert response.status_code == 200
+        assert response.json()["deleted"] == 10
+
+        after, _etag, body = await _feed(client, session_id)
+
+    assert after > STALE
+    assert f":{excluded:%Y%m%d}T" not in body
+
+
+@pytest.mark.asyncio
+async def test_exclusion_writes_drop_cached_feeds(seeded):
+    session_id = seeded["sessions"][0]
+    excluded = (await _first_start(session_id)).astimezone(FEED_TZ).date() + timedelta(weeks=2)
+
+    async with AsyncTestClient(app) as client:
+        await _feed(client, session_id, compact=True)
+        assert calendar_feed_cache.get(session_id, "public:compact") is not None
+
+        response = await client.post(
+            "/api/v1/admin/exclusions", json={"date": excluded.isoformat()}, headers=_admin_headers()
+        )
+        assert response.status_code == 201
+        assert calendar_feed_cache.get(session_id, "public:compact") is None
+
+        await _feed(client, session_id, compact=True)
+        response = await client.delete(f"/api/v1/admin/exclusions/{response.json()['id']}", headers=_admin_headers())
+        assert response.status_code == 204
+        assert calendar_feed_cache.get(session_id, "public:compact") is None
+
+
+@pytest.mark.asyncio
+async def test_cutoff_rollover_moves_last_modified(seeded, monkeypatch):
+    session_id = seeded["sessions"][0]
+    first_day = (await _first_start(session_id)).astimezone(FEED_TZ).date()
+    await _age_everything()
+
+    async with AsyncTestClient(app) as client:
+        before, etag, body = await _feed(client, session_id)
+
+        # The day the first occurrence falls behind the cutoff
+        rolled_over = datetime.combine(first_day + timedelta(days=8), datetime.min.time(), tzinfo=FEED_TZ)
+        later = rolled_over + timedelta(hours=9)
+        assert feed_cutoff(later).date() > first_day
+        monkeypatch.setattr(calendar_feeds, "feed_cutoff", lambda now=None: feed_cutoff(now or later))
+        calendar_feed_cache.clear()
+
+        after, new_etag, new_body = await _feed(client, session_id)
+
+    assert before == STALE
+    assert after == rolled_over
+    assert new_etag != etag
+    assert new_body.count("BEGIN:VEVENT") == body.count("BEGIN:VEVENT") - 1
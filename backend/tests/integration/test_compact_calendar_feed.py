@@ -0,0 +1,59 @@
+"""Compact (RRULE) calendar feeds for generated term occurrences."""
+
+import pytest
+from litestar.testing import AsyncTestClient
+from sqlalchemy import select
+
+from app.admin_auth import create_admin_session
+from app.db import async_session_factory
+from app.main import app
+from app.models import SessionOccurrence
+
+pytestmark = [pytest.mark.integration, pytest.mark.endpoints]
+
+
+@pytest.mark.asyncio
+async def test_generated_term_is_one_series_with_cancelled_override(seeded, queue):
+    session_id = seeded["sessions"][0]
+    token = create_admin_session(email="admin@example.com", provider="google", provider_user_id="1")
+    headers = {"Authorization": f"Bearer {token}"}
+    feed_url = f"/api/v1/session/{session_id}/calendar.ics"
+
+    async with AsyncTestClient(app) as client:
+        # Replace the seeded occurrences with ones on the session's weekday and time
+        response = await client.post(
+            f"/api/v1/admin/sessions/{session_id}/occurrences/regenerate",
+            params={"delete_auto_generated": True},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        created = response.json()["created"]
+        assert created > 1
+
+        compact = (await client.get(feed_url, params={"compact": True})).text
+        assert compact.count("BEGIN:VEVENT") == 1
+        assert compact.count("RRULE:FREQ=WEEKLY") == 1
+        assert "EXDATE" not in compact
+        full = (await client.get(feed_url)).text
+        assert full.count("BEGIN:VEVENT") == created
+
+        async with async_session_factory() as db:
+            occurrence_id = await db.scalar(
+                select(SessionOccurrence.id)
+                .where(SessionOccurrence.session_id == session_id)
+                .order_by(SessionOccurrence.starts_at.desc())
+            )
+        response = await client.patch(
+            f"/api/v1/admin/occurrences/{occurrence_id}/cancel",
+            json={"cancelled": True, "cancellationReason": "Venue closed"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+        compact = (await client.get(feed_url, params={"compact": True})).text
+
+    assert compact.count("BEGIN:VEVENT") == 2
+    assert compact.count("RECURRENCE-ID;TZID=Pacific/Auckland:") == 1
+    assert "STATUS:CANCELLED" in compact
+    # Caregivers are told about the cancellation
+    assert len(queue.enqueued("send_session_notice_task")) == 1
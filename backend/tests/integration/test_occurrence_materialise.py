@@ -0,0 +1,157 @@
+"""Re-running schedule materialisation, and migration 0006's merge of duplicate occurrences."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import func, inspect, select, text, update
+
+from app.db import async_session_factory, engine
+from app.models import AttendanceAuditLog, AttendanceRecord, Session, SessionOccurrence, Signup
+from app.services.schedule import materialise_session_occurrences, materialise_term_occurrences
+
+pytestmark = [pytest.mark.integration, pytest.mark.services]
+
+MIGRATION = Path(__file__).parents[2] / "app" / "alembic" / "versions" / "0006_unique_occurrence_start.py"
+
+
+async def _occurrences(session_id) -> dict:
+    async with async_session_factory() as db:
+        rows = await db.execute(
+            select(SessionOccurrence.id, SessionOccurrence.starts_at, SessionOccurrence.cancelled).where(
+                SessionOccurrence.session_id == session_id
+            )
+        )
+        return {row.id: (row.starts_at, row.cancelled) for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_materialising_twice_inserts_nothing_and_keeps_rows(seeded):
+    session_id = seeded["sessions"][0]
+    async with async_session_factory() as db:
+        session = await db.get(Session, session_id)
+        assert session is not None
+        first = await materialise_session_occurrences(db, session)
+        await db.commit()
+    assert first.created > 0
+
+    generated = await _occurrences(session_id)
+    cancelled_id = next(iter(generated))
+    async with async_session_factory() as db:
+        await db.execute(update(SessionOccurrence).where(SessionOccurrence.id == cancelled_id).values(cancelled=True))
+        await db.commit()
+
+        session = await db.get(Session, session_id)
+        assert session is not None
+        second = await materialise_session_occurrences(db, session)
+        batch = await materialise_term_occurrences(db, block_id=seeded["blocks"][0])
+        await db.commit()
+
+    assert (second.created, second.skipped_existing, second.deleted) == (0, first.created, 0)
+    assert batch.created == 2 * first.created  # Only the two other sessions were missing theirs
+    after = await _occurrences(session_id)
+    # Same rows (ids included), and the cancellation survived
+    assert after.keys() == generated.keys()
+    assert after[cancelled_id][1] is True
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("migration_0006", MIGRATION)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _upgrade(connection) -> None:
+    migration = _load_migration()
+    with Operations.context(MigrationContext.configure(connection)):
+        migration.upgrade()
+
+
+def _index_names(connection) -> set[str | None]:
+    return {index["name"] for index in inspect(connection).get_indexes("session_occurrences")}
+
+
+@pytest.mark.asyncio
+async def test_migration_0006_merges_duplicates_before_the_unique_index(seeded):
+    session_id = seeded["sessions"][0]
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX uq_session_occurrences_session_starts"))
+
+    async with async_session_factory() as db:
+        seeded_rows = (
+            await db.scalars(
+                select(SessionOccurrence)
+                .where(SessionOccurrence.session_id == session_id)
+                .order_by(SessionOccurrence.starts_at)
+            )
+        ).all()
+        alone, with_attendance, conflicting = seeded_rows[:3]
+        first_child, second_child = (
+            await db.scalars(select(Signup.child_id).where(Signup.session_id == session_id).limit(2))
+        ).all()
+
+        def duplicate(occurrence: SessionOccurrence) -> SessionOccurrence:
+            return SessionOccurrence(
+                session_id=session_id,
+                starts_at=occurrence.starts_at,
+                ends_at=occurrence.ends_at,
+                auto_generated=False,
+            )
+
+        manual_alone, manual_plain, manual_conflicting = (
+            duplicate(alone),
+            duplicate(with_attendance),
+            duplicate(conflicting),
+        )
+        db.add_all([manual_alone, manual_plain, manual_conflicting])
+        await db.flush()
+        db.add_all(
+            [
+                # Attendance outranks a manual row
+                AttendanceRecord(occurrence_id=with_attendance.id, child_id=first_child, status="present"),
+                # Both rows have attendance: the manual one is kept, its record for the child wins
+                AttendanceRecord(occurrence_id=conflicting.id, child_id=first_child, status="present"),
+                AttendanceRecord(occurrence_id=conflicting.id, child_id=second_child, status="present"),
+                AttendanceRecord(occurrence_id=manual_conflicting.id, child_id=first_child, status="absent_known"),
+                AttendanceAuditLog(occurrence_id=conflicting.id, child_id=first_child, new_status="present"),
+            ]
+        )
+        await db.commit()
+        expected_kept = {manual_alone.id, with_attendance.id, manual_conflicting.id}
+        merged = {alone.id, manual_plain.id, conflicting.id}
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade)
+        assert "uq_session_occurrences_session_starts" in await conn.run_sync(_index_names)
+
+    async with async_session_factory() as db:
+        remaining = set(
+            await db.scalars(select(SessionOccurrence.id).where(SessionOccurrence.session_id == session_id))
+        )
+        assert expected_kept <= remaining
+        assert not merged & remaining
+        assert len(remaining) == len(seeded_rows)
+
+        attendance = {
+            (record.occurrence_id, record.child_id): record.status
+            for record in await db.scalars(select(AttendanceRecord))
+        }
+        assert attendance == {
+            (with_attendance.id, first_child): "present",
+            (manual_conflicting.id, first_child): "absent_known",
+            (manual_conflicting.id, second_child): "present",
+        }
+        audit_occurrences = set(await db.scalars(select(AttendanceAuditLog.occurrence_id)))
+        assert audit_occurrences == {manual_conflicting.id}
+
+        # Re-running finds nothing left to merge
+        before = await db.scalar(select(func.count()).select_from(SessionOccurrence))
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade)
+    async with async_session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(SessionOccurrence)) == before
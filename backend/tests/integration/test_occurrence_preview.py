@@ -0,0 +1,29 @@
+"""Occurrence generation preview against what generation actually writes."""
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+from app.admin_auth import create_admin_session
+from app.main import app
+
+pytestmark = [pytest.mark.integration, pytest.mark.endpoints]
+
+
+@pytest.mark.asyncio
+async def test_preview_marks_generated_occurrences_as_existing(seeded):
+    session_id = seeded["sessions"][0]
+    token = create_admin_session(email="admin@example.com", provider="google", provider_user_id="1")
+    headers = {"Authorization": f"Bearer {token}"}
+    base = f"/api/v1/admin/sessions/{session_id}/occurrences"
+
+    async with AsyncTestClient(app) as client:
+        before = (await client.get(f"{base}/preview", headers=headers)).json()
+        assert before
+
+        response = await client.post(f"{base}/generate", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["created"] == sum(not occ["exists"] for occ in before)
+
+        after = (await client.get(f"{base}/preview", headers=headers)).json()
+        assert [occ["startsAt"] for occ in after] == [occ["startsAt"] for occ in before]
+        assert all(occ["exists"] for occ in after)
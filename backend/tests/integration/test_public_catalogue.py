@@ -0,0 +1,37 @@
+"""Conditional requests for the cached public catalogue."""
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+from app.main import app
+
+pytestmark = [pytest.mark.integration, pytest.mark.endpoints]
+
+
+@pytest.mark.asyncio
+async def test_gzip_revalidation_returns_the_gzip_etag(seeded):
+    async with AsyncTestClient(app) as client:
+        response = await client.get("/api/v1/sessions", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        etag = response.headers["etag"]
+        assert etag.endswith('-gzip"')
+
+        revalidated = await client.get("/api/v1/sessions", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_identity_revalidation_returns_the_identity_etag(seeded):
+    async with AsyncTestClient(app) as client:
+        response = await client.get("/api/v1/sessions", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        etag = response.headers["etag"]
+
+        revalidated = await client.get(
+            "/api/v1/sessions", headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
@@ -0,0 +1,53 @@
+"""Statement counts for the public read endpoints.
+
+Public endpoints read column projections (`sessions_public` and plain column
+selects), never the `Session` entity. Selecting `Session` would pull its selectin
+`signups`, `occurrences` and `block_links` collections and add statements here.
+"""
+
+import pytest
+from litestar.testing import AsyncTestClient
+
+from app.main import app
+
+pytestmark = [pytest.mark.integration, pytest.mark.endpoints]
+
+
+@pytest.mark.asyncio
+async def test_catalogue_rebuild_reads_view_and_block_names(seeded, statements):
+    async with AsyncTestClient(app) as client:
+        statements.clear()
+        response = await client.get("/api/v1/sessions")
+        assert response.status_code == 200
+        assert sum(len(group["sessions"]) for group in response.json()) == 3
+        # sessions_public, then block names for those sessions
+        assert len(statements) == 2
+
+        statements.clear()
+        response = await client.get("/api/v1/sessions")
+        assert response.status_code == 200
+        assert statements == []  # served from the snapshot
+
+
+@pytest.mark.asyncio
+async def test_session_detail_reads_view_blocks_and_occurrences(seeded, statements):
+    session_id = seeded["sessions"][0]
+    async with AsyncTestClient(app) as client:
+        statements.clear()
+        response = await client.get(f"/api/v1/session/{session_id}")
+        assert response.status_code == 200
+        assert len(response.json()["occurrences_by_block"][0]["occurrences"]) == 10
+        # sessions_public row, block names, occurrence columns
+        assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_session_calendar_reads_session_and_occurrences(seeded, statements):
+    session_id = seeded["sessions"][0]
+    async with AsyncTestClient(app) as client:
+        statements.clear()
+        response = await client.get(f"/api/v1/session/{session_id}/calendar.ics")
+        assert response.status_code == 200
+        assert response.text.count("BEGIN:VEVENT") == 10
+        # session columns, occurrence columns
+        assert len(statements) == 2
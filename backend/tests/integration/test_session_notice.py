@@ -0,0 +1,95 @@
+"""The session notice fan-out job: batches, sibling names, progress and resuming after a deferral."""
+
+from datetime import date
+from typing import cast
+
+import pytest
+from sqlalchemy import select
+
+from app import worker
+from app.db import async_session_factory
+from app.models import Caregiver, Child, Signup
+from app.services.email_governor import EmailDeferredError
+from app.worker import WorkerContext, send_session_notice_task
+
+pytestmark = [pytest.mark.integration, pytest.mark.email]
+
+NOTICE = {"update_title": "Venue change", "update_message": "We're in room 2 this week."}
+
+
+def _ctx(job=None) -> WorkerContext:
+    return cast("WorkerContext", {"db_sessionmaker": async_session_factory, "job": job})
+
+
+async def _add_sibling(session_id) -> str:
+    """Sign a second child of the session's first caregiver up; returns that caregiver's email."""
+    email = f"{session_id}-0@example.com"
+    async with async_session_factory() as db:
+        caregiver = await db.scalar(select(Caregiver).where(Caregiver.email == email))
+        assert caregiver is not None
+        sibling = Child(caregiver_id=caregiver.id, name="Sibling", date_of_birth=date(2017, 1, 1))
+        db.add(sibling)
+        await db.flush()
+        db.add(Signup(session_id=session_id, caregiver_id=caregiver.id, child_id=sibling.id, status="confirmed"))
+        await db.commit()
+    return email
+
+
+@pytest.mark.asyncio
+async def test_notice_is_sent_in_batches_with_siblings_named_together(seeded, mailer, job, monkeypatch):
+    session_id = seeded["sessions"][0]
+    with_sibling = await _add_sibling(session_id)
+    monkeypatch.setattr(worker.email_service, "max_recipients", 2)
+
+    result = await send_session_notice_task(_ctx(job), session_id=str(session_id), **NOTICE)
+
+    assert result["success"] is True
+    assert result["recipients"] == 5
+    assert [len(call["recipients"]) for call in mailer.calls] == [2, 2, 1]
+    recipients = {r.email: r.variables for call in mailer.calls for r in call["recipients"]}
+    assert len(recipients) == 5  # one message per caregiver, not per signup
+    assert recipients[with_sibling] == {"caregiver_name": "Caregiver 0", "child_name": "Child 0 and Sibling"}
+    call = mailer.calls[0]
+    assert call["template_name"] == "session_change_alert"
+    assert call["subject"] == "Update: Robotics Club 0 - %recipient.child_name%"
+    assert call["update_title"] == "Venue change"
+
+    # Progress and the resume cursor are saved after every batch
+    assert [update["progress"] for update in job.updates] == [0.4, 0.8, 1.0]
+    assert job.meta["recipientsSent"] == job.meta["recipientsTotal"] == 5
+
+
+@pytest.mark.asyncio
+async def test_deferred_notice_resumes_after_the_saved_cursor(seeded, mailer, job, monkeypatch):
+    session_id = seeded["sessions"][0]
+    await _add_sibling(session_id)
+    monkeypatch.setattr(worker.email_service, "max_recipients", 2)
+    mailer.defer_calls = {2}
+
+    with pytest.raises(EmailDeferredError):
+        await send_session_notice_task(_ctx(job), session_id=str(session_id), **NOTICE)
+
+    # Handed back to SAQ after the first batch, with the cursor at its last caregiver
+    assert job.retryable
+    assert len(mailer.calls) == 1
+    first_batch = [r.email for r in mailer.calls[0]["recipients"]]
+    async with async_session_factory() as db:
+        last_sent = await db.scalar(select(Caregiver.id).where(Caregiver.email == first_batch[-1]))
+    assert job.meta["cursor"] == str(last_sent)
+    assert job.meta["recipientsSent"] == 2
+
+    job.attempts += 1
+    result = await send_session_notice_task(_ctx(job), session_id=str(session_id), **NOTICE)
+
+    sent = [r.email for call in mailer.calls for r in call["recipients"]]
+    assert len(sent) == len(set(sent)) == 5
+    assert result["recipients"] == result["accepted"] == 5
+    assert job.progress == 1.0
+
+
+@pytest.mark.asyncio
+async def test_notice_for_unknown_session_sends_nothing(db_schema, mailer, job):
+    result = await send_session_notice_task(_ctx(job), session_id="0b7c1c1e-6a51-4c8f-9b8e-6f1f0e3c2d1a", **NOTICE)
+
+    assert result["success"] is False
+    assert mailer.calls == []
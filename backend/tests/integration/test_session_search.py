@@ -0,0 +1,65 @@
+"""Session search through the public listing, and Postgres ranking against the in-process index."""
+
+import pytest
+from litestar.testing import AsyncTestClient
+from sqlalchemy import text
+
+from app.db import async_session_factory, engine
+from app.main import app
+from app.services.catalogue import catalogue_cache
+from app.services.search import _rank_in_postgres
+
+pytestmark = [pytest.mark.integration, pytest.mark.services]
+
+postgres_only = pytest.mark.skipif(engine.dialect.name != "postgresql", reason="pg_trgm ranking needs PostgreSQL")
+
+
+@pytest.mark.asyncio
+async def test_search_groups_typo_matches_by_region(seeded):
+    async with AsyncTestClient(app) as client:
+        response = await client.get("/api/v1/sessions", params={"q": "Hut Librry"})
+
+    assert response.status_code == 200
+    groups = response.json()
+    assert groups[0]["name"] == "Wellington"
+    assert groups[0]["sessions"][0]["id"] == str(seeded["sessions"][0])
+
+
+@pytest.mark.asyncio
+async def test_search_without_matches_is_empty(seeded):
+    async with AsyncTestClient(app) as client:
+        response = await client.get("/api/v1/sessions", params={"q": "swimming"})
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+async def _both_rankings(q: str) -> tuple[list[tuple[str, float]], list[tuple[str, float]]]:
+    async with async_session_factory() as db:
+        await db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        snapshot = await catalogue_cache.get(db)
+        in_process = [(session.id, score) for session, score in snapshot.search_index.search(q, 10)]
+        return in_process, await _rank_in_postgres(db, q, 10)
+
+
+@postgres_only
+@pytest.mark.asyncio
+@pytest.mark.parametrize("q", ["Robotics", "Hutt", "Auckland", "Main St", "Christchurch"])
+async def test_postgres_ranking_matches_the_in_process_index(seeded, q):
+    in_process, in_postgres = await _both_rankings(q)
+
+    assert in_postgres
+    assert [sid for sid, _score in in_postgres] == [sid for sid, _score in in_process]
+    for (_sid, pg_score), (_same, score) in zip(in_postgres, in_process, strict=True):
+        assert pg_score == pytest.approx(score)
+
+
+@postgres_only
+@pytest.mark.asyncio
+@pytest.mark.parametrize("q", ["Christchurh", "Wellingtn"])
+async def test_postgres_and_in_process_agree_on_typo_matches(seeded, q):
+    # pg_trgm scores the best-matching extent of the text, so only the order is compared
+    in_process, in_postgres = await _both_rankings(q)
+
+    assert in_postgres
+    assert [sid for sid, _score in in_postgres] == [sid for sid, _score in in_process]
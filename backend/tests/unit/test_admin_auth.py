@@ -0,0 +1,155 @@
+"""Admin token verification and revocation shared between API workers."""
+
+import asyncio
+import logging
+
+import fakeredis
+import pytest
+from litestar.exceptions import NotAuthorizedException
+
+from app import admin_auth
+from app.admin_auth import (
+    ADMIN_TOKEN_REVOKED_EVENT,
+    AdminTokenCache,
+    create_admin_session,
+    decode_admin_session,
+    revoke_admin_session,
+)
+from app.services.cache_events import CacheEvents
+
+pytestmark = [pytest.mark.unit, pytest.mark.auth, pytest.mark.security]
+
+
+class CountingRedis(fakeredis.FakeAsyncRedis):
+    """fakeredis, counting the GETs made through it."""
+
+    gets = 0
+
+    async def get(self, name):
+        self.gets += 1
+        return await super().get(name)
+
+
+class Worker:
+    """One API process's view of the shared Redis: its client, cache events and admin token cache."""
+
+    def __init__(self, server: fakeredis.FakeServer) -> None:
+        redis = self.redis = CountingRedis(server=server)
+        self.events = CacheEvents(use_redis=True, client=lambda: redis)
+        self.tokens = AdminTokenCache(maxsize=10, use_redis=True, client=lambda: redis, events=self.events)
+        self.revocations = asyncio.Event()
+        self.events.subscribe(ADMIN_TOKEN_REVOKED_EVENT, lambda _: self.revocations.set())
+
+    async def decode(self, token: str, monkeypatch: pytest.MonkeyPatch) -> admin_auth.AdminIdentity:
+        monkeypatch.setattr(admin_auth, "admin_token_cache", self.tokens)
+        return await decode_admin_session(token)
+
+    async def revoke(self, token: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(admin_auth, "admin_token_cache", self.tokens)
+        await revoke_admin_session(token)
+
+
+@pytest.fixture
+def server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+def _token() -> str:
+    return create_admin_session(email="Admin@Example.com", provider="google", provider_user_id="1")
+
+
+@pytest.mark.asyncio
+async def test_cached_tokens_need_no_redis_lookup_while_subscribed(server, listening, monkeypatch):
+    worker = Worker(server)
+    await listening(worker.events)
+    token = _token()
+
+    for _ in range(5):
+        identity = await worker.decode(token, monkeypatch)
+
+    assert identity.email == "admin@example.com"
+    assert worker.redis.gets == 1  # only when first verified
+
+
+@pytest.mark.asyncio
+async def test_revocation_reaches_workers_with_a_cached_identity(server, listening, monkeypatch):
+    first, second = Worker(server), Worker(server)
+    await listening(first.events)
+    await listening(second.events)
+    token = _token()
+    await second.decode(token, monkeypatch)
+    assert second.tokens.get(admin_auth.hash_token(token)) is not None
+
+    await first.revoke(token, monkeypatch)
+    (key,) = await first.redis.keys("adminrevoked:*")
+    assert 0 < await first.redis.ttl(key) <= admin_auth.settings.admin_session_ttl_hours * 3600
+
+    async with asyncio.timeout(1):
+        await second.revocations.wait()
+    gets = second.redis.gets
+    with pytest.raises(NotAuthorizedException):
+        await second.decode(token, monkeypatch)
+    assert second.redis.gets == gets  # from its own denylist
+
+
+@pytest.mark.asyncio
+async def test_cached_tokens_are_checked_in_redis_while_unsubscribed(server, listening, monkeypatch):
+    first, unsubscribed = Worker(server), Worker(server)
+    await listening(first.events)
+    token = _token()
+    await unsubscribed.decode(token, monkeypatch)
+    await unsubscribed.decode(token, monkeypatch)
+    assert unsubscribed.redis.gets == 2
+
+    await first.revoke(token, monkeypatch)
+
+    with pytest.raises(NotAuthorizedException):
+        await unsubscribed.decode(token, monkeypatch)
+
+
+@pytest.mark.asyncio
+async def test_subscribing_drops_tokens_cached_beforehand(server, listening, monkeypatch):
+    worker = Worker(server)
+    token = _token()
+    await worker.decode(token, monkeypatch)
+
+    await listening(worker.events)
+
+    assert worker.tokens.get(admin_auth.hash_token(token)) is None
+
+
+@pytest.mark.asyncio
+async def test_malformed_revocation_is_treated_as_revoked(server, monkeypatch, caplog):
+    worker = Worker(server)
+    token = _token()
+    await worker.redis.set(f"adminrevoked:{admin_auth.hash_token(token)}", "not-a-timestamp")
+
+    with caplog.at_level(logging.WARNING), pytest.raises(NotAuthorizedException):
+        await worker.decode(token, monkeypatch)
+
+    assert "Malformed admin token revocation" in caplog.text
+    with pytest.raises(NotAuthorizedException):
+        await worker.decode(token, monkeypatch)
+    assert worker.redis.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_forged_tokens_are_rejected_before_any_lookup(server, monkeypatch):
+    worker = Worker(server)
+
+    with pytest.raises(NotAuthorizedException):
+        await worker.decode(_token() + "x", monkeypatch)
+    assert worker.redis.gets == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_revokes_in_process(monkeypatch):
+    tokens = AdminTokenCache(maxsize=10, use_redis=False, events=CacheEvents(use_redis=False))
+    monkeypatch.setattr(admin_auth, "admin_token_cache", tokens)
+    token = _token()
+
+    await decode_admin_session(token)
+    await revoke_admin_session(token)
+
+    with pytest.raises(NotAuthorizedException):
+        await decode_admin_session(token)
@@ -0,0 +1,112 @@
+"""Cache invalidation events between processes, over fakeredis pub/sub."""
+
+import asyncio
+import logging
+from typing import Any
+
+import fakeredis
+import pytest
+
+from app.services.cache_events import CacheEvents
+
+pytestmark = [pytest.mark.unit]
+
+
+class Received:
+    """An event handler that records its events and can be waited on."""
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        self._arrived = asyncio.Event()
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        self.events.append(event)
+        self._arrived.set()
+
+    async def wait(self) -> None:
+        async with asyncio.timeout(1):
+            await self._arrived.wait()
+        self._arrived.clear()
+
+
+def _events(server: fakeredis.FakeServer) -> CacheEvents:
+    client = fakeredis.FakeAsyncRedis(server=server)
+    return CacheEvents(use_redis=True, client=lambda: client, reconnect_seconds=0.01)
+
+
+@pytest.fixture
+def server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+@pytest.mark.asyncio
+async def test_events_reach_the_publisher_at_once_and_other_processes_once_subscribed(server, listening):
+    publisher, other = _events(server), _events(server)
+    published, delivered, other_kind = Received(), Received(), Received()
+    publisher.subscribe("token-revoked", published)
+    other.subscribe("token-revoked", delivered)
+    other.subscribe("feed-changed", other_kind)
+    listener = await listening(other)
+    assert other.connected
+
+    await publisher.publish("token-revoked", token_hash="abc", exp=1.5)
+
+    assert published.events == [{"token_hash": "abc", "exp": 1.5}]
+    await delivered.wait()
+    assert delivered.events == [{"token_hash": "abc", "exp": 1.5}]
+    assert other_kind.events == []
+
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+    assert not other.connected
+
+
+@pytest.mark.asyncio
+async def test_subscription_is_retried_and_on_connect_runs_each_time(server, listening):
+    events = _events(server)
+    connects = []
+    events.subscribe("token-revoked", Received(), on_connect=lambda: connects.append(events.connected))
+    server.connected = False
+    subscribing = asyncio.create_task(listening(events))
+    await asyncio.sleep(0.05)
+    assert not events.connected
+    assert connects == []
+
+    server.connected = True
+    await subscribing
+    assert connects == [True]
+
+
+def test_malformed_events_and_failing_handlers_are_logged_not_raised(caplog):
+    events = CacheEvents(use_redis=False)
+    received = Received()
+
+    def broken(_event: dict[str, Any]) -> None:
+        raise RuntimeError
+
+    events.subscribe("feed-changed", broken)
+    events.subscribe("feed-changed", received)
+
+    with caplog.at_level(logging.WARNING):
+        events.receive(b"not json")
+        events.receive(b'["no kind"]')
+        events.receive(b'{"kind": "feed-changed", "session_id": "s1"}')
+
+    assert received.events == [{"session_id": "s1"}]
+    assert caplog.text.count("Ignoring malformed cache event") == 2
+    assert "handler failed for feed-changed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_publishes_in_process_only():
+    def no_redis() -> Any:
+        raise AssertionError
+
+    events = CacheEvents(use_redis=False, client=no_redis)
+    received = Received()
+    events.subscribe("feed-changed", received)
+
+    await events.publish("feed-changed", session_id="s1")
+
+    assert received.events == [{"session_id": "s1"}]
+    assert not events.connected
@@ -0,0 +1,154 @@
+"""Compact calendar feeds: a term block's occurrences as one weekly RRULE event."""
+
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.services.calendar import CalendarOccurrence, build_session_calendar_feed
+from app.services.calendar_feeds import FEED_TZ, FEED_TZID, _plan_block_series
+from app.services.schedule_expander import local_span, weekly_dates
+
+pytestmark = [pytest.mark.unit, pytest.mark.services]
+
+TUESDAY = 1
+START, END = time(15, 30), time(17, 0)
+# Tuesdays of Term 1 2026; NZ daylight saving ends on Sunday 5 April
+BLOCK_START, BLOCK_END = date(2026, 3, 3), date(2026, 4, 28)
+
+
+def _occurrence(day: date, start: time = START, end: time = END, **kwargs) -> CalendarOccurrence:
+    starts_at, ends_at = local_span(day, start, end, FEED_TZ)
+    return CalendarOccurrence(id=f"occ-{day:%m%d}", start=starts_at, end=ends_at, **kwargs)
+
+
+def _weekly(block_start: date = BLOCK_START, block_end: date = BLOCK_END) -> list[CalendarOccurrence]:
+    return [_occurrence(day) for day in weekly_dates(block_start, block_end, TUESDAY)]
+
+
+def _plan(occurrences, *, block_start: date = BLOCK_START, block_end: date = BLOCK_END, from_date=BLOCK_START):
+    return _plan_block_series(
+        "block-1",
+        block_start,
+        block_end,
+        weekday=TUESDAY,
+        start_time=START,
+        end_time=END,
+        occurrences=occurrences,
+        from_date=from_date,
+    )
+
+
+def _render(series, standalone) -> str:
+    return build_session_calendar_feed(
+        session_id="s-1",
+        session_name="Robotics Club",
+        occurrences=standalone,
+        location="Hutt Library",
+        address="",
+        tzid=FEED_TZID,
+        dtstamp=series.start if series else standalone[0].start,
+        series=[series] if series else [],
+    )
+
+
+def test_regular_block_is_one_weekly_event():
+    series, standalone = _plan(_weekly())
+
+    assert series is not None
+    assert standalone == []
+    assert series.exdates == ()
+    assert series.overrides == ()
+
+    ics = _render(series, standalone)
+    assert ics.count("BEGIN:VEVENT") == 1
+    assert "DTSTART;TZID=Pacific/Auckland:20260303T153000" in ics
+    # 15:30 NZST on the last Tuesday, in UTC
+    assert "RRULE:FREQ=WEEKLY;UNTIL=20260428T033000Z" in ics
+
+
+def test_excluded_week_becomes_an_exdate():
+    occurrences = [occ for occ in _weekly() if occ.start.date() != date(2026, 3, 17)]
+
+    series, standalone = _plan(occurrences)
+
+    assert series is not None
+    assert standalone == []
+    assert series.exdates == (local_span(date(2026, 3, 17), START, END, FEED_TZ)[0],)
+    assert "EXDATE;TZID=Pacific/Auckland:20260317T153000" in _render(series, standalone)
+
+
+def test_moved_and_cancelled_weeks_become_overrides():
+    moved = _occurrence(date(2026, 3, 24), time(16, 0), time(17, 30))
+    cancelled = _occurrence(date(2026, 4, 14), cancelled=True, cancellation_reason="Venue closed")
+    occurrences = [
+        moved if occ.start.date() == moved.start.date() else cancelled if occ.start.date() == date(2026, 4, 14) else occ
+        for occ in _weekly()
+    ]
+
+    series, standalone = _plan(occurrences)
+
+    assert series is not None
+    assert standalone == []
+    assert [override for _recurrence_id, override in series.overrides] == [moved, cancelled]
+    ics = _render(series, standalone)
+    assert ics.count("BEGIN:VEVENT") == 3
+    assert "RECURRENCE-ID;TZID=Pacific/Auckland:20260324T153000" in ics
+    assert "DTSTART;TZID=Pacific/Auckland:20260324T160000" in ics
+    assert "RECURRENCE-ID;TZID=Pacific/Auckland:20260414T153000" in ics
+    assert "STATUS:CANCELLED" in ics
+    # Every override shares the series UID
+    assert len({line for line in ics.split("\r\n") if line.startswith("UID:")}) == 1
+
+
+def test_occurrence_moved_to_another_day_is_standalone():
+    moved = _occurrence(date(2026, 3, 25))
+    occurrences = [moved if occ.start.date() == date(2026, 3, 24) else occ for occ in _weekly()]
+
+    series, standalone = _plan(occurrences)
+
+    assert series is not None
+    assert series.exdates == (local_span(date(2026, 3, 24), START, END, FEED_TZ)[0],)
+    assert standalone == [moved]
+
+
+@pytest.mark.parametrize(
+    ("block_start", "block_end"),
+    [
+        (date(2026, 3, 3), date(2026, 4, 28)),  # Daylight saving ends on 5 April
+        (date(2026, 9, 1), date(2026, 10, 27)),  # and starts on 27 September
+    ],
+)
+def test_dst_transition_keeps_local_wall_clock_time(block_start, block_end):
+    occurrences = _weekly(block_start, block_end)
+    # The same local time is a different UTC time either side of the transition
+    assert len({occ.start.utcoffset() for occ in occurrences}) == 2
+
+    series, standalone = _plan(occurrences, block_start=block_start, block_end=block_end, from_date=block_start)
+
+    assert series is not None
+    assert standalone == []
+    assert series.exdates == ()
+    assert series.overrides == ()
+    assert series.start.time() == START
+    assert series.until.time() == START
+
+
+def test_feed_cutoff_trims_the_series_start():
+    # Occurrences before the cutoff are not loaded at all
+    occurrences = [occ for occ in _weekly() if occ.start.date() >= date(2026, 4, 1)]
+
+    series, standalone = _plan(occurrences, from_date=date(2026, 4, 1))
+
+    assert series is not None
+    assert series.start.date() == date(2026, 4, 7)
+    assert series.exdates == ()
+    assert standalone == []
+
+
+def test_block_without_weekly_pattern_stays_standalone():
+    occurrences = [_occurrence(day + timedelta(days=1)) for day in weekly_dates(BLOCK_START, BLOCK_END, TUESDAY)]
+
+    series, standalone = _plan(occurrences)
+
+    assert series is None
+    assert standalone == occurrences
@@ -0,0 +1,120 @@
+"""Email pacing: waiting for a turn versus deferring to a later retry."""
+
+import time
+from collections.abc import AsyncIterator
+from typing import cast
+
+import httpx
+import pytest
+import pytest_asyncio
+from saq import Job
+
+from app.config import settings
+from app.services.email import email_service
+from app.services.email_governor import EmailDeferredError, EmailGovernor, deferring_transient_errors
+from app.services.http import shared_http_client
+from app.worker import WorkerContext, send_waitlist_confirmed_task
+
+pytestmark = [pytest.mark.unit, pytest.mark.email]
+
+
+def _governor() -> EmailGovernor:
+    return EmailGovernor(requests_per_second=100, burst=10, max_concurrency=2, max_wait_seconds=0.01)
+
+
+@pytest.mark.asyncio
+async def test_slot_waits_out_a_throttle_outside_deferring():
+    governor = _governor()
+    governor.throttle(0.05)
+
+    started = time.monotonic()
+    async with governor.slot():
+        pass
+
+    assert time.monotonic() - started >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_slot_defers_a_long_throttle_inside_deferring():
+    governor = _governor()
+    governor.throttle(0.05)
+
+    with deferring_transient_errors(), pytest.raises(EmailDeferredError) as excinfo:
+        async with governor.slot():
+            pass
+
+    assert excinfo.value.retry_after is not None
+    assert excinfo.value.retry_after > 0.01
+
+
+@pytest.fixture
+def exhausted_governor(monkeypatch: pytest.MonkeyPatch) -> EmailGovernor:
+    """The worker's email service with a real Mailgun config and no send turn for 100 seconds."""
+    governor = EmailGovernor(requests_per_second=0.01, burst=1, max_concurrency=1, max_wait_seconds=1)
+    for name, value in {
+        "dry_run": False,
+        "api_key": "key-test",
+        "domain": "mg.example.com",
+        "api_url": "https://api.mailgun.test/v3",
+        "governor": governor,
+    }.items():
+        monkeypatch.setattr(email_service, name, value)
+    return governor
+
+
+@pytest_asyncio.fixture
+async def mailgun_requests(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[list[httpx.Request]]:
+    requests: list[httpx.Request] = []
+
+    def accept(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"message": "Queued."})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(accept)) as client:
+        monkeypatch.setattr(shared_http_client, "_client", client)
+        yield requests
+
+
+async def _send_alert(job: Job) -> dict:
+    return await send_waitlist_confirmed_task(
+        cast("WorkerContext", {"job": job}),
+        to_email="sam@example.com",
+        caregiver_name="Sam",
+        child_name="Alex",
+        session_name="Robotics Club",
+        session_venue="Hutt Library",
+        session_address="1 Main St",
+        session_time="Tuesday 3:30pm - 5:00pm",
+    )
+
+
+@pytest.mark.asyncio
+async def test_exhausted_governor_hands_the_job_back_with_its_delay(exhausted_governor, mailgun_requests):
+    async with exhausted_governor.slot():
+        pass  # the only token; the next turn is 100 seconds away
+    job = Job(function="send_waitlist_confirmed_task", attempts=1)
+
+    with pytest.raises(EmailDeferredError) as excinfo:
+        await _send_alert(job)
+
+    assert mailgun_requests == []
+    wait = excinfo.value.retry_after
+    assert wait is not None
+    assert wait > 90
+    # Retried by SAQ after the governor's wait plus at most one backoff of jitter, not failed
+    assert job.retryable
+    base = settings.email_retry_base_delay_seconds
+    assert wait <= job.next_retry_delay() <= max(wait, base) + base
+
+
+@pytest.mark.asyncio
+async def test_deferral_on_the_last_attempt_fails_the_job(exhausted_governor, mailgun_requests):
+    async with exhausted_governor.slot():
+        pass
+    job = Job(function="send_waitlist_confirmed_task", attempts=settings.email_retry_max_attempts)
+
+    with pytest.raises(EmailDeferredError):
+        await _send_alert(job)
+
+    assert mailgun_requests == []
+    assert not job.retryable
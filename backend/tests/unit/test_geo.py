@@ -0,0 +1,81 @@
+"""Nearest-session ring search over the location grid, against a brute-force scan."""
+
+import random
+
+import pytest
+
+from app.schemas.session import LatLng, SessionLocationDetails, SessionPublic
+from app.services.geo import GeoGridIndex, haversine_km
+
+pytestmark = [pytest.mark.unit, pytest.mark.services]
+
+
+def _session(n: int, lat: float, lng: float) -> SessionPublic:
+    location = SessionLocationDetails(
+        id=f"loc-{n}", name=f"Venue {n}", address=f"{n} Main St", region="Region", latlong=LatLng(lat=lat, lng=lng)
+    )
+    return SessionPublic(id=str(n), name=f"Session {n:03d}", age="8-12", time="", locationDetails=location)
+
+
+def _sessions() -> list[SessionPublic]:
+    rng = random.Random(7)
+    sessions = [_session(n, rng.uniform(-47.0, -34.0), rng.uniform(166.0, 179.0)) for n in range(300)]
+    # Either side of the antimeridian (Chatham Islands and beyond)
+    sessions += [_session(300, -43.95, -176.56), _session(301, -44.0, 179.9), _session(302, -43.9, -179.9)]
+    return sessions
+
+
+SESSIONS = _sessions()
+
+
+def _brute_force(lat: float, lng: float, max_distance_km: float | None = None) -> list[tuple[str, float]]:
+    ranked = sorted(
+        (
+            (haversine_km(lat, lng, s.location_details.latlong.lat, s.location_details.latlong.lng), s.name)
+            for s in SESSIONS
+            if s.location_details
+        ),
+    )
+    if max_distance_km is not None:
+        ranked = [item for item in ranked if item[0] <= max_distance_km]
+    return [(name, distance) for distance, name in ranked]
+
+
+def _names(results: list[tuple[SessionPublic, float]]) -> list[tuple[str, float]]:
+    return [(session.name, distance) for session, distance in results]
+
+
+@pytest.fixture(scope="module")
+def grid() -> GeoGridIndex:
+    return GeoGridIndex(SESSIONS)
+
+
+QUERIES = [
+    (-41.29, 174.78),  # Wellington
+    (-36.85, 174.76),  # Auckland
+    (-43.95, -176.56),  # Chatham Islands, across the antimeridian
+    (-44.0, 179.99),
+    (-52.5, 169.2),  # Campbell Island, far from every session
+]
+
+
+@pytest.mark.parametrize(("lat", "lng"), QUERIES)
+@pytest.mark.parametrize(("limit", "offset"), [(1, 0), (10, 0), (10, 20), (50, 250)])
+def test_ring_search_matches_brute_force(grid, lat, lng, limit, offset):
+    assert _names(grid.nearest(lat, lng, limit, offset)) == _brute_force(lat, lng)[offset : offset + limit]
+
+
+@pytest.mark.parametrize(("lat", "lng"), QUERIES)
+@pytest.mark.parametrize("max_distance_km", [5.0, 50.0, 400.0])
+def test_max_distance_matches_brute_force(grid, lat, lng, max_distance_km):
+    expected = _brute_force(lat, lng, max_distance_km)[:20]
+
+    assert _names(grid.nearest(lat, lng, 20, max_distance_km=max_distance_km)) == expected
+
+
+@pytest.mark.parametrize("cell_degrees", [0.05, 0.25, 2.0])
+def test_cell_size_does_not_change_results(cell_degrees):
+    grid = GeoGridIndex(SESSIONS, cell_degrees=cell_degrees)
+
+    assert len(grid) == len(SESSIONS)
+    assert _names(grid.nearest(-41.29, 174.78, 25)) == _brute_force(-41.29, 174.78)[:25]
@@ -0,0 +1,137 @@
+"""Caregiver principals as stored in the shared (Redis) principal cache, and invalidated across workers."""
+
+import asyncio
+import json
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import cast
+
+import fakeredis
+import pytest
+from redis.asyncio import Redis
+
+from app.db import async_session_factory
+from app.services.cache_events import CacheEvents
+from app.services.principal_cache import CAREGIVER_SESSIONS_INVALIDATED_EVENT, CaregiverPrincipal, PrincipalCache
+
+pytestmark = [pytest.mark.unit, pytest.mark.auth]
+
+PRINCIPAL = CaregiverPrincipal(
+    id=uuid.UUID("6f9b2c1e-3d4a-4e5f-8a7b-9c0d1e2f3a4b"),
+    email="sam@example.com",
+    name="Sam",
+    phone=None,
+    email_verified=True,
+)
+
+
+class StoredValues:
+    """Stands in for the Redis client: `get` returns whatever was stored under the key."""
+
+    def __init__(self, values: dict[str, str]) -> None:
+        self.values = values
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+
+def _cache(values: dict[str, str]) -> PrincipalCache:
+    client = cast("Redis", StoredValues(values))
+    return PrincipalCache(
+        maxsize=10,
+        ttl_seconds=60,
+        redis_ttl_seconds=60,
+        use_redis=True,
+        client=lambda: client,
+        events=CacheEvents(use_redis=False),
+    )
+
+
+def _worker_cache(server: fakeredis.FakeServer) -> PrincipalCache:
+    """One API worker's in-process cache, receiving invalidations over the shared Redis."""
+    redis = fakeredis.FakeAsyncRedis(server=server)
+    return PrincipalCache(
+        maxsize=10,
+        ttl_seconds=60,
+        redis_ttl_seconds=60,
+        use_redis=False,
+        events=CacheEvents(use_redis=True, client=lambda: redis),
+    )
+
+
+SESSION_EXPIRES_AT = datetime.now(UTC) + timedelta(days=1)
+
+
+def test_principal_round_trips_through_json():
+    assert CaregiverPrincipal.from_json(json.loads(json.dumps(PRINCIPAL.to_json()))) == PRINCIPAL
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"id": 1},
+        {"email": None},
+        {"name": 5},
+        {"email_verified": "yes"},
+    ],
+)
+def test_from_json_rejects_mistyped_fields(change):
+    with pytest.raises(TypeError):
+        CaregiverPrincipal.from_json({**PRINCIPAL.to_json(), **change})
+
+
+@pytest.mark.asyncio
+async def test_cache_reads_principal_from_redis():
+    payload = {"caregiver": PRINCIPAL.to_json(), "expiresAt": time.time() + 3600}
+    cache = _cache({"principal:abc": json.dumps(payload)})
+
+    assert await cache.get("abc") == PRINCIPAL
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "not json",
+        json.dumps({"caregiver": {**PRINCIPAL.to_json(), "id": "not-a-uuid"}, "expiresAt": 1e12}),
+        json.dumps({"caregiver": PRINCIPAL.to_json()}),
+        json.dumps(["caregiver"]),
+    ],
+)
+async def test_cache_treats_malformed_entries_as_misses(raw):
+    assert await _cache({"principal:abc": raw}).get("abc") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_other_workers_local_copies(listening):
+    server = fakeredis.FakeServer()
+    first, second = _worker_cache(server), _worker_cache(server)
+    await listening(first.events)
+    await listening(second.events)
+    invalidated = asyncio.Event()
+    second.events.subscribe(CAREGIVER_SESSIONS_INVALIDATED_EVENT, lambda _: invalidated.set())
+    await second.set("abc", PRINCIPAL, SESSION_EXPIRES_AT)
+    await second.set("def", PRINCIPAL, SESSION_EXPIRES_AT)
+
+    async with async_session_factory() as db:
+        await first.invalidate(db, "abc")
+
+    async with asyncio.timeout(1):
+        await invalidated.wait()
+    assert await second.get("abc") is None
+    assert await second.get("def") == PRINCIPAL
+
+
+@pytest.mark.asyncio
+async def test_local_copies_are_not_served_while_unsubscribed(listening):
+    cache = _worker_cache(fakeredis.FakeServer())
+    await cache.set("abc", PRINCIPAL, SESSION_EXPIRES_AT)
+    assert await cache.get("abc") is None
+
+    # Whatever was cached before subscribing may have missed an invalidation
+    await listening(cache.events)
+    assert await cache.get("abc") is None
+
+    await cache.set("abc", PRINCIPAL, SESSION_EXPIRES_AT)
+    assert await cache.get("abc") == PRINCIPAL
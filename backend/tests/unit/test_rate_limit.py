@@ -0,0 +1,62 @@
+"""The in-process (memory) rate limit store: limits, its LRU bound and throughput."""
+
+import time
+
+import pytest
+
+from app.config import settings
+from app.middleware.rate_limit import MINUTE, Limit, MemoryRateLimitStore, build_rate_limit_store
+
+pytestmark = [pytest.mark.unit, pytest.mark.security]
+
+LIMITS = [Limit(3, MINUTE)]
+
+
+@pytest.mark.asyncio
+async def test_memory_store_allows_a_burst_then_limits():
+    store = MemoryRateLimitStore()
+
+    results = [await store.hit("ip:192.0.2.1:/api", LIMITS) for _ in range(4)]
+
+    assert results[:3] == [None, None, None]
+    exceeded = results[3]
+    assert exceeded is not None
+    limit, retry_after = exceeded
+    assert limit == LIMITS[0]
+    assert 0 < retry_after <= MINUTE / 3
+
+
+@pytest.mark.asyncio
+async def test_memory_store_stays_capped_at_max_keys(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_backend", "memory")
+    monkeypatch.setattr(settings, "rate_limit_memory_max_keys", 100)
+    store = build_rate_limit_store()
+    assert isinstance(store, MemoryRateLimitStore)
+
+    for n in range(250):
+        await store.hit(f"ip:10.0.{n // 256}.{n % 256}:/api", LIMITS)
+        # Keep one client recently used so eviction passes it over
+        await store.hit("ip:192.0.2.1:/api", [Limit(1_000, MINUTE)])
+
+    assert len(store._tats) == 100
+    assert "ip:192.0.2.1:/api" in store._tats
+    assert "ip:10.0.0.0:/api" not in store._tats
+    assert "ip:10.0.0.249:/api" in store._tats
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+async def test_memory_store_throughput_at_100k_clients():
+    store = MemoryRateLimitStore(max_keys=100_000)
+    keys = [f"ip:10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}:/api/v1/sessions" for n in range(150_000)]
+
+    started = time.perf_counter()
+    for key in keys:
+        await store.hit(key, LIMITS)
+    elapsed = time.perf_counter() - started
+
+    # The last 50k clients each evicted the least recently seen one
+    assert len(store._tats) == 100_000
+    assert next(iter(store._tats)) == keys[50_000]
+    # A few hundred thousand checks a second locally
+    assert len(keys) / elapsed > 50_000
@@ -0,0 +1,106 @@
+"""The Redis sliding-window rate limit store, run against fakeredis' Lua scripting."""
+
+import time
+
+import fakeredis
+import pytest
+
+from app.middleware.rate_limit import HOUR, MINUTE, Limit, RedisRateLimitStore
+
+pytestmark = [pytest.mark.unit, pytest.mark.security]
+
+KEY = "ip:192.0.2.1:/api"
+LIMITS = [Limit(3, MINUTE)]
+
+
+class Clock:
+    """Stands in for `time.time`, which fakeredis reads for `TIME` and key expiry."""
+
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def redis() -> fakeredis.FakeAsyncRedis:
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.fixture
+def store(redis) -> RedisRateLimitStore:
+    return RedisRateLimitStore(client=lambda: redis)
+
+
+@pytest.mark.asyncio
+async def test_limit_is_reached_with_retry_after_until_the_oldest_request_leaves(clock, store):
+    assert await store.hit(KEY, LIMITS) is None
+    clock.now += 10
+    assert await store.hit(KEY, LIMITS) is None
+    clock.now += 10
+    assert await store.hit(KEY, LIMITS) is None
+    clock.now += 5
+
+    # Oldest request was 25s ago, so the window frees a slot in 35s
+    assert await store.hit(KEY, LIMITS) == (LIMITS[0], 35.0)
+
+
+@pytest.mark.asyncio
+async def test_request_exactly_one_window_later_is_allowed(clock, store):
+    for _ in range(3):
+        assert await store.hit(KEY, LIMITS) is None
+
+    clock.now += MINUTE - 0.001
+    assert await store.hit(KEY, LIMITS) == (LIMITS[0], 0.001)
+
+    clock.now += 0.001
+    assert await store.hit(KEY, LIMITS) is None
+
+
+@pytest.mark.asyncio
+async def test_expired_requests_no_longer_count(clock, store, redis):
+    for _ in range(3):
+        await store.hit(KEY, LIMITS)
+    clock.now += 30
+    assert await store.hit(KEY, LIMITS) is not None  # refused requests are not recorded
+
+    clock.now += 31
+    assert await store.hit(KEY, LIMITS) is None
+    assert await redis.zcard(f"ratelimit:{KEY}") == 1
+
+    # The key itself expires once its newest request has left the window
+    clock.now += MINUTE + 0.001
+    assert await redis.exists(f"ratelimit:{KEY}") == 0
+
+
+@pytest.mark.asyncio
+async def test_the_limit_that_is_reached_is_reported(clock, store):
+    limits = [Limit(5, MINUTE), Limit(6, HOUR)]
+    for _ in range(5):
+        assert await store.hit(KEY, limits) is None
+
+    assert await store.hit(KEY, limits) == (limits[0], MINUTE)
+
+    clock.now += MINUTE
+    assert await store.hit(KEY, limits) is None
+    clock.now += MINUTE
+    # Six requests inside the hour; the first of them leaves it 58 minutes from now
+    assert await store.hit(KEY, limits) == (limits[1], HOUR - 2 * MINUTE)
+
+
+@pytest.mark.asyncio
+async def test_clients_and_endpoints_are_counted_separately(clock, store):
+    for _ in range(3):
+        await store.hit(KEY, LIMITS)
+
+    assert await store.hit("ip:192.0.2.2:/api", LIMITS) is None
+    assert await store.hit("ip:192.0.2.1:/auth/magic-link", LIMITS) is None
+    assert await store.hit(KEY, LIMITS) is not None
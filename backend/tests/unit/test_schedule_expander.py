@@ -0,0 +1,91 @@
+"""Weekly slot expansion: dates, exclusions, DST handling and throughput."""
+
+import time as clock
+import uuid
+from datetime import UTC, date, datetime, time, timedelta
+
+import pytest
+
+from app.services.schedule_expander import (
+    TZ,
+    BlockRange,
+    WeeklySlot,
+    expand_weekly_slots,
+    iter_occurrences,
+    local_datetime,
+    local_span,
+    weekly_dates,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.services]
+
+TERM_1 = BlockRange(uuid.uuid4(), 2026, date(2026, 2, 2), date(2026, 4, 10))
+TERM_2 = BlockRange(uuid.uuid4(), 2026, date(2026, 4, 27), date(2026, 7, 3))
+
+
+def test_weekly_dates_starts_on_first_matching_weekday():
+    days = weekly_dates(date(2026, 2, 4), date(2026, 3, 3), weekday=1)
+    assert days == [date(2026, 2, 10), date(2026, 2, 17), date(2026, 2, 24), date(2026, 3, 3)]
+
+
+def test_local_datetime_moves_gap_times_forward():
+    # NZ clocks go from 02:00 to 03:00 on 2026-09-27
+    assert local_datetime(date(2026, 9, 27), time(2, 30)) == datetime(2026, 9, 27, 3, 30, tzinfo=TZ)
+
+
+def test_local_datetime_takes_first_instance_of_ambiguous_times():
+    # 02:00-03:00 repeats on 2026-04-05; the first pass is still daylight time (UTC+13)
+    at = local_datetime(date(2026, 4, 5), time(2, 30))
+    assert at.astimezone(UTC) == datetime(2026, 4, 4, 13, 30, tzinfo=UTC)
+
+
+def test_local_span_ends_on_the_same_day():
+    start, end = local_span(date(2026, 2, 3), time(15, 30), time(17, 0))
+    assert (start.date(), end.date()) == (date(2026, 2, 3), date(2026, 2, 3))
+    assert end - start == timedelta(hours=1, minutes=30)
+
+
+def test_expansion_skips_exclusions_of_the_block_year():
+    slot = WeeklySlot(uuid.uuid4(), 0, time(15, 30), time(17, 0))
+    excluded = {2026: {date(2026, 4, 6)}, 2025: {date(2026, 2, 2)}}
+
+    expanded = expand_weekly_slots([slot], {slot.session_id: [TERM_1, TERM_2]}, excluded)
+
+    assert [group.block_id for group in expanded] == [TERM_1.id, TERM_2.id]
+    starts = [occ.starts_at.date() for occ in iter_occurrences(expanded)]
+    assert starts[0] == date(2026, 2, 2)
+    assert date(2026, 4, 6) not in starts
+    assert len(starts) == 10 + 10 - 1
+
+
+def test_sessions_with_the_same_slot_share_spans():
+    first = WeeklySlot(uuid.uuid4(), 2, time(16, 0), time(17, 0))
+    second = WeeklySlot(uuid.uuid4(), 2, time(16, 0), time(17, 0))
+
+    expanded = expand_weekly_slots([first, second], {first.session_id: [TERM_1], second.session_id: [TERM_1]}, {})
+
+    assert [group.session_id for group in expanded] == [first.session_id, second.session_id]
+    assert expanded[0].spans is expanded[1].spans
+
+
+@pytest.mark.benchmark
+def test_expanding_five_thousand_sessions_takes_milliseconds():
+    blocks = [
+        TERM_1,
+        TERM_2,
+        BlockRange(uuid.uuid4(), 2026, date(2026, 7, 20), date(2026, 9, 25)),
+        BlockRange(uuid.uuid4(), 2026, date(2026, 10, 12), date(2026, 12, 16)),
+    ]
+    slots = [WeeklySlot(uuid.uuid4(), n % 5, time(15 + n % 3, 30 * (n % 2)), time(18, 0)) for n in range(5000)]
+    blocks_by_session = {slot.session_id: blocks for slot in slots}
+    excluded = {2026: {date(2026, 4, 6), date(2026, 6, 1)}}
+
+    timings = []
+    for _ in range(3):
+        started = clock.perf_counter()
+        expanded = expand_weekly_slots(slots, blocks_by_session, excluded)
+        timings.append(clock.perf_counter() - started)
+
+    assert sum(len(group.spans) for group in expanded) > 190_000
+    # About 35ms locally; generous for shared CI runners
+    assert min(timings) < 0.15
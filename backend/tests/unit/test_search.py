@@ -0,0 +1,64 @@
+"""The in-process trigram index behind session search on SQLite."""
+
+import pytest
+
+from app.schemas.session import LatLng, SessionLocationDetails, SessionPublic
+from app.services.search import FIELD_WEIGHTS, MIN_SCORE, SessionSearchIndex
+
+pytestmark = [pytest.mark.unit, pytest.mark.services]
+
+
+def _session(name: str, venue: str, region: str, address: str) -> SessionPublic:
+    location = SessionLocationDetails(
+        id=f"loc-{name}", name=venue, address=address, region=region, latlong=LatLng(lat=-41.2, lng=174.8)
+    )
+    return SessionPublic(id=name, name=name, age="8-12", time="Tue 3:30pm–5pm", locationDetails=location)
+
+
+SESSIONS = [
+    _session("Robotics Club", "Hutt Library", "Wellington", "2 Queens Dr"),
+    _session("Coding Club", "Central Library", "Auckland", "44 Lorne St"),
+    _session("Lego Robotics", "Christchurch Hub", "Canterbury", "60 Cathedral Sq"),
+    _session("Game Design", "Makerspace", "Wellington", "1 Robotics Way"),
+]
+
+
+@pytest.fixture(scope="module")
+def index() -> SessionSearchIndex:
+    return SessionSearchIndex(SESSIONS)
+
+
+def _ranked(index: SessionSearchIndex, q: str, limit: int = 50) -> list[tuple[str, float]]:
+    return [(session.name, score) for session, score in index.search(q, limit)]
+
+
+def test_name_matches_outrank_address_matches(index):
+    assert _ranked(index, "robotics") == [
+        ("Lego Robotics", FIELD_WEIGHTS["name"]),
+        ("Robotics Club", FIELD_WEIGHTS["name"]),
+        ("Game Design", FIELD_WEIGHTS["address"]),
+    ]
+
+
+def test_each_session_scores_its_best_field(index):
+    ranked = dict(_ranked(index, "wellington"))
+
+    assert ranked == {"Robotics Club": FIELD_WEIGHTS["region"], "Game Design": FIELD_WEIGHTS["region"]}
+
+
+def test_typos_still_match(index):
+    (best, score), *_rest = _ranked(index, "robtics")
+
+    assert best in {"Lego Robotics", "Robotics Club"}
+    assert MIN_SCORE <= score < FIELD_WEIGHTS["name"]
+    assert _ranked(index, "Hut Librry")[0][0] == "Robotics Club"
+
+
+def test_unrelated_and_empty_queries_match_nothing(index):
+    assert index.search("swimming") == []
+    assert index.search("   ") == []
+    assert index.search("!!") == []
+
+
+def test_limit_keeps_the_best_matches(index):
+    assert [name for name, _score in _ranked(index, "robotics", limit=2)] == ["Lego Robotics", "Robotics Club"]